@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
+# Lecturas de tickets, dashboard y catálogos con vistas async (apps/tickets/vistas_async.py)
+os.environ.setdefault('VISTAS_ASYNC', '1')
 
 application = get_asgi_application()
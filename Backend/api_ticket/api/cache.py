@@ -0,0 +1,50 @@
+import threading
+import time
+from collections import OrderedDict
+
+_AUSENTE = object()
+
+
+class CacheLRU:
+    """
+    Diccionario local al proceso, acotado (descarta el menos usado) y con expiración.
+    Seguro entre hilos. Cada proceso tiene su copia: la expiración acota cuánto tiempo
+    puede quedar desactualizado respecto de cambios hechos en otro proceso.
+    """
+
+    def __init__(self, max_items=1000, ttl=60):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave, default=None):
+        with self._lock:
+            entrada = self._datos.get(clave, _AUSENTE)
+            if entrada is _AUSENTE:
+                return default
+            valor, expira = entrada
+            if expira < time.monotonic():
+                del self._datos[clave]
+                return default
+            self._datos.move_to_end(clave)
+            return valor
+
+    def set(self, clave, valor, ttl=None):
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._datos[clave] = (valor, expira)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_items:
+                self._datos.popitem(last=False)
+
+    def delete(self, clave):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
@@ -0,0 +1,197 @@
+"""
+Registro de métricas en memoria (contadores e histogramas) expuesto en /metrics con el
+formato de texto de Prometheus. Configurado en METRICAS (settings).
+
+Con varios procesos (gunicorn con varios workers) cada uno tiene su propio registro:
+si METRICAS['DIRECTORIO'] está definido, cada proceso vuelca su registro completo a
+<DIRECTORIO>/<pid>.json (a lo más cada INTERVALO segundos, y siempre antes de responder
+/metrics) y /metrics suma los archivos de todos los procesos. El directorio debe
+vaciarse al iniciar el servidor, como con el modo multiproceso de prometheus_client.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+CONFIGURACION = {
+    'ACTIVA': False,
+    'DIRECTORIO': None,
+    'INTERVALO': 5,
+    # /metrics exige "Authorization: Bearer <TOKEN>"; sin TOKEN responde 403 (se sigue midiendo)
+    'TOKEN': None,
+}
+
+CUBETAS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CUBETAS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# nombre: (tipo, ayuda, cubetas)
+METRICAS = {
+    'api_solicitudes_total': ('counter', 'Solicitudes atendidas por vista, método y código', None),
+    'api_errores_total': ('counter', 'Respuestas 5xx por vista', None),
+    'api_duracion_segundos': ('histogram', 'Duración de la solicitud por vista', CUBETAS_SEGUNDOS),
+    'api_consultas_sql': ('histogram', 'Consultas SQL por solicitud y vista', CUBETAS_CONSULTAS),
+    'api_tickets_creados_total': ('counter', 'Tickets creados', None),
+    'api_tickets_cerrados_total': ('counter', 'Tickets que pasaron a Cerrado', None),
+}
+
+
+def configuracion_metricas():
+    config = dict(CONFIGURACION)
+    config.update(getattr(settings, 'METRICAS', {}))
+    return config
+
+
+class Registro:
+    """
+    Valores por (nombre, etiquetas). Los histogramas guardan la cuenta de cada cubeta
+    (no acumulada; la última es +Inf), la suma y la cuenta total.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.contadores = defaultdict(float)
+        self.histogramas = {}
+        self._ultimo_volcado = 0.0
+
+    def incrementar(self, nombre, valor=1, **etiquetas):
+        clave = (nombre, tuple(etiquetas.items()))
+        with self._lock:
+            self.contadores[clave] += valor
+
+    def _observar(self, nombre, valor, etiquetas):
+        cubetas = METRICAS[nombre][2]
+        clave = (nombre, etiquetas)
+        histograma = self.histogramas.get(clave)
+        if histograma is None:
+            histograma = self.histogramas[clave] = [[0] * (len(cubetas) + 1), 0.0, 0]
+        histograma[0][bisect_left(cubetas, valor)] += 1
+        histograma[1] += valor
+        histograma[2] += 1
+
+    def observar(self, nombre, valor, **etiquetas):
+        with self._lock:
+            self._observar(nombre, valor, tuple(etiquetas.items()))
+
+    def registrar_solicitud(self, vista, metodo, codigo, duracion, consultas):
+        """Todas las métricas de una solicitud con una sola toma del lock"""
+        etiquetas = (('vista', vista),)
+        with self._lock:
+            self.contadores[('api_solicitudes_total', (('vista', vista), ('metodo', metodo), ('codigo', str(codigo))))] += 1
+            if codigo >= 500:
+                self.contadores[('api_errores_total', etiquetas)] += 1
+            self._observar('api_duracion_segundos', duracion, etiquetas)
+            self._observar('api_consultas_sql', consultas, etiquetas)
+
+    def instantanea(self):
+        with self._lock:
+            return {
+                'contadores': [[n, list(e), v] for (n, e), v in self.contadores.items()],
+                'histogramas': [[n, list(e), list(h[0]), h[1], h[2]] for (n, e), h in self.histogramas.items()],
+            }
+
+    def reiniciar(self):
+        with self._lock:
+            self.contadores.clear()
+            self.histogramas.clear()
+
+    def volcar(self, directorio, intervalo=0):
+        """Escribe la instantánea del proceso si pasaron al menos `intervalo` segundos desde la última"""
+        ahora = time.monotonic()
+        with self._lock:
+            if ahora - self._ultimo_volcado < intervalo:
+                return
+            self._ultimo_volcado = ahora
+        ruta = os.path.join(directorio, f'{os.getpid()}.json')
+        temporal = f'{ruta}.{threading.get_ident()}.tmp'
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(self.instantanea(), archivo)
+        os.replace(temporal, ruta)  # quien lee nunca ve un archivo a medio escribir
+
+
+registro = Registro()
+
+
+def combinar(instantaneas):
+    """Suma las instantáneas de varios procesos en una sola"""
+    contadores = defaultdict(float)
+    histogramas = {}
+    for instantanea in instantaneas:
+        for nombre, etiquetas, valor in instantanea['contadores']:
+            contadores[(nombre, tuple(map(tuple, etiquetas)))] += valor
+        for nombre, etiquetas, cuentas, suma, total in instantanea['histogramas']:
+            clave = (nombre, tuple(map(tuple, etiquetas)))
+            actual = histogramas.setdefault(clave, [[0] * len(cuentas), 0.0, 0])
+            actual[0] = [a + b for a, b in zip(actual[0], cuentas)]
+            actual[1] += suma
+            actual[2] += total
+    return contadores, histogramas
+
+
+def instantaneas_procesos(directorio):
+    instantaneas = []
+    for nombre in os.listdir(directorio):
+        if not nombre.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directorio, nombre), encoding='utf-8') as archivo:
+                instantaneas.append(json.load(archivo))
+        except (OSError, ValueError):  # un proceso que terminó a medio volcar
+            continue
+    return instantaneas
+
+
+def _etiquetas(etiquetas):
+    if not etiquetas:
+        return ''
+    partes = []
+    for nombre, valor in etiquetas:
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        partes.append(f'{nombre}="{valor}"')
+    return '{' + ','.join(partes) + '}'
+
+
+def _numero(valor):
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+def texto_prometheus(contadores, histogramas):
+    lineas = []
+    for nombre, (tipo, ayuda, cubetas) in METRICAS.items():
+        lineas.append(f'# HELP {nombre} {ayuda}')
+        lineas.append(f'# TYPE {nombre} {tipo}')
+        if tipo == 'counter':
+            for (n, etiquetas), valor in sorted(contadores.items()):
+                if n == nombre:
+                    lineas.append(f'{nombre}{_etiquetas(etiquetas)} {_numero(valor)}')
+            continue
+        for (n, etiquetas), (cuentas, suma, total) in sorted(histogramas.items()):
+            if n != nombre:
+                continue
+            acumulado = 0
+            for limite, cuenta in zip(cubetas + ('+Inf',), cuentas):
+                acumulado += cuenta
+                le = limite if limite == '+Inf' else _numero(limite)
+                lineas.append(f'{nombre}_bucket{_etiquetas(etiquetas + (("le", le),))} {acumulado}')
+            lineas.append(f'{nombre}_sum{_etiquetas(etiquetas)} {_numero(suma)}')
+            lineas.append(f'{nombre}_count{_etiquetas(etiquetas)} {total}')
+    return '\n'.join(lineas) + '\n'
+
+
+def exportar():
+    """Texto de /metrics: el registro del proceso o la suma de todos los procesos"""
+    directorio = configuracion_metricas()['DIRECTORIO']
+    if directorio:
+        registro.volcar(directorio)
+        return texto_prometheus(*combinar(instantaneas_procesos(directorio)))
+    return texto_prometheus(*combinar([registro.instantanea()]))
+
+
+def contar_al_confirmar(nombre, valor=1):
+    """Contador de negocio: solo cuenta si la transacción en curso se confirma"""
+    if valor:
+        transaction.on_commit(lambda: registro.incrementar(nombre, valor))
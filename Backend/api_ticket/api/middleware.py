@@ -0,0 +1,401 @@
+"""
+Compresión de respuestas (brotli o gzip) según Accept-Encoding, configurada en
+COMPRESION (settings). Solo comprime respuestas completas de al menos MINIMO_BYTES:
+las respuestas en streaming (exportaciones, eventos) se envían tal cual para no
+retener sus bloques.
+
+Instrumentación por solicitud (INSTRUMENTACION en settings): consultas SQL, tiempo en
+la base, de serialización (medir_serializacion), de renderizado y total, en la cabecera
+Server-Timing (opcional: expone detalles internos) y en un log de solicitudes lentas que
+señala las consultas repetidas (patrones N+1).
+
+Métricas por vista para /metrics (api/metricas.py, METRICAS en settings).
+
+Fijación a la base principal tras escribir (api/routers.py, LECTURA en settings).
+
+Todos funcionan en modo sync (WSGI) y async (ASGI): con las vistas async
+(apps/tickets/vistas_async.py) la cadena completa corre en el event loop. Las consultas se
+miden con un execute_wrapper permanente en cada conexión, que suma a las mediciones
+activas en el contexto (ContextVar): así se cuentan también las consultas que el ORM
+async ejecuta en el hilo de sync_to_async, donde las conexiones son otras.
+"""
+import gzip
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import LazyObject
+from django.utils.regex_helper import _lazy_re_compile
+
+from . import metricas, routers
+
+try:
+    import brotli
+except ImportError:  # sin brotli solo se ofrece gzip
+    brotli = None
+
+CONFIGURACION = {
+    'ACTIVA': False,
+    'MINIMO_BYTES': 1024,
+    'GZIP_NIVEL': 6,
+    'BROTLI_CALIDAD': 4,
+    'TIPOS': ('application/json', 'text/', 'application/javascript'),
+}
+re_no_transform = _lazy_re_compile(r'\bno-transform\b')
+
+INSTRUMENTACION = {
+    'ACTIVA': False,
+    # Server-Timing en cada respuesta: cualquier cliente ve consultas y tiempos
+    'CABECERA': False,
+    # Una solicitud se registra como lenta si supera cualquiera de los dos umbrales
+    'UMBRAL_MS': 500,
+    'UMBRAL_CONSULTAS': 50,
+    # Veces que debe repetirse el mismo SQL para reportarlo como duplicado
+    'MIN_REPETICIONES': 3,
+}
+logger = logging.getLogger(__name__)
+_mediciones = ContextVar('mediciones', default=())
+
+
+def configuracion_compresion():
+    config = dict(CONFIGURACION)
+    config.update(getattr(settings, 'COMPRESION', {}))
+    return config
+
+
+def configuracion_instrumentacion():
+    config = dict(INSTRUMENTACION)
+    config.update(getattr(settings, 'INSTRUMENTACION', {}))
+    return config
+
+
+def codificaciones_aceptadas(cabecera):
+    """{codificación: q} desde Accept-Encoding"""
+    aceptadas = {}
+    for parte in cabecera.split(','):
+        nombre, _, parametros = parte.strip().partition(';')
+        q = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith('q='):
+            try:
+                q = float(parametros[2:])
+            except ValueError:
+                q = 0.0
+        if nombre:
+            aceptadas[nombre.strip().lower()] = q
+    return aceptadas
+
+
+def elegir_codificacion(cabecera):
+    aceptadas = codificaciones_aceptadas(cabecera)
+    comodin = aceptadas.get('*', 0.0)
+    candidatas = (['br'] if brotli is not None else []) + ['gzip']
+    puntajes = [(aceptadas.get(c, comodin), -orden, c) for orden, c in enumerate(candidatas)]
+    q, _, codificacion = max(puntajes)
+    return codificacion if q > 0 else None
+
+
+class MiddlewareAsync:
+    """Base de los middlewares del proyecto: sync y async según la cadena (como MiddlewareMixin)"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+
+class CompresionMiddleware(MiddlewareAsync):
+
+    def __init__(self, get_response):
+        self.config = configuracion_compresion()
+        if not self.config['ACTIVA']:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.comprimir(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.comprimir(request, await self.get_response(request))
+
+    def comprimir(self, request, response):
+        if not self.comprimible(response):
+            return response
+        # Vary se agrega aunque no se comprima: la respuesta depende de Accept-Encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.config['MINIMO_BYTES']:
+            return response
+        codificacion = elegir_codificacion(request.headers.get('Accept-Encoding', ''))
+        if codificacion is None:
+            return response
+
+        if codificacion == 'br':
+            contenido = brotli.compress(response.content, quality=self.config['BROTLI_CALIDAD'])
+        else:
+            contenido = gzip.compress(response.content, compresslevel=self.config['GZIP_NIVEL'], mtime=0)
+        if len(contenido) >= len(response.content):
+            return response
+
+        response.content = contenido
+        response['Content-Length'] = str(len(contenido))
+        response['Content-Encoding'] = codificacion
+        # El contenido cambió de bytes: el ETag fuerte pasa a débil, como en GZipMiddleware
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def comprimible(self, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return False
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if re_no_transform.search(response.get('Cache-Control', '')):
+            return False
+        tipo = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return tipo.startswith(self.config['TIPOS'])
+
+
+class Consultas:
+    """Cantidad y tiempo de las consultas de una solicitud"""
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_db = 0.0
+
+    def registrar(self, sql, duracion):
+        self.consultas += 1
+        self.tiempo_db += duracion
+
+    def registrar_serializacion(self, duracion):
+        pass
+
+
+class Medicion(Consultas):
+    """Consultas (y su SQL), tiempo en la base, de serialización y de renderizado de una solicitud"""
+
+    def __init__(self):
+        super().__init__()
+        self.tiempo_serializacion = 0.0
+        self.tiempo_render = 0.0
+        self.sql = Counter()
+
+    def registrar_serializacion(self, duracion):
+        self.tiempo_serializacion += duracion
+
+    def registrar(self, sql, duracion):
+        super().registrar(sql, duracion)
+        self.sql[sql] += 1  # mismo SQL con otros parámetros: misma consulta repetida
+
+    def repetidas(self, minimo):
+        return [{'sql': sql[:300], 'veces': veces} for sql, veces in self.sql.most_common() if veces >= minimo]
+
+
+def _medir(execute, sql, params, many, context):
+    mediciones = _mediciones.get()
+    if not mediciones:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracion = time.perf_counter() - inicio
+        for medicion in mediciones:
+            medicion.registrar(sql, duracion)
+
+
+def instalar_medicion(sender=None, connection=None, **kwargs):
+    """execute_wrapper permanente; las conexiones de hilos nuevos lo reciben al conectarse"""
+    if _medir not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_medir)
+
+
+def activar_medicion():
+    connection_created.connect(instalar_medicion, dispatch_uid='api.middleware.instalar_medicion')
+    for conexion in connections.all(initialized_only=True):
+        instalar_medicion(connection=conexion)
+
+
+@contextmanager
+def medir_consultas(medicion):
+    """Suma a `medicion` las consultas del contexto actual (y de los sync_to_async que lance)"""
+    token = _mediciones.set(_mediciones.get() + (medicion,))
+    try:
+        yield medicion
+    finally:
+        _mediciones.reset(token)
+
+
+@contextmanager
+def medir_serializacion():
+    """Suma la duración del bloque (con sus consultas) al tiempo de serialización de la solicitud"""
+    mediciones = _mediciones.get()
+    if not mediciones:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracion = time.perf_counter() - inicio
+        for medicion in mediciones:
+            medicion.registrar_serializacion(duracion)
+
+
+class InstrumentacionMiddleware(MiddlewareAsync):
+    """
+    Va primero en MIDDLEWARE para que el total incluya al resto. Desactivada lanza
+    MiddlewareNotUsed y no queda en la cadena.
+    """
+
+    def __init__(self, get_response):
+        self.config = configuracion_instrumentacion()
+        if not self.config['ACTIVA']:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        activar_medicion()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        medicion = request._medicion = Medicion()
+        inicio = time.perf_counter()
+        with medir_consultas(medicion):
+            response = self.get_response(request)
+        return self.terminar(request, response, medicion, time.perf_counter() - inicio)
+
+    async def __acall__(self, request):
+        medicion = request._medicion = Medicion()
+        inicio = time.perf_counter()
+        with medir_consultas(medicion):
+            response = await self.get_response(request)
+        return self.terminar(request, response, medicion, time.perf_counter() - inicio)
+
+    def terminar(self, request, response, medicion, total):
+        if self.config['CABECERA']:
+            response['Server-Timing'] = ', '.join((
+                f'db;dur={medicion.tiempo_db * 1000:.1f};desc="{medicion.consultas} consultas"',
+                f'serializacion;dur={medicion.tiempo_serializacion * 1000:.1f}',
+                f'render;dur={medicion.tiempo_render * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ))
+        if total * 1000 >= self.config['UMBRAL_MS'] or medicion.consultas >= self.config['UMBRAL_CONSULTAS']:
+            self.registrar_lenta(request, response, medicion, total)
+        return response
+
+    def process_template_response(self, request, response):
+        # Las respuestas de DRF se renderizan (JSON) justo después de este hook
+        medicion = request._medicion
+        inicio = time.perf_counter()
+
+        def fin_render(response):
+            medicion.tiempo_render = time.perf_counter() - inicio
+
+        response.add_post_render_callback(fin_render)
+        return response
+
+    def registrar_lenta(self, request, response, medicion, total):
+        datos = {
+            'metodo': request.method,
+            'ruta': request.get_full_path(),
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'db_ms': round(medicion.tiempo_db * 1000, 1),
+            'serializacion_ms': round(medicion.tiempo_serializacion * 1000, 1),
+            'render_ms': round(medicion.tiempo_render * 1000, 1),
+            'consultas': medicion.consultas,
+            'repetidas': medicion.repetidas(self.config['MIN_REPETICIONES']),
+        }
+        logger.warning('Solicitud lenta %s %s: %s ms, %s consultas (%s repetidas)', datos['metodo'],
+                       datos['ruta'], datos['total_ms'], datos['consultas'], len(datos['repetidas']),
+                       extra={'instrumentacion': datos})
+
+
+def nombre_vista(request):
+    """Nombre de la clase de la vista (o de la función con @api_view) que atendió la solicitud"""
+    match = request.resolver_match
+    if match is None:
+        return 'sin_ruta'
+    return getattr(match.func, 'view_class', match.func).__name__
+
+
+class MetricasMiddleware(MiddlewareAsync):
+    """Solicitudes, errores, duración y consultas por vista en el registro de métricas"""
+
+    def __init__(self, get_response):
+        config = metricas.configuracion_metricas()
+        if not config['ACTIVA']:
+            raise MiddlewareNotUsed
+        self.directorio = config['DIRECTORIO']
+        self.intervalo = config['INTERVALO']
+        super().__init__(get_response)
+        activar_medicion()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        inicio = time.perf_counter()
+        with medir_consultas(Consultas()) as consultas:
+            response = self.get_response(request)
+        return self.registrar(request, response, time.perf_counter() - inicio, consultas.consultas)
+
+    async def __acall__(self, request):
+        inicio = time.perf_counter()
+        with medir_consultas(Consultas()) as consultas:
+            response = await self.get_response(request)
+        return self.registrar(request, response, time.perf_counter() - inicio, consultas.consultas)
+
+    def registrar(self, request, response, duracion, consultas):
+        metricas.registro.registrar_solicitud(nombre_vista(request), request.method, response.status_code,
+                                              duracion, consultas)
+        if self.directorio:
+            metricas.registro.volcar(self.directorio, self.intervalo)
+        return response
+
+
+class PrimariaTrasEscrituraMiddleware(MiddlewareAsync):
+    """
+    Tras una escritura exitosa de un usuario autenticado, sus lecturas van a la base
+    principal por unos segundos. DRF autentica dentro de la vista y deja el usuario en
+    request.user, por eso se revisa a la salida.
+    """
+
+    def __init__(self, get_response):
+        if not routers.configuracion_lectura()['FIJAR_SEGUNDOS']:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        usuario = self.escritor(request, response)
+        if usuario is not None:
+            routers.fijar_a_primaria(usuario)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        usuario = self.escritor(request, response)
+        if isinstance(usuario, LazyObject):  # la vista no pasó por DRF (p. ej. el admin)
+            usuario = await request.auser()
+        if usuario is not None:
+            await routers.afijar_a_primaria(usuario)
+        return response
+
+    def escritor(self, request, response):
+        if request.method not in routers.METODOS_SEGUROS and response.status_code < 400:
+            return getattr(request, 'user', None)
+        return None
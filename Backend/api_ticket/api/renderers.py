@@ -0,0 +1,40 @@
+"""
+Renderer JSON con orjson (opcional, ver JSON_ORJSON en settings).
+
+Produce el mismo JSON compacto y UTF-8 que JSONRenderer con la configuración por defecto
+de DRF. Los tipos que orjson no conoce pasan por el JSONEncoder de DRF, salvo Decimal,
+que se escribe como texto (sin pasar por float) si COERCE_DECIMAL_TO_STRING está activo.
+"""
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # sin orjson se usa JSONRenderer tal cual
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+def _default(valor):
+    if isinstance(valor, Decimal):
+        return str(valor) if api_settings.COERCE_DECIMAL_TO_STRING else float(valor)
+    return _encoder.default(valor)
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Con ?indent o sin orjson, el renderer de DRF
+        if orjson is None or self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        contenido = orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z)
+        # JSONRenderer escapa U+2028 y U+2029 para que el JSON sea JavaScript válido
+        if b'\xe2\x80\xa8' in contenido or b'\xe2\x80\xa9' in contenido:
+            contenido = contenido.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return contenido
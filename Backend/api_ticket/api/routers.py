@@ -0,0 +1,131 @@
+"""
+Router de lectura/escritura. Las vistas de reportes se marcan como de solo lectura
+(SoloLecturaMixin o @solo_lectura) y sus GET leen del alias LECTURA['ALIAS']: el mismo
+archivo SQLite abierto con mode=ro, o una copia refrescada periódicamente
+(refrescar_copia_lectura). Así los reportes largos no compiten con las escrituras por
+la conexión principal. Toda escritura va siempre a 'default'.
+
+Consistencia: tras una escritura exitosa, el usuario queda fijado a la base principal
+durante LECTURA['FIJAR_SEGUNDOS'] (ver PrimariaTrasEscrituraMiddleware), para que lea lo
+que acaba de escribir aunque la copia aún no lo tenga. La marca se guarda en la cache
+de Django: con una cache compartida vale para todos los workers.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+CONFIGURACION = {
+    'ALIAS': 'lectura',
+    'FIJAR_SEGUNDOS': 5,
+}
+METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS')
+_lectura = ContextVar('lectura', default=False)
+
+
+def configuracion_lectura():
+    config = dict(CONFIGURACION)
+    config.update(getattr(settings, 'LECTURA', {}))
+    return config
+
+
+def alias_lectura():
+    """El alias de lectura, o None si no está configurado o es la misma base que default (espejo en tests)"""
+    alias = configuracion_lectura()['ALIAS']
+    if alias not in settings.DATABASES:
+        return None
+    if connections[alias].settings_dict['NAME'] == connections[DEFAULT_DB_ALIAS].settings_dict['NAME']:
+        return None
+    return alias
+
+
+def en_modo_lectura():
+    return _lectura.get()
+
+
+@contextmanager
+def modo_lectura(activo=True):
+    token = _lectura.set(activo)
+    try:
+        yield
+    finally:
+        _lectura.reset(token)
+
+
+def _clave_fijado(usuario):
+    return f'lectura:primaria:{usuario.pk}'
+
+
+def fijar_a_primaria(usuario):
+    segundos = configuracion_lectura()['FIJAR_SEGUNDOS']
+    if segundos and usuario.is_authenticated:
+        cache.set(_clave_fijado(usuario), True, segundos)
+
+
+async def afijar_a_primaria(usuario):
+    segundos = configuracion_lectura()['FIJAR_SEGUNDOS']
+    if segundos and usuario.is_authenticated:
+        await cache.aset(_clave_fijado(usuario), True, segundos)
+
+
+def fijado_a_primaria(usuario):
+    return usuario.is_authenticated and cache.get(_clave_fijado(usuario), False)
+
+
+async def afijado_a_primaria(usuario):
+    return usuario.is_authenticated and await cache.aget(_clave_fijado(usuario), False)
+
+
+def lectura_permitida(request):
+    """Solicitudes seguras de usuarios que no escribieron hace poco"""
+    return request.method in METODOS_SEGUROS and not fijado_a_primaria(request.user)
+
+
+async def alectura_permitida(request):
+    return request.method in METODOS_SEGUROS and not await afijado_a_primaria(request.user)
+
+
+class SoloLecturaMixin:
+    """Vista de DRF cuyos GET leen del alias de lectura; se activa después de autenticar"""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if lectura_permitida(request):
+            self._token_lectura = _lectura.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_token_lectura', None)
+        if token is not None:
+            _lectura.reset(token)
+            self._token_lectura = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def solo_lectura(vista):
+    """Lo mismo para vistas función con @api_view (va debajo del decorador)"""
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        with modo_lectura(lectura_permitida(request)):
+            return vista(request, *args, **kwargs)
+    return envoltura
+
+
+class LecturaRouter:
+
+    def db_for_read(self, model, **hints):
+        if _lectura.get():
+            return alias_lectura()
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Explícito: sin esto Django escribiría en la base de la que se leyó la instancia
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # ambos alias son la misma base
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != configuracion_lectura()['ALIAS']
@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
+from .sqlite import opciones_sqlite
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,6 +45,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'knox',
     'drf_yasg',
+    'django_filters',
     'apps.autenticacion',
     'apps.tickets',
     'corsheaders',
@@ -55,18 +59,131 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     
+    # JWT primero: es lo que envía el frontend
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'knox.auth.TokenAuthentication',
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.autenticacion.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
         
         ),
-        
-    
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+}
+
+# JSON con orjson (pip install orjson). Mismo JSON que JSONRenderer, más rápido en listados grandes
+JSON_ORJSON = False
+if JSON_ORJSON:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+
+# Compresión de respuestas (api/middleware.py). Brotli requiere el paquete brotli; si no, gzip.
+# Apagada por defecto (suele comprimir el proxy): el despliegue la activa con COMPRESION_ACTIVA=1
+COMPRESION = {
+    'ACTIVA': os.environ.get('COMPRESION_ACTIVA', '0') == '1',
+    'MINIMO_BYTES': 1024,
+    'GZIP_NIVEL': 6,
+    'BROTLI_CALIDAD': 4,
+}
+
+# Server-Timing y log de solicitudes lentas (api/middleware.py). Desactivada no agrega costo;
+# se activa con INSTRUMENTACION_ACTIVA=1. La cabecera muestra consultas y tiempos internos a
+# cualquier cliente: solo con DEBUG
+INSTRUMENTACION = {
+    'ACTIVA': os.environ.get('INSTRUMENTACION_ACTIVA', '0') == '1',
+    'CABECERA': DEBUG,
+    'UMBRAL_MS': 500,
+    'UMBRAL_CONSULTAS': 50,
+    'MIN_REPETICIONES': 3,
+}
+
+# Métricas Prometheus en /metrics (api/metricas.py), activas con METRICAS_ACTIVA=1. Con varios
+# workers, DIRECTORIO debe apuntar a una carpeta compartida y vacía al arrancar (un archivo
+# por proceso). /metrics exige "Authorization: Bearer $METRICAS_TOKEN": sin la variable
+# responde siempre 403
+METRICAS = {
+    'ACTIVA': os.environ.get('METRICAS_ACTIVA', '0') == '1',
+    'DIRECTORIO': os.environ.get('METRICAS_DIRECTORIO'),
+    'INTERVALO': 5,
+    'TOKEN': os.environ.get('METRICAS_TOKEN'),
+}
+
+# Autenticadores por vista (nombre de la clase), en orden. Las vistas que no aparecen
+# usan DEFAULT_AUTHENTICATION_CLASSES. Las lecturas frecuentes validan el JWT desde sus
+# claims, sin consultar el usuario: un usuario desactivado o con otro rol sigue leyendo
+# hasta que vence su token de acceso (SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'])
+AUTENTICACION_LECTURA = [
+    'apps.autenticacion.authentication.JWTClaimsAuthentication',
+    'apps.autenticacion.authentication.CachedTokenAuthentication',
+    'rest_framework.authentication.SessionAuthentication',
+    'rest_framework.authentication.BasicAuthentication',
+]
+AUTENTICACION_VISTAS = {
+    'TicketListCreateView': AUTENTICACION_LECTURA,
+    'TicketDetailView': AUTENTICACION_LECTURA,
+    'ClosedTicketListView': AUTENTICACION_LECTURA,
+    'TicketSearchView': AUTENTICACION_LECTURA,
+}
+
+# Cache por proceso de tokens Knox ya verificados. TTL en segundos: cuánto puede seguir
+# siendo aceptado en otro proceso un token tras logout
+CACHE_TOKENS_KNOX = {
+    'MAX_ITEMS': 10000,
+    'TTL': 30,
+}
+
+# Paginación por cursor de /tickets/, /tickets-cerrados/ y /usuarios/.
+# Con POR_DEFECTO en False la lista completa se mantiene para el frontend actual
+# y el cliente la activa con ?cursor=, ?page_size= o ?paginar=1
+PAGINACION_CURSOR = {
+    'PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 500,
+    'POR_DEFECTO': False,
+}
+
+# Con True el dashboard lee la tabla de contadores en vez de agregar sobre Ticket.
+# Al activarlo en una base existente ejecutar antes `manage.py reconstruir_contadores`
+DASHBOARD_CONTADORES = False
+
+# Listados de tickets serializados desde filas values() (apps/tickets/serializacion.py)
+SERIALIZACION_RAPIDA = True
+
+# Vistas async de las lecturas frecuentes (apps/tickets/vistas_async.py). Solo convienen con
+# ASGI: api/asgi.py las activa; con WSGI cada una correría en su propio event loop
+VISTAS_ASYNC = os.environ.get('VISTAS_ASYNC', '0') == '1'
+
+# Feed de cambios por Server-Sent Events en /tickets/eventos/ (apps/tickets/eventos.py). El
+# registro es por proceso; conviene servirlo con ASGI, con WSGI cada conexión ocupa un hilo
+EVENTOS = {
+    'ACTIVO': True,
+    'MAX_EVENTOS': 1000,
+    'LATIDO': 15,
+    'DURACION_MAX': 300,
+    'RETRY_MS': 3000,
+}
+
+# Máximo de tickets por solicitud en POST /tickets/masivo/
+TICKETS_MASIVO_MAX = 5000
+
+# Coincidencias (las más recientes) que se ordenan por relevancia en /tickets/buscar/
+BUSQUEDA_MAX_CANDIDATOS = 10000
+
+# Cache por proceso de Categoria/Prioridad/Estado/Servicio (ver apps/tickets/catalogos.py).
+# TTL en segundos: cuánto puede tardar un proceso en ver un cambio hecho por otro
+CACHE_CATALOGOS = {
+    'MAX_ITEMS': 1000,
+    'TTL': 300,
 }
 MIDDLEWARE = [
+    'api.middleware.InstrumentacionMiddleware',
+    'api.middleware.MetricasMiddleware',
+    'api.middleware.PrimariaTrasEscrituraMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompresionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -112,11 +229,35 @@ WSGI_APPLICATION = 'api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Pragmas y modo de transacción de SQLite para varios workers (ver api/sqlite.py). El modo
+# WAL se activa una vez por base al desplegar: `python manage.py activar_wal`
+SQLITE = {
+    'BUSY_TIMEOUT_MS': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'MMAP_BYTES': int(os.environ.get('SQLITE_MMAP_BYTES', 256 * 1024 * 1024)),
+    'CACHE_KIB': int(os.environ.get('SQLITE_CACHE_KIB', 64 * 1024)),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'OPTIONS': opciones_sqlite(SQLITE),
+    },
+    # Solo lectura para reportes (api/routers.py): la misma base con mode=ro, o la copia que
+    # mantiene refrescar_copia_lectura si se define BASE_LECTURA. En tests es espejo de default
+    'lectura': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"file:{os.environ.get('BASE_LECTURA', BASE_DIR / 'db.sqlite3')}?mode=ro",
+        'OPTIONS': opciones_sqlite(SQLITE, TRANSACCION=None, SOLO_LECTURA=True),
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+DATABASE_ROUTERS = ['api.routers.LecturaRouter']
+
+# Tras escribir, un usuario lee de la base principal durante FIJAR_SEGUNDOS
+LECTURA = {
+    'ALIAS': 'lectura',
+    'FIJAR_SEGUNDOS': 5,
 }
 # autenticacion de usuario personalizado
 
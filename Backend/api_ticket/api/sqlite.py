@@ -0,0 +1,61 @@
+"""
+Ajustes de conexión de SQLite para servir con varios workers. Se aplican en
+DATABASES['default']['OPTIONS'] (settings), sin depender de Django:
+
+- synchronous=NORMAL: con WAL sigue siendo consistente ante caídas; solo la última
+  transacción confirmada puede perderse si se corta la energía.
+- busy_timeout: cuánto espera una conexión el lock de escritura antes de fallar con
+  "database is locked".
+- mmap_size y cache_size: lecturas desde memoria en vez de llamadas read().
+- BEGIN IMMEDIATE: las transacciones toman el lock de escritura al comenzar. Con BEGIN
+  (DEFERRED) una transacción que lee y luego escribe falla de inmediato, sin esperar
+  busy_timeout, si otra conexión escribe entre medio.
+- SOLO_LECTURA: query_only para el alias de lectura (api/routers.py); ese alias no usa
+  BEGIN IMMEDIATE, que falla en una base de solo lectura.
+
+journal_mode=WAL (los lectores no bloquean al escritor ni el escritor a los lectores) no
+va en init_command: queda guardado en el archivo, y fijarlo al conectar convertiría la
+base con cualquier comando de manage.py, incluso check. Se activa una vez por base al
+desplegar, con `manage.py activar_wal` (ver activar_wal()).
+"""
+CONFIGURACION = {
+    'SYNCHRONOUS': 'NORMAL',
+    'BUSY_TIMEOUT_MS': 5000,
+    'MMAP_BYTES': 256 * 1024 * 1024,
+    'CACHE_KIB': 64 * 1024,
+    'TRANSACCION': 'IMMEDIATE',
+    'SOLO_LECTURA': False,
+}
+NIVELES_SYNCHRONOUS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def pragmas(config):
+    if config['SYNCHRONOUS'].upper() not in NIVELES_SYNCHRONOUS:
+        raise ValueError(f"SYNCHRONOUS debe ser uno de {', '.join(NIVELES_SYNCHRONOUS)}")
+    lista = [
+        f"PRAGMA synchronous={config['SYNCHRONOUS'].upper()}",
+        f"PRAGMA busy_timeout={int(config['BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(config['MMAP_BYTES'])}",
+        # cache_size negativo se expresa en KiB, no en páginas
+        f"PRAGMA cache_size=-{int(config['CACHE_KIB'])}",
+    ]
+    if config['SOLO_LECTURA']:
+        lista.append('PRAGMA query_only=ON')
+    return lista
+
+
+def opciones_sqlite(ajustes=None, **cambios):
+    """OPTIONS de DATABASES: PRAGMAs en init_command (una vez por conexión) y modo de transacción"""
+    config = dict(CONFIGURACION)
+    config.update(ajustes or {})
+    config.update(cambios)
+    opciones = {'init_command': ';'.join(pragmas(config))}
+    if config['TRANSACCION']:
+        opciones['transaction_mode'] = config['TRANSACCION']
+    return opciones
+
+
+def activar_wal(cursor, activar=True):
+    """Pasa la base a journal_mode=WAL (o de vuelta a DELETE) y devuelve el modo resultante"""
+    cursor.execute(f"PRAGMA journal_mode={'WAL' if activar else 'DELETE'}")
+    return cursor.fetchone()[0]
@@ -0,0 +1,251 @@
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.autenticacion.models import Usuario
+from apps.tickets.models import Estado
+from . import metricas, middleware, renderers, routers, sqlite
+
+
+@skipUnless(renderers.orjson is not None, 'orjson no está instalado')
+class ORJSONRendererTest(SimpleTestCase):
+
+    def test_mismo_json_que_drf(self):
+        datos = {
+            'texto': 'Configuración línea', 'fecha': timezone.now(), 'lista': [1, None, True],
+            'anidado': {'id': 1, 'costo': '1000.00'}, 'duracion': timezone.timedelta(seconds=90),
+        }
+        self.assertEqual(renderers.ORJSONRenderer().render(datos), JSONRenderer().render(datos))
+        self.assertEqual(renderers.ORJSONRenderer().render(None), b'')
+
+    def test_decimal_sin_perder_precision(self):
+        contenido = renderers.ORJSONRenderer().render({'costo': Decimal('12345678901.23')})
+        self.assertEqual(json.loads(contenido), {'costo': '12345678901.23'})
+
+
+@override_settings(COMPRESION={'ACTIVA': True})
+class CompresionMiddlewareTest(SimpleTestCase):
+
+    def respuesta(self, response, aceptadas='gzip, deflate'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=aceptadas)
+        return middleware.CompresionMiddleware(lambda r: response)(request)
+
+    def json(self, tamano):
+        return HttpResponse(json.dumps(['x' * 10] * tamano), content_type='application/json')
+
+    def test_comprime_sobre_el_umbral(self):
+        response = self.json(500)
+        response['ETag'] = '"abc"'
+        original = response.content
+        response = self.respuesta(response)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), original)
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_no_comprime(self):
+        self.assertFalse(self.respuesta(self.json(5)).has_header('Content-Encoding'))
+        self.assertFalse(self.respuesta(self.json(500), 'identity').has_header('Content-Encoding'))
+        self.assertFalse(self.respuesta(self.json(500), 'gzip;q=0').has_header('Content-Encoding'))
+        flujo = StreamingHttpResponse(iter([b'x' * 5000]), content_type='text/event-stream')
+        self.assertFalse(self.respuesta(flujo).has_header('Content-Encoding'))
+
+    @override_settings(COMPRESION={'ACTIVA': False})
+    def test_desactivada(self):
+        with self.assertRaises(middleware.MiddlewareNotUsed):
+            middleware.CompresionMiddleware(lambda r: None)
+
+    def test_negociacion(self):
+        self.assertEqual(middleware.elegir_codificacion('br;q=0.5, gzip;q=0.8'), 'gzip')
+        self.assertEqual(middleware.elegir_codificacion('*'), 'br' if middleware.brotli else 'gzip')
+        self.assertIsNone(middleware.elegir_codificacion(''))
+
+
+class InstrumentacionMiddlewareTest(TestCase):
+
+    @override_settings(INSTRUMENTACION={'ACTIVA': True, 'CABECERA': True})
+    def test_server_timing(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = APIClient().get('/api/cargos/')
+        partes = dict(p.strip().split(';', 1) for p in response['Server-Timing'].split(','))
+        self.assertEqual(set(partes), {'db', 'serializacion', 'render', 'total'})
+        self.assertIn(f'desc="{len(consultas)} consultas"', partes['db'])
+
+    @override_settings(INSTRUMENTACION={'ACTIVA': True})
+    def test_sin_cabecera_por_defecto(self):
+        self.assertFalse(APIClient().get('/api/cargos/').has_header('Server-Timing'))
+
+    def test_mide_serializacion(self):
+        medicion = middleware.Medicion()
+        with middleware.medir_consultas(medicion), middleware.medir_serializacion():
+            time.sleep(0.01)
+        self.assertGreaterEqual(medicion.tiempo_serializacion, 0.01)
+        with middleware.medir_serializacion():  # fuera de una solicitud no mide nada
+            pass
+
+    @override_settings(INSTRUMENTACION={'ACTIVA': True, 'UMBRAL_MS': 10_000, 'UMBRAL_CONSULTAS': 4})
+    def test_registra_lentas_con_repetidas(self):
+        def vista(request):
+            for i in range(4):  # una consulta por elemento: N+1
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT %s', [i])
+            return HttpResponse('ok')
+
+        request = RequestFactory().get('/tickets/')
+        with self.assertLogs('api.middleware', 'WARNING') as log:
+            middleware.InstrumentacionMiddleware(vista)(request)
+        datos = log.records[0].instrumentacion
+        self.assertEqual((datos['ruta'], datos['consultas']), ('/tickets/', 4))
+        self.assertEqual(datos['repetidas'], [{'sql': 'SELECT %s', 'veces': 4}])
+
+        with self.assertNoLogs('api.middleware', 'WARNING'):
+            middleware.InstrumentacionMiddleware(lambda r: HttpResponse('ok'))(request)
+
+    @override_settings(INSTRUMENTACION={'ACTIVA': False})
+    def test_desactivada(self):
+        with self.assertRaises(middleware.MiddlewareNotUsed):
+            middleware.InstrumentacionMiddleware(lambda r: None)
+
+
+class MetricasTest(TestCase):
+
+    def setUp(self):
+        metricas.registro.reiniciar()
+
+    @override_settings(METRICAS={'ACTIVA': True, 'TOKEN': 'secreto'})
+    def test_por_vista(self):
+        client = APIClient()
+        client.get('/api/cargos/')
+        client.get('/api/cargos/')
+        response = client.get('/metrics', HTTP_AUTHORIZATION='Bearer secreto')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        texto = response.content.decode()
+        self.assertIn('api_solicitudes_total{vista="CargoListAPIView",metodo="GET",codigo="200"} 2', texto)
+        self.assertIn('api_duracion_segundos_bucket{vista="CargoListAPIView",le="+Inf"} 2', texto)
+        self.assertIn('api_consultas_sql_count{vista="CargoListAPIView"} 2', texto)
+        self.assertIn('# TYPE api_tickets_creados_total counter', texto)
+
+    def test_suma_los_procesos(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            otro = metricas.Registro()
+            otro.incrementar('api_tickets_creados_total', 5)
+            otro.observar('api_duracion_segundos', 0.2, vista='TicketListCreateView')
+            with open(os.path.join(directorio, '99999.json'), 'w') as archivo:
+                json.dump(otro.instantanea(), archivo)
+            metricas.registro.incrementar('api_tickets_creados_total', 2)
+            metricas.registro.observar('api_duracion_segundos', 0.001, vista='TicketListCreateView')
+            with override_settings(METRICAS={'ACTIVA': True, 'DIRECTORIO': directorio}):
+                texto = metricas.exportar()
+        self.assertIn('api_tickets_creados_total 7\n', texto)
+        self.assertIn('api_duracion_segundos_bucket{vista="TicketListCreateView",le="0.005"} 1\n', texto)
+        self.assertIn('api_duracion_segundos_bucket{vista="TicketListCreateView",le="0.25"} 2\n', texto)
+        self.assertIn('api_duracion_segundos_count{vista="TicketListCreateView"} 2\n', texto)
+
+    @override_settings(METRICAS={'ACTIVA': True, 'TOKEN': 'secreto'})
+    def test_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with override_settings(METRICAS={'ACTIVA': True, 'TOKEN': None}):
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secreto').status_code, 200)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'ajustes propios de SQLite')
+class AjustesSqliteTest(TestCase):
+
+    def pragma(self, nombre):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {nombre}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_de_la_conexion(self):
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('cache_size'), -64 * 1024)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_opciones(self):
+        opciones = sqlite.opciones_sqlite({'BUSY_TIMEOUT_MS': 100, 'TRANSACCION': None})
+        # WAL queda en el archivo: conectar (manage.py check, por ejemplo) no debe convertir la base
+        self.assertNotIn('journal_mode', opciones['init_command'])
+        self.assertIn('PRAGMA busy_timeout=100', opciones['init_command'])
+        self.assertNotIn('transaction_mode', opciones)
+        with self.assertRaises(ValueError):
+            sqlite.opciones_sqlite({'SYNCHRONOUS': 'NORMAL; DROP TABLE x'})
+
+    def test_activar_wal(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            with closing(sqlite3.connect(os.path.join(directorio, 'base.sqlite3'))) as base:
+                self.assertEqual(sqlite.activar_wal(base.cursor()), 'wal')
+                self.assertEqual(sqlite.activar_wal(base.cursor(), activar=False), 'delete')
+        # La base de los tests es en memoria: el comando no puede dejarla en WAL
+        with self.assertRaises(CommandError):
+            call_command('activar_wal', stdout=StringIO())
+
+
+class LecturaRouterTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.usuario = Usuario.objects.create_user(
+            rut_usuario=12345678, dv_rut_usuario='5', correo='usuario@test.cl',
+            nom_usuario='usuario', password='clave-segura', role='admin',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.usuario)
+
+    def test_enruta_solo_lecturas_en_modo_lectura(self):
+        router = routers.LecturaRouter()
+        with mock.patch.object(routers, 'alias_lectura', return_value='lectura'):
+            self.assertIsNone(router.db_for_read(Estado))
+            with routers.modo_lectura():
+                self.assertEqual(router.db_for_read(Estado), 'lectura')
+                self.assertEqual(router.db_for_write(Estado), 'default')
+        self.assertFalse(router.allow_migrate('lectura', 'tickets'))
+
+    def test_espejo_usa_default(self):
+        # En tests 'lectura' es espejo de default: leer de otra conexión no vería la transacción del test
+        self.assertIsNone(routers.alias_lectura())
+
+    def modo_en_dashboard(self):
+        with mock.patch('apps.tickets.views.estadisticas', side_effect=lambda: {'lectura': routers.en_modo_lectura()}):
+            return self.client.get('/api/dashboard/stats/').json()['lectura']
+
+    def test_fija_a_primaria_tras_escribir(self):
+        self.assertTrue(self.modo_en_dashboard())
+        self.assertFalse(routers.en_modo_lectura())
+        self.assertEqual(self.client.post('/estados/', {'nom_estado': 'Nuevo'}).status_code, 201)
+        self.assertFalse(self.modo_en_dashboard())
+        self.client.post('/estados/', {})  # las escrituras fallidas no fijan
+        cache.clear()
+        self.assertTrue(self.modo_en_dashboard())
+
+
+@skipUnless(connection.vendor == 'sqlite', 'copia propia de SQLite')
+class RefrescarCopiaLecturaTest(TransactionTestCase):
+    # Sin la transacción de TestCase: el respaldo espera a que no haya escrituras pendientes
+
+    def test_copia_la_base(self):
+        Estado.objects.create(nom_estado='Abierto')
+        with tempfile.TemporaryDirectory() as directorio:
+            destino = os.path.join(directorio, 'lectura.sqlite3')
+            call_command('refrescar_copia_lectura', destino=destino, stdout=StringIO())
+            with sqlite3.connect(f'file:{destino}?mode=ro', uri=True) as copia:
+                self.assertEqual(copia.execute('SELECT nom_estado FROM tickets_estado').fetchall(), [('Abierto',)])
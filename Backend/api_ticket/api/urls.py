@@ -21,6 +21,8 @@ from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from django.urls import path
 
+from .views import exportar_metricas
+
 schema_view = get_schema_view(
     openapi.Info(
         title="API Documentation",
@@ -36,6 +38,7 @@ urlpatterns = [
     path('', include('apps.autenticacion.urls')),
     path('', include('apps.tickets.urls')),
     path('admin/', admin.site.urls),
+    path('metrics', exportar_metricas, name='metricas'),
     path('', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
@@ -0,0 +1,18 @@
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from . import metricas
+
+
+def exportar_metricas(request):
+    """Métricas en formato de texto de Prometheus"""
+    config = metricas.configuracion_metricas()
+    if not config['ACTIVA']:
+        return HttpResponse(status=404)
+    # Sin token configurado nadie puede leerlas: exponen el tráfico y la latencia de cada vista
+    if not config['TOKEN']:
+        return HttpResponseForbidden()
+    esperado = f"Bearer {config['TOKEN']}"
+    if not constant_time_compare(request.headers.get('Authorization', ''), esperado):
+        return HttpResponseForbidden()
+    return HttpResponse(metricas.exportar(), content_type='text/plain; version=0.0.4; charset=utf-8')
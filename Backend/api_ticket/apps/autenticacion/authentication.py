@@ -0,0 +1,139 @@
+"""
+Autenticación sin consultas repetidas a la base en cada request.
+
+JWT:
+
+CustomTokenObtainPairSerializer ya incluye `nom_usuario` y `role` en el token. Con esos claims
+JWTClaimsAuthentication construye un Usuario con el resto de los campos diferidos: se comporta
+como el modelo (isinstance, FK, role, nom_usuario) y solo consulta la base si una vista lee otro
+campo. No se usa por defecto: cada vista de lectura la elige en settings.AUTENTICACION_VISTAS,
+y aun ahí solo para GET/HEAD/OPTIONS. En esas lecturas, desactivar un usuario o cambiar su rol
+se refleja al vencer su token de acceso; las escrituras siempre cargan el usuario de la base
+(JWTAuthentication revisa is_active).
+
+Knox: los tokens verificados se guardan por digest en una cache local al proceso, con
+expiración corta. Logout y logout-all (y el borrado de tokens vencidos) los invalidan
+mediante la señal post_delete de AuthToken; en otros procesos se ven al expirar la cache.
+"""
+from django.conf import settings
+from django.db import router
+from django.utils import timezone
+from knox.auth import TokenAuthentication
+from knox.crypto import hash_token
+from knox.settings import knox_settings
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings as drf_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from api.cache import CacheLRU
+from .models import Usuario
+
+CLAIMS_USUARIO = ('nom_usuario', 'role')
+
+
+def usuario_desde_claims(token):
+    """Usuario con rut, nombre y rol cargados desde el token y los demás campos diferidos"""
+    valores = {
+        # simplejwt guarda el id como texto
+        'rut_usuario': Usuario._meta.pk.to_python(token[api_settings.USER_ID_CLAIM]),
+        'nom_usuario': token['nom_usuario'],
+        'role': token['role'],
+    }
+    campos = [f.attname for f in Usuario._meta.concrete_fields if f.attname in valores]
+    return Usuario.from_db(router.db_for_read(Usuario), campos, [valores[c] for c in campos])
+
+
+def tiene_claims(token):
+    return api_settings.USER_ID_CLAIM in token and all(claim in token for claim in CLAIMS_USUARIO)
+
+
+class JWTClaimsAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que en lecturas arma el usuario desde los claims. Escrituras y
+    tokens sin claims cargan el usuario de la base, como JWTAuthentication.
+    """
+    lectura = False
+
+    def authenticate(self, request):
+        # DRF crea los autenticadores en cada request: el método se guarda en la instancia
+        self.lectura = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('El token no identifica a un usuario')
+        if not self.lectura or not tiene_claims(validated_token):
+            return super().get_user(validated_token)
+        return usuario_desde_claims(validated_token)
+
+    def autenticar_sin_base(self, request):
+        """
+        authenticate() solo cuando no necesita la base (token con claims): (usuario, token),
+        o None si no hay token Bearer o hay que cargar el usuario. Un token inválido lanza
+        InvalidToken igual que authenticate(). Lo usan las vistas async (vistas_async.py).
+        """
+        if request.method not in SAFE_METHODS:
+            return None
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        token = self.get_validated_token(raw_token)
+        if not tiene_claims(token):
+            return None
+        return usuario_desde_claims(token), token
+
+
+def _crear_cache_tokens():
+    config = {'MAX_ITEMS': 10000, 'TTL': 30}
+    config.update(getattr(settings, 'CACHE_TOKENS_KNOX', {}))
+    return CacheLRU(max_items=config['MAX_ITEMS'], ttl=config['TTL'])
+
+
+cache_tokens = _crear_cache_tokens()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication de Knox que recuerda por unos segundos los tokens ya verificados"""
+
+    def authenticate_credentials(self, token):
+        if knox_settings.AUTO_REFRESH:
+            # La renovación necesita escribir en la base en cada uso
+            return super().authenticate_credentials(token)
+        try:
+            digest = hash_token(token.decode('utf-8'))
+        except (TypeError, ValueError):
+            return super().authenticate_credentials(token)
+
+        auth_token = cache_tokens.get(digest)
+        ahora = timezone.now()
+        if auth_token is not None and (auth_token.expiry is None or auth_token.expiry > ahora):
+            return auth_token.user, auth_token
+
+        user, auth_token = super().authenticate_credentials(token)
+        ttl = None
+        if auth_token.expiry is not None:
+            ttl = min(cache_tokens.ttl, (auth_token.expiry - ahora).total_seconds())
+        cache_tokens.set(digest, auth_token, ttl=ttl)
+        return user, auth_token
+
+
+def clases_autenticacion(nombre_vista):
+    """
+    Autenticadores de una vista, en orden. settings.AUTENTICACION_VISTAS permite
+    cambiarlos por vista (nombre de la clase); si no, se usan los de REST_FRAMEWORK.
+    """
+    rutas = getattr(settings, 'AUTENTICACION_VISTAS', {}).get(nombre_vista)
+    if rutas is None:
+        return list(drf_settings.DEFAULT_AUTHENTICATION_CLASSES)
+    return [import_string(ruta) for ruta in rutas]
+
+
+class AutenticacionPorVistaMixin:
+    """Vistas cuyos autenticadores se eligen en settings.AUTENTICACION_VISTAS"""
+
+    def get_authenticators(self):
+        return [clase() for clase in clases_autenticacion(type(self).__name__)]
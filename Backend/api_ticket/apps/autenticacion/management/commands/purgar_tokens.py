@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from knox.models import AuthToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Elimina los tokens de Knox vencidos en lotes cortos, cada uno en su propia transacción, "
+        "para no retener el bloqueo de escritura de SQLite. Pensado para ejecutarse periódicamente (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=500, help="Tokens eliminados por transacción")
+        parser.add_argument('--pausa', type=float, default=0.05,
+                            help="Segundos de espera entre lotes para dejar pasar a otros escritores")
+
+    def handle(self, *args, **options):
+        ahora = timezone.now()
+        total = 0
+        while True:
+            digests = list(
+                AuthToken.objects.filter(expiry__lt=ahora).values_list('pk', flat=True)[:options['lote']]
+            )
+            if not digests:
+                break
+            with transaction.atomic():
+                eliminados, _ = AuthToken.objects.filter(pk__in=digests).delete()
+            total += eliminados
+            if len(digests) < options['lote']:
+                break
+            time.sleep(options['pausa'])
+        self.stdout.write(self.style.SUCCESS(f"Tokens vencidos eliminados: {total}"))
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from knox.models import AuthToken
+
+from .authentication import cache_tokens
+
+
+@receiver(post_delete, sender=AuthToken)
+def invalidar_token_en_cache(sender, instance, **kwargs):
+    # Logout, logout-all y la limpieza de vencidos borran filas de AuthToken
+    cache_tokens.delete(instance.digest)
@@ -1,3 +1,124 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from knox.models import AuthToken
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .authentication import cache_tokens
+from .models import Usuario
+from .serializers import CustomTokenObtainPairSerializer
+
+
+class JWTClaimsAuthenticationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = Usuario.objects.create_user(
+            rut_usuario=12345678, dv_rut_usuario='5', correo='usuario@test.cl',
+            nom_usuario='usuario', password='clave-segura',
+        )
+
+    def cliente(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def consultas_de_usuario(self, client, url):
+        with CaptureQueriesContext(connection) as consultas:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [q['sql'] for q in consultas if q['sql'].startswith('SELECT') and
+                'FROM "autenticacion_usuario" WHERE' in q['sql']]
+
+    def test_token_con_claims_no_consulta_usuario(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.usuario).access_token
+        self.assertEqual(self.consultas_de_usuario(self.cliente(token), '/tickets/'), [])
+
+    def test_usuario_liviano_carga_campos_diferidos(self):
+        from .authentication import usuario_desde_claims
+        token = CustomTokenObtainPairSerializer.get_token(self.usuario).access_token
+        usuario = usuario_desde_claims(token)
+        with self.assertNumQueries(0):
+            self.assertIsInstance(usuario, Usuario)
+            self.assertEqual((usuario.pk, usuario.nom_usuario, usuario.role), (12345678, 'usuario', 'usuario'))
+        with self.assertNumQueries(1):
+            self.assertEqual(usuario.correo, 'usuario@test.cl')
+
+    def test_token_sin_claims_usa_la_base(self):
+        token = RefreshToken.for_user(self.usuario).access_token
+        self.assertEqual(len(self.consultas_de_usuario(self.cliente(token), '/tickets/')), 1)
+
+    def test_escrituras_y_otras_vistas_revisan_la_base(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.usuario).access_token
+        Usuario.objects.filter(pk=self.usuario.pk).update(is_active=False)
+        client = self.cliente(token)
+        self.assertEqual(client.post('/tickets/', {}, format='json').status_code, 401)
+        self.assertEqual(client.get('/api/dashboard/stats/').status_code, 401)
+        # Las lecturas que eligen claims lo aceptan hasta que vence el token
+        self.assertEqual(client.get('/tickets/').status_code, 200)
+
+    @override_settings(AUTENTICACION_VISTAS={'TicketListCreateView': ['knox.auth.TokenAuthentication']})
+    def test_autenticadores_por_vista(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.usuario).access_token
+        self.assertEqual(self.cliente(token).get('/tickets/').status_code, 401)
+        self.assertEqual(self.cliente(token).get('/tickets-cerrados/').status_code, 200)
+
+
+class CachedTokenAuthenticationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = Usuario.objects.create_user(
+            rut_usuario=12345678, dv_rut_usuario='5', correo='usuario@test.cl',
+            nom_usuario='usuario', password='clave-segura',
+        )
+
+    def setUp(self):
+        cache_tokens.clear()
+        _, self.token = AuthToken.objects.create(self.usuario)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token}')
+
+    def consultas_knox(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/tickets/')
+        self.assertEqual(response.status_code, 200)
+        return [q for q in consultas if 'knox_authtoken' in q['sql']]
+
+    def test_segundo_request_usa_la_cache(self):
+        self.assertTrue(self.consultas_knox())
+        self.assertEqual(self.consultas_knox(), [])
+
+    def test_logout_invalida_la_cache(self):
+        self.consultas_knox()
+        self.assertEqual(self.client.post('/logout/').status_code, 204)
+        self.assertEqual(self.client.get('/tickets/').status_code, 401)
+
+    def test_logout_all_invalida_la_cache(self):
+        _, otro = AuthToken.objects.create(self.usuario)
+        self.consultas_knox()
+        otro_cliente = APIClient()
+        otro_cliente.credentials(HTTP_AUTHORIZATION=f'Token {otro}')
+        self.assertEqual(otro_cliente.post('/logout-all/').status_code, 204)
+        self.assertEqual(self.client.get('/tickets/').status_code, 401)
+
+
+class PurgarTokensTest(TestCase):
+
+    def test_elimina_solo_los_vencidos(self):
+        usuario = Usuario.objects.create_user(
+            rut_usuario=12345678, dv_rut_usuario='5', correo='usuario@test.cl',
+            nom_usuario='usuario', password='clave-segura',
+        )
+        for _ in range(5):
+            AuthToken.objects.create(usuario, expiry=timedelta(hours=-1))
+        vigente, _ = AuthToken.objects.create(usuario)
+        salida = StringIO()
+        call_command('purgar_tokens', lote=2, pausa=0, stdout=salida)
+        self.assertEqual(list(AuthToken.objects.all()), [vigente])
+        self.assertIn('5', salida.getvalue())
@@ -0,0 +1,121 @@
+"""
+Búsqueda de texto completo sobre Ticket.titulo y Ticket.comentario con FTS5 de SQLite.
+
+El índice es una tabla virtual de contenido externo (guarda solo el índice invertido, el
+texto sigue en tickets_ticket) y se mantiene con triggers, así que también refleja las
+escrituras masivas que no pasan por las señales. En otros motores la búsqueda no está
+disponible.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+
+TABLA = 'tickets_ticket_fts'
+
+ESQUEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA} USING fts5(
+        titulo, comentario, content='tickets_ticket', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABLA}_ai AFTER INSERT ON tickets_ticket BEGIN
+        INSERT INTO {TABLA}(rowid, titulo, comentario) VALUES (new.id, new.titulo, new.comentario);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABLA}_ad AFTER DELETE ON tickets_ticket BEGIN
+        INSERT INTO {TABLA}({TABLA}, rowid, titulo, comentario) VALUES ('delete', old.id, old.titulo, old.comentario);
+    END""",
+    # Ticket.save() reescribe todas las columnas: solo se reindexa si el texto cambió
+    f"""CREATE TRIGGER IF NOT EXISTS {TABLA}_au AFTER UPDATE OF titulo, comentario ON tickets_ticket
+    WHEN old.titulo IS NOT new.titulo OR old.comentario IS NOT new.comentario BEGIN
+        INSERT INTO {TABLA}({TABLA}, rowid, titulo, comentario) VALUES ('delete', old.id, old.titulo, old.comentario);
+        INSERT INTO {TABLA}(rowid, titulo, comentario) VALUES (new.id, new.titulo, new.comentario);
+    END""",
+]
+TRIGGERS = [f'{TABLA}_ai', f'{TABLA}_ad', f'{TABLA}_au']
+
+# El título pesa más que el comentario en el ranking bm25
+PESOS = (10.0, 1.0)
+
+
+def busqueda_disponible(conexion=connection):
+    return conexion.vendor == 'sqlite'
+
+
+def indice_existe(conexion=connection):
+    return TABLA in conexion.introspection.table_names()
+
+
+def crear_indice(conexion=connection, reconstruir=True):
+    """Crea la tabla virtual y los triggers si faltan; `reconstruir` vuelve a indexar todo"""
+    if not busqueda_disponible(conexion):
+        return False
+    with conexion.cursor() as cursor:
+        for sentencia in ESQUEMA:
+            cursor.execute(sentencia)
+        if reconstruir:
+            cursor.execute(f"INSERT INTO {TABLA}({TABLA}) VALUES ('rebuild')")
+    return True
+
+
+def eliminar_indice(conexion=connection):
+    if not busqueda_disponible(conexion):
+        return
+    with conexion.cursor() as cursor:
+        for trigger in TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLA}")
+
+
+def optimizar_indice(conexion=connection):
+    with conexion.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABLA}({TABLA}) VALUES ('optimize')")
+
+
+def consulta_fts(texto):
+    """
+    Convierte el texto del usuario en una consulta FTS5 segura: cada palabra entre comillas
+    (sin operadores ni sintaxis de columnas) y como prefijo, todas requeridas.
+    """
+    palabras = re.findall(r'\w+', texto or '')
+    return ' '.join(f'"{palabra}"*' for palabra in palabras) or None
+
+
+class BusquedaTickets:
+    """
+    Resultados de una búsqueda, ordenados por (rango bm25, id) y recorridos por páginas.
+
+    bm25 se calcula para cada coincidencia, así que una palabra presente en casi todos los
+    tickets costaría lo mismo que recorrer la tabla. Por eso solo se puntúan las
+    `max_candidatos` coincidencias más recientes (FTS5 las entrega en orden de rowid sin
+    ordenar); con términos selectivos el límite no se alcanza y el ranking es completo.
+    """
+
+    def __init__(self, texto, user_id=None, max_candidatos=None):
+        self.consulta = consulta_fts(texto)
+        self.user_id = user_id
+        if max_candidatos is None:
+            max_candidatos = getattr(settings, 'BUSQUEDA_MAX_CANDIDATOS', 10000)
+        self.max_candidatos = max_candidatos
+
+    def pagina(self, posicion, limite):
+        """[(id, rango)] de la página que sigue a `posicion` = [rango, id] (o la primera)"""
+        visibles, parametros = '', [self.consulta]
+        if self.user_id is not None:
+            # Misma regla de visibilidad que TicketListCreateView: solo sus propios tickets
+            visibles = "AND rowid IN (SELECT id FROM tickets_ticket WHERE user_id = %s)"
+            parametros.append(self.user_id)
+        parametros.append(self.max_candidatos)
+        despues = ''
+        if posicion is not None:
+            despues = "WHERE rango > %s OR (rango = %s AND id > %s)"
+            parametros += [posicion[0], posicion[0], posicion[1]]
+        sql = (
+            f"SELECT id, rango FROM ("
+            f"  SELECT rowid AS id, bm25({TABLA}, {PESOS[0]}, {PESOS[1]}) AS rango"
+            f"  FROM {TABLA} WHERE {TABLA} MATCH %s {visibles}"
+            f"  ORDER BY rowid DESC LIMIT %s"
+            f") {despues} ORDER BY rango, id LIMIT %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros + [limite])
+            return cursor.fetchall()
@@ -0,0 +1,130 @@
+"""
+Catálogos (Categoria, Prioridad, Estado, Servicio): tablas pequeñas que casi no cambian.
+
+La versión de los catálogos vive en la tabla Contador bajo la clave VERSION_CATALOGOS y
+las señales la incrementan en cada save/delete, así que es la misma para todos los procesos.
+
+Además cada proceso mantiene una cache de estos modelos (y de Departamento, para el
+dashboard) por id y por nombre, que las mismas señales vacían. Los cambios hechos por otro
+proceso se ven al expirar (CACHE_CATALOGOS['TTL']), o en cuanto /catalogos/ lee una versión
+nueva (sincronizar_version).
+"""
+from django.conf import settings
+
+from api.cache import CacheLRU
+from apps.autenticacion.models import Departamento
+from .contadores import incrementar
+from .models import Categoria, Contador, Estado, Prioridad, Servicio
+
+VERSION_CATALOGOS = 'catalogos:version'
+MODELOS_CATALOGO = (Categoria, Prioridad, Estado, Servicio)
+
+
+def version_catalogos():
+    version = Contador.objects.filter(clave=VERSION_CATALOGOS).values_list('valor', flat=True).first()
+    return version or 0
+
+
+async def aversion_catalogos():
+    version = await Contador.objects.filter(clave=VERSION_CATALOGOS).values_list('valor', flat=True).afirst()
+    return version or 0
+
+
+def incrementar_version_catalogos():
+    incrementar({VERSION_CATALOGOS: 1})
+
+
+def etag_catalogos(version):
+    return f'"catalogos-{version}"'
+
+
+class CacheCatalogo:
+    """Instancias de un catálogo por id y por nombre, sin consultar la base en cada uso"""
+
+    def __init__(self, modelo, campo_nombre):
+        config = {'MAX_ITEMS': 1000, 'TTL': 300}
+        config.update(getattr(settings, 'CACHE_CATALOGOS', {}))
+        self.modelo = modelo
+        self.campo_nombre = campo_nombre
+        self._cache = CacheLRU(max_items=config['MAX_ITEMS'], ttl=config['TTL'])
+
+    def _guardar(self, instancia):
+        self._cache.set(('id', instancia.pk), instancia)
+        self._cache.set(('nombre', getattr(instancia, self.campo_nombre)), instancia)
+
+    def _buscar(self, clave, **filtro):
+        instancia = self._cache.get(clave)
+        if instancia is None:
+            instancia = self.modelo.objects.filter(**filtro).first()
+            if instancia is not None:
+                self._guardar(instancia)
+        return instancia
+
+    def precargar(self, pks):
+        """Carga con una sola consulta los ids que aún no están en la cache (validación masiva)"""
+        faltantes = set()
+        for pk in pks:
+            if isinstance(pk, bool):
+                continue
+            try:
+                pk = int(pk)
+            except (TypeError, ValueError):
+                continue
+            if self._cache.get(('id', pk)) is None:
+                faltantes.add(pk)
+        if faltantes:
+            for instancia in self.modelo.objects.filter(pk__in=faltantes):
+                self._guardar(instancia)
+
+    def todos(self):
+        """Todas las instancias, ordenadas por id: el catálogo completo con una consulta"""
+        instancias = self._cache.get('todos')
+        if instancias is None:
+            instancias = list(self.modelo.objects.order_by('pk'))
+            for instancia in instancias:
+                self._guardar(instancia)
+            self._cache.set('todos', instancias)
+        return instancias
+
+    def por_id(self, pk):
+        return self._buscar(('id', int(pk)), pk=pk)
+
+    def por_nombre(self, nombre):
+        return self._buscar(('nombre', nombre), **{self.campo_nombre: nombre})
+
+    def invalidar(self):
+        self._cache.clear()
+
+
+_CACHES = {
+    Categoria: CacheCatalogo(Categoria, 'nom_categoria'),
+    Prioridad: CacheCatalogo(Prioridad, 'num_prioridad'),
+    Estado: CacheCatalogo(Estado, 'nom_estado'),
+    Servicio: CacheCatalogo(Servicio, 'titulo_servicio'),
+    Departamento: CacheCatalogo(Departamento, 'nom_departamento'),
+}
+
+
+def cache_catalogo(modelo):
+    return _CACHES[modelo]
+
+
+# Versión con la que se cargaron las caches de MODELOS_CATALOGO en este proceso
+_version_cargada = {'valor': None}
+
+
+def sincronizar_version(version):
+    """
+    Vacía las caches de MODELOS_CATALOGO si `version` (la compartida) no es la última que vio
+    este proceso: otro proceso cambió un catálogo. Así /catalogos/ nunca sirve datos de una
+    versión anterior con el ETag de la nueva.
+    """
+    if _version_cargada['valor'] != version:
+        for modelo in MODELOS_CATALOGO:
+            _CACHES[modelo].invalidar()
+        _version_cargada['valor'] = version
+
+
+def invalidar_caches():
+    for cache in _CACHES.values():
+        cache.invalidar()
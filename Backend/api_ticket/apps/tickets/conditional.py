@@ -0,0 +1,108 @@
+"""
+GET condicional (If-None-Match / If-Modified-Since) para el detalle y los listados de tickets.
+
+Los validadores salen de Ticket.version y Ticket.fecha_actualizacion. El detalle lee una
+sola fila; los listados los calculan desde las filas de la página que ya traen (id, versión
+y modificación de cada ticket), sin otra consulta: un 304 se ahorra la serialización.
+
+Con ?expand= la respuesta incluye los catálogos, que cambian sin tocar los tickets: el ETag
+suma la versión de los catálogos (una consulta más). El nombre del usuario (campo user) no
+forma parte del ETag: si se renombra un usuario, sus tickets pueden responder 304 con el
+nombre anterior hasta que el ticket cambie.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .catalogos import version_catalogos
+from .serializers import TicketSerializer
+
+
+def _timestamp(fecha):
+    return int(fecha.timestamp()) if fecha else None
+
+
+def version_expandida(request):
+    """Versión de los catálogos si la respuesta los expande (?expand=), si no None"""
+    _, expandir = TicketSerializer.campos_solicitados(request)
+    return version_catalogos() if expandir else None
+
+
+def validadores_ticket(fila, catalogos=None):
+    etag = f't{fila["id"]}-v{fila["version"]}-{fila["fecha_actualizacion"].timestamp():.6f}'
+    if catalogos is not None:
+        etag += f'-c{catalogos}'
+    return f'"{etag}"', _timestamp(fila['fecha_actualizacion'])
+
+
+# Columnas que los listados agregan a sus filas para los validadores
+COLUMNAS_VALIDADORES = ('id', 'version', 'fecha_actualizacion')
+
+
+def validadores_lista(request, filas):
+    """
+    ETag y última modificación de una página (filas values() o instancias de Ticket).
+    La consulta y el usuario forman parte de la clave: filtros, cursor y visibilidad.
+    """
+    resumen = hashlib.md5(usedforsecurity=False)
+    resumen.update(f'{request.get_full_path()}|{getattr(request.user, "pk", None)}'.encode('utf-8'))
+    catalogos = version_expandida(request)
+    if catalogos is not None:
+        resumen.update(b'|c%d' % catalogos)
+    ultima = None
+    for fila in filas:
+        if not isinstance(fila, dict):
+            fila = fila.__dict__
+        resumen.update(b'|%d-%d' % (fila['id'], fila['version']))
+        if ultima is None or fila['fecha_actualizacion'] > ultima:
+            ultima = fila['fecha_actualizacion']
+    return f'"l-{resumen.hexdigest()}"', _timestamp(ultima)
+
+
+def respuesta_no_modificada(request, etag, ultima_modificacion):
+    """HttpResponseNotModified si el cliente ya tiene esta versión, si no None"""
+    return get_conditional_response(request, etag=etag, last_modified=ultima_modificacion)
+
+
+def agregar_validadores(response, etag, ultima_modificacion):
+    response['ETag'] = etag
+    if ultima_modificacion is not None:
+        response['Last-Modified'] = http_date(ultima_modificacion)
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Authorization',))
+    return response
+
+
+class NoModificada(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalListMixin:
+    """
+    Listados de tickets que responden 304 cuando la página visible no cambió. Los validadores
+    se calculan en paginate_queryset(), con la página (o la lista completa) ya leída: el
+    queryset queda con su cache y la serialización no vuelve a consultar.
+    """
+    validadores = None
+    columnas_extra = COLUMNAS_VALIDADORES  # ListadoRapidoMixin
+
+    def list(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().list(request, *args, **kwargs)
+        try:
+            response = super().list(request, *args, **kwargs)
+        except NoModificada as no_modificada:
+            return no_modificada.response
+        return agregar_validadores(response, *self.validadores)
+
+    def paginate_queryset(self, queryset):
+        pagina = super().paginate_queryset(queryset)
+        if self.request.method not in ('GET', 'HEAD'):
+            return pagina
+        self.validadores = validadores_lista(self.request, pagina if pagina is not None else queryset)
+        no_modificada = respuesta_no_modificada(self.request, *self.validadores)
+        if no_modificada is not None:
+            raise NoModificada(agregar_validadores(no_modificada, *self.validadores))
+        return pagina
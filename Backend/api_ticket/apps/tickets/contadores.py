@@ -0,0 +1,161 @@
+"""
+Estadísticas del dashboard.
+
+Sin contadores, se calculan con un solo aggregate() sobre Ticket: un COUNT filtrado por
+cada valor de cada dimensión, con los valores y sus nombres tomados de la cache de
+catálogos (catalogos.py), más el conteo de usuarios. Con
+DASHBOARD_CONTADORES activo, se leen de la tabla Contador, que las señales de
+apps/tickets/signals.py mantienen al crear, cambiar o borrar tickets. Las
+operaciones masivas que no disparan señales deben llamar a incrementar() ellas mismas,
+y `manage.py reconstruir_contadores` recalcula todo cuando los valores se desvían.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from apps.autenticacion.models import Departamento, Usuario
+from .models import Categoria, Contador, Estado, Prioridad, Ticket
+
+DIMENSIONES = ('estado', 'categoria', 'prioridad', 'departamento')
+# Por dimensión: columna en Ticket, catálogo y campo con el nombre
+CAMPOS_DIMENSION = {
+    'estado': ('estado', Estado, 'nom_estado'),
+    'categoria': ('categoria', Categoria, 'nom_categoria'),
+    'prioridad': ('prioridad', Prioridad, 'num_prioridad'),
+    'departamento': ('user__cargo__departamento', Departamento, 'nom_departamento'),
+}
+SIN_VALOR = 'ninguno'
+
+
+def contadores_activos():
+    return getattr(settings, 'DASHBOARD_CONTADORES', False)
+
+
+def clave(dimension, valor):
+    return f"{dimension}:{SIN_VALOR if valor is None else valor}"
+
+
+def claves_ticket(dimensiones):
+    """Claves afectadas por un ticket, a partir de {dimension: id}"""
+    return ['tickets'] + [clave(d, dimensiones.get(d)) for d in DIMENSIONES]
+
+
+def dimensiones_ticket(ticket):
+    departamento = None
+    if ticket.user_id is not None:
+        departamento = Usuario.objects.filter(pk=ticket.user_id).values_list(
+            'cargo__departamento', flat=True
+        ).first()
+    return {
+        'estado': ticket.estado_id,
+        'categoria': ticket.categoria_id,
+        'prioridad': ticket.prioridad_id,
+        'departamento': departamento,
+    }
+
+
+def incrementar(deltas):
+    """Suma los deltas {clave: n} con un upsert, creando las claves que no existan"""
+    filas = [(c, delta) for c, delta in deltas.items() if delta]
+    if not filas:
+        return
+    tabla = connection.ops.quote_name(Contador._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {tabla} (clave, valor) VALUES (%s, %s) "
+            f"ON CONFLICT (clave) DO UPDATE SET valor = {tabla}.valor + excluded.valor",
+            filas,
+        )
+
+
+def filtro_claves_dashboard():
+    filtro = Q(clave__in=['tickets', 'usuarios'])
+    for dimension in DIMENSIONES:
+        filtro |= Q(clave__startswith=f"{dimension}:")
+    return filtro
+
+
+def _catalogo(dimension):
+    from .catalogos import cache_catalogo  # catalogos.py importa este módulo
+    return cache_catalogo(CAMPOS_DIMENSION[dimension][1])
+
+
+def _conteo_condicional():
+    agregados = {'tickets': Count('id')}
+    claves = {'tickets': 'tickets'}
+    for dimension, (campo, _, _) in CAMPOS_DIMENSION.items():
+        valores = [instancia.pk for instancia in _catalogo(dimension).todos()]
+        if dimension == 'departamento':
+            valores.append(None)  # tickets sin usuario o sin cargo
+        for valor in valores:
+            nombre = f"{dimension}_{SIN_VALOR if valor is None else valor}"
+            filtro = Q(**{f"{campo}__isnull": True}) if valor is None else Q(**{campo: valor})
+            agregados[nombre] = Count('id', filter=filtro)
+            claves[nombre] = clave(dimension, valor)
+    return Counter({claves[nombre]: total for nombre, total in Ticket.objects.aggregate(**agregados).items()})
+
+
+def conteo_agregado():
+    """Todos los conteos del dashboard: tickets con una consulta de agregación condicional, y usuarios"""
+    conteos = _conteo_condicional()
+    # Cada dimensión reparte todos los tickets; si no suman el total, la cache no conoce algún
+    # valor (creado en otro proceso) y se recarga una vez
+    if any(sum(v for c, v in conteos.items() if c.startswith(f"{d}:")) != conteos['tickets'] for d in DIMENSIONES):
+        for dimension in DIMENSIONES:
+            _catalogo(dimension).invalidar()
+        conteos = _conteo_condicional()
+    conteos['usuarios'] = Usuario.objects.count()
+    return conteos
+
+
+def conteo_contadores():
+    return Counter(dict(Contador.objects.filter(filtro_claves_dashboard()).values_list('clave', 'valor')))
+
+
+def reconstruir():
+    """Recalcula desde cero los contadores del dashboard"""
+    with transaction.atomic():
+        conteos = conteo_agregado()
+        Contador.objects.filter(filtro_claves_dashboard()).delete()
+        Contador.objects.bulk_create(Contador(clave=c, valor=v) for c, v in conteos.items())
+    return conteos
+
+
+def _desglose(conteos, dimension, nombres):
+    desglose = []
+    prefijo = f"{dimension}:"
+    for c, total in conteos.items():
+        if not c.startswith(prefijo) or not total:
+            continue
+        valor = c[len(prefijo):]
+        pk = None if valor == SIN_VALOR else int(valor)
+        desglose.append({'id': pk, 'nombre': nombres.get(pk), 'total': total})
+    return sorted(desglose, key=lambda d: -d['total'])
+
+
+def _nombres(dimension):
+    campo_nombre = CAMPOS_DIMENSION[dimension][2]
+    return {instancia.pk: getattr(instancia, campo_nombre) for instancia in _catalogo(dimension).todos()}
+
+
+def estadisticas():
+    conteos = conteo_contadores() if contadores_activos() else conteo_agregado()
+
+    por_estado = _desglose(conteos, 'estado', _nombres('estado'))
+    por_nombre = Counter()
+    for fila in por_estado:
+        por_nombre[fila['nombre']] += fila['total']
+
+    return {
+        "usuarios_totales": conteos['usuarios'],
+        "tickets_totales": conteos['tickets'],
+        "tickets_abiertos": por_nombre['Abierto'],
+        "tickets_cerrados": por_nombre['Cerrado'],
+        "tickets_pendientes": por_nombre['Pendiente'],
+        "por_estado": por_estado,
+        "por_categoria": _desglose(conteos, 'categoria', _nombres('categoria')),
+        "por_prioridad": _desglose(conteos, 'prioridad', _nombres('prioridad')),
+        "por_departamento": _desglose(conteos, 'departamento', _nombres('departamento')),
+    }
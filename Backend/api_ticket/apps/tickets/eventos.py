@@ -0,0 +1,208 @@
+"""
+Feed de cambios de tickets por Server-Sent Events (GET /tickets/eventos/).
+
+Las escrituras de tickets (creación, edición, cierre, también las masivas de operaciones.py)
+publican al confirmar su transacción un evento pequeño: el id del ticket y los campos que
+cambiaron, con los mismos valores que el listado (ids de catálogo, nom_usuario). El difusor
+es local al proceso: guarda los últimos EVENTOS['MAX_EVENTOS'] en memoria y despierta a las
+conexiones abiertas, sync (WSGI, un hilo por conexión) o async (ASGI, recomendado).
+
+Cada evento lleva un id "<arranque>-<n>". Un cliente que reconecta con Last-Event-ID recibe
+lo que se perdió; si esos eventos ya salieron del registro, o el id es de otro proceso o de
+antes de un reinicio, recibe un evento `reinicio` y debe volver a pedir el listado. Los
+usuarios que no son admin solo ven eventos de sus tickets (dueño anterior o nuevo).
+La importación (manage.py import_tickets) corre en otro proceso y no publica eventos.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque, namedtuple
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.autenticacion.models import Usuario
+
+CONFIGURACION = {
+    'ACTIVO': True,
+    'MAX_EVENTOS': 1000,
+    # Segundos sin eventos tras los que se envía un comentario (mantiene viva la conexión)
+    'LATIDO': 15,
+    # Segundos que dura cada conexión; el cliente reconecta solo con Last-Event-ID
+    'DURACION_MAX': 300,
+    'RETRY_MS': 3000,
+}
+CREADO, ACTUALIZADO, CERRADO = 'creado', 'actualizado', 'cerrado'
+
+Evento = namedtuple('Evento', 'id tipo ticket usuarios datos')
+
+
+def configuracion_eventos():
+    config = dict(CONFIGURACION)
+    config.update(getattr(settings, 'EVENTOS', {}))
+    return config
+
+
+class Difusor:
+    """Registro acotado de eventos con ids consecutivos y espera sync (Condition) o async (asyncio.Event)"""
+
+    def __init__(self, max_eventos=None):
+        self.arranque = format(time.time_ns() // 1000, 'x')
+        self.registro = deque(maxlen=max_eventos or configuracion_eventos()['MAX_EVENTOS'])
+        self.ultimo = 0
+        self._condicion = threading.Condition()
+        self._esperas = set()
+
+    def publicar(self, eventos):
+        """eventos: (tipo, ticket, usuarios, datos); se publican juntos con ids consecutivos"""
+        with self._condicion:
+            for tipo, ticket, usuarios, datos in eventos:
+                self.ultimo += 1
+                self.registro.append(Evento(self.ultimo, tipo, ticket, frozenset(usuarios), datos))
+            self._condicion.notify_all()
+            esperas = list(self._esperas)
+        for loop, evento in esperas:
+            try:
+                loop.call_soon_threadsafe(evento.set)
+            except RuntimeError:  # el loop de esa conexión ya se cerró
+                pass
+
+    def id_evento(self, numero):
+        return f'{self.arranque}-{numero}'
+
+    def posicion(self, last_event_id):
+        """Número de evento desde el que seguir: el actual sin Last-Event-ID, -1 si no es de este difusor"""
+        if not last_event_id:
+            return self.ultimo
+        arranque, _, numero = last_event_id.partition('-')
+        if arranque != self.arranque or not numero.isdigit() or int(numero) > self.ultimo:
+            return -1
+        return int(numero)
+
+    def desde(self, ultimo):
+        """Eventos posteriores a `ultimo`, o None si parte de ellos ya no está en el registro"""
+        with self._condicion:
+            if ultimo == self.ultimo:
+                return []
+            primero = self.ultimo - len(self.registro) + 1
+            if ultimo < primero - 1:
+                return None
+            return list(islice(self.registro, ultimo - primero + 1, None))
+
+    def esperar(self, ultimo, timeout):
+        with self._condicion:
+            self._condicion.wait_for(lambda: self.ultimo != ultimo, timeout)
+        return self.desde(ultimo)
+
+    async def aesperar(self, ultimo, timeout):
+        evento = asyncio.Event()
+        espera = (asyncio.get_running_loop(), evento)
+        with self._condicion:
+            self._esperas.add(espera)
+        try:
+            # Se revisa después de registrarse: una publicación intermedia no se pierde
+            if self.ultimo == ultimo:
+                try:
+                    await asyncio.wait_for(evento.wait(), timeout)
+                except TimeoutError:
+                    pass
+            return self.desde(ultimo)
+        finally:
+            with self._condicion:
+                self._esperas.discard(espera)
+
+
+difusor = Difusor()
+
+
+def valor_evento(valor):
+    """Como en el listado: catálogos por id, usuario por nom_usuario"""
+    if isinstance(valor, Usuario):
+        return valor.nom_usuario
+    return getattr(valor, 'pk', valor)
+
+
+def datos_ticket(ticket):
+    """Campos del listado que se conocen sin consultar la base (el usuario ya viene cargado)"""
+    return {
+        'id': ticket.pk, 'titulo': ticket.titulo, 'comentario': ticket.comentario,
+        'categoria': ticket.categoria_id, 'prioridad': ticket.prioridad_id, 'servicio': ticket.servicio_id,
+        'estado': ticket.estado_id, 'user': ticket.user.nom_usuario if ticket.user_id else None,
+    }
+
+
+def publicar_al_confirmar(eventos):
+    """Publica los eventos solo si la transacción en curso se confirma"""
+    eventos = list(eventos)
+    if eventos and configuracion_eventos()['ACTIVO']:
+        transaction.on_commit(lambda: difusor.publicar(eventos))
+
+
+def publicar_creados(tickets):
+    publicar_al_confirmar((CREADO, t.pk, {t.user_id} - {None}, datos_ticket(t)) for t in tickets)
+
+
+def evento_cambio(ticket_id, cambios, usuario_anterior, usuario_nuevo, cerrado):
+    """Evento de un ticket que cambió; lo ven el dueño anterior y el nuevo"""
+    datos = {'id': ticket_id, **{campo: valor_evento(valor) for campo, valor in cambios.items()}}
+    return CERRADO if cerrado else ACTUALIZADO, ticket_id, {usuario_anterior, usuario_nuevo} - {None}, datos
+
+
+def visible(evento, usuario):
+    return usuario.role == 'admin' or usuario.pk in evento.usuarios
+
+
+def formato_sse(evento):
+    datos = json.dumps(evento.datos, ensure_ascii=False, separators=(',', ':'))
+    return f'id: {difusor.id_evento(evento.id)}\nevent: {evento.tipo}\ndata: {datos}\n\n'
+
+
+def _reinicio(numero):
+    return f'id: {difusor.id_evento(numero)}\nevent: reinicio\ndata: {{}}\n\n'
+
+
+def _inicio(last_event_id, config):
+    """(texto inicial, número de evento desde el que seguir)"""
+    texto = f"retry: {config['RETRY_MS']}\n\n"
+    ultimo = difusor.posicion(last_event_id)
+    if ultimo < 0:
+        ultimo = difusor.ultimo
+        texto += _reinicio(ultimo)
+    return texto, ultimo
+
+
+def _fragmento(usuario, eventos, ultimo):
+    """(texto SSE, nuevo último) para lo que devolvió desde()/esperar()"""
+    if eventos is None:
+        ultimo = difusor.ultimo
+        return _reinicio(ultimo), ultimo
+    if not eventos:
+        return ': latido\n\n', ultimo
+    return ''.join(formato_sse(e) for e in eventos if visible(e, usuario)), eventos[-1].id
+
+
+def flujo(usuario, last_event_id):
+    """Cuerpo de la respuesta con WSGI: ocupa el hilo mientras la conexión está abierta"""
+    config = configuracion_eventos()
+    texto, ultimo = _inicio(last_event_id, config)
+    yield texto
+    fin = time.monotonic() + config['DURACION_MAX']
+    while (restante := fin - time.monotonic()) > 0:
+        texto, ultimo = _fragmento(usuario, difusor.esperar(ultimo, min(config['LATIDO'], restante)), ultimo)
+        if texto:
+            yield texto
+
+
+async def aflujo(usuario, last_event_id):
+    """Cuerpo de la respuesta con ASGI: la conexión abierta no ocupa un hilo"""
+    config = configuracion_eventos()
+    texto, ultimo = _inicio(last_event_id, config)
+    yield texto
+    fin = time.monotonic() + config['DURACION_MAX']
+    while (restante := fin - time.monotonic()) > 0:
+        eventos = await difusor.aesperar(ultimo, min(config['LATIDO'], restante))
+        texto, ultimo = _fragmento(usuario, eventos, ultimo)
+        if texto:
+            yield texto
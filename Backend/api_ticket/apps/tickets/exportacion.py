@@ -0,0 +1,116 @@
+"""
+Exportación de tickets en CSV o NDJSON.
+
+Las filas salen de una sola consulta values() recorrida con iterator(chunk_size), y cada
+formato es un generador que produce una línea por fila: ni la consulta ni la respuesta
+se materializan completas, por lo que la memoria no depende del número de tickets.
+"""
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .catalogos import cache_catalogo
+from .models import Estado, FechaTicket, Ticket
+
+COLUMNAS = {
+    'id': 'id',
+    'titulo': 'titulo',
+    'comentario': 'comentario',
+    'categoria': 'categoria__nom_categoria',
+    'prioridad': 'prioridad__num_prioridad',
+    'servicio': 'servicio__titulo_servicio',
+    'costo': 'servicio__costo',
+    'estado': 'estado__nom_estado',
+    'usuario': 'user__nom_usuario',
+    'fecha_creacion': 'fecha_creacion',
+    'fecha_cierre': 'fecha_cierre',
+}
+FORMATOS = ('csv', 'ndjson')
+TAMANO_BLOQUE = 2000
+
+
+def parse_fecha(valor, fin=False):
+    """Fecha (YYYY-MM-DD) o fecha y hora ISO; con solo fecha, `fin` incluye el día completo"""
+    if not valor:
+        return None
+    # Primero la fecha sola: parse_datetime también acepta "YYYY-MM-DD" (como medianoche)
+    try:
+        dia = parse_date(valor)
+    except ValueError:
+        dia = None
+    if dia is not None:
+        fecha = datetime.combine(dia + timedelta(days=1) if fin else dia, time.min)
+    else:
+        try:
+            fecha = parse_datetime(valor)
+        except ValueError:
+            fecha = None
+        if fecha is None:
+            raise ValueError(f"Fecha inválida: {valor}")
+    if timezone.is_naive(fecha):
+        fecha = timezone.make_aware(fecha)
+    return fecha
+
+
+def resolver_estado(valor):
+    """Estado por id o por nombre, desde la cache de catálogos"""
+    cache = cache_catalogo(Estado)
+    estado = cache.por_id(valor) if str(valor).isdigit() else cache.por_nombre(valor)
+    if estado is None:
+        raise ValueError(f"Estado inexistente: {valor}")
+    return estado
+
+
+def filas_exportacion(queryset=None, desde=None, hasta=None, estado=None, chunk_size=TAMANO_BLOQUE):
+    """Itera diccionarios con las COLUMNAS, filtrando por fecha de creación [desde, hasta) y estado"""
+    queryset = Ticket.objects.all() if queryset is None else queryset
+    if desde is not None or hasta is not None:
+        # El rango se resuelve sobre el índice (tipo_fecha, fecha, ticket) de FechaTicket
+        creados = FechaTicket.objects.filter(tipo_fecha='Creacion')
+        if desde is not None:
+            creados = creados.filter(fecha__gte=desde)
+        if hasta is not None:
+            creados = creados.filter(fecha__lt=hasta)
+        queryset = queryset.filter(pk__in=creados.values('ticket'))
+    if estado is not None:
+        queryset = queryset.filter(estado=estado)
+
+    columnas = queryset.con_fechas().order_by('pk').values_list(*COLUMNAS.values())
+    nombres = list(COLUMNAS)
+    for fila in columnas.iterator(chunk_size=chunk_size):
+        yield dict(zip(nombres, fila))
+
+
+def _fecha_local(valor):
+    return timezone.localtime(valor).isoformat() if valor is not None else None
+
+
+class _Linea:
+    """Destino de csv.writer que devuelve la línea escrita en vez de acumularla"""
+
+    def write(self, valor):
+        return valor
+
+
+def lineas_csv(filas):
+    writer = csv.writer(_Linea())
+    yield writer.writerow(list(COLUMNAS))
+    for fila in filas:
+        fila['fecha_creacion'] = _fecha_local(fila['fecha_creacion'])
+        fila['fecha_cierre'] = _fecha_local(fila['fecha_cierre'])
+        yield writer.writerow(fila.values())
+
+
+def lineas_ndjson(filas):
+    for fila in filas:
+        fila['fecha_creacion'] = _fecha_local(fila['fecha_creacion'])
+        fila['fecha_cierre'] = _fecha_local(fila['fecha_cierre'])
+        yield json.dumps(fila, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def lineas(formato, filas):
+    return lineas_csv(filas) if formato == 'csv' else lineas_ndjson(filas)
@@ -0,0 +1,151 @@
+"""
+Filtros por query string para los listados de tickets y usuarios (django-filter).
+
+Los ids de catálogo filtran por la columna *_id de Ticket (índice de la FK, sin join) y
+aceptan listas separadas por coma. Los rangos de fecha se resuelven con una subconsulta
+sobre el índice (tipo_fecha, fecha, ticket) de FechaTicket.
+"""
+from django import forms
+from django_filters import rest_framework as filters
+from django_filters.fields import RangeField
+from django_filters.widgets import RangeWidget
+
+from apps.autenticacion.models import Usuario
+from .exportacion import parse_fecha
+from .models import FechaTicket, Ticket
+
+
+class NumerosFilter(filters.BaseInFilter, filters.NumberFilter):
+    """?campo=1 o ?campo=1,2,3"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('lookup_expr', 'in')
+        super().__init__(*args, **kwargs)
+
+
+class FechaField(forms.CharField):
+    """Fecha (YYYY-MM-DD) o fecha y hora ISO; con `fin`, una fecha sola incluye el día completo"""
+
+    def __init__(self, *args, fin=False, **kwargs):
+        self.fin = fin
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        try:
+            return parse_fecha(super().to_python(value), fin=self.fin)
+        except ValueError as error:
+            raise forms.ValidationError(str(error))
+
+
+class RangoFechaWidget(RangeWidget):
+    suffixes = ['desde', 'hasta']
+
+
+class RangoFechaField(RangeField):
+    widget = RangoFechaWidget
+
+    def __init__(self, *args, **kwargs):
+        super().__init__((FechaField(), FechaField(fin=True)), *args, **kwargs)
+
+
+class RangoFechaTicketFilter(filters.Filter):
+    """?<nombre>_desde= y ?<nombre>_hasta= sobre la FechaTicket de un tipo, en una sola subconsulta"""
+    field_class = RangoFechaField
+
+    def __init__(self, *args, tipo_fecha, **kwargs):
+        self.tipo_fecha = tipo_fecha
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if not value or (value.start is None and value.stop is None):
+            return qs
+        fechas = FechaTicket.objects.filter(tipo_fecha=self.tipo_fecha)
+        if value.start is not None:
+            fechas = fechas.filter(fecha__gte=value.start)
+        if value.stop is not None:
+            fechas = fechas.filter(fecha__lt=value.stop)
+        return qs.filter(pk__in=fechas.values('ticket'))
+
+
+class OrdenField(forms.CharField):
+    """Lista separada por coma de nombres permitidos, con '-' para orden descendente"""
+
+    def __init__(self, *args, permitidos=(), **kwargs):
+        self.permitidos = permitidos
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        nombres = [nombre.strip() for nombre in value.split(',') if nombre.strip()]
+        invalidos = [n for n in nombres if n.lstrip('-') not in self.permitidos]
+        if invalidos:
+            raise forms.ValidationError(f"Orden no permitido: {', '.join(invalidos)}")
+        return nombres
+
+
+class OrdenFilter(filters.Filter):
+    """
+    ?ordering= con lista blanca {nombre público: campo}. Reemplaza a OrderingFilter de
+    django-filter, que como ChoiceFilter no funciona con Django 5 en la versión fijada.
+    """
+    field_class = OrdenField
+
+    def __init__(self, *args, campos, **kwargs):
+        self.campos = campos
+        super().__init__(*args, permitidos=tuple(campos), **kwargs)
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        return qs.order_by(*(
+            f"{'-' if nombre.startswith('-') else ''}{self.campos[nombre.lstrip('-')]}" for nombre in value
+        ))
+
+
+class TicketFilter(filters.FilterSet):
+    """
+    Filtros de los listados de tickets. El orden (?ordering=) aplica a la lista completa;
+    con paginación por cursor manda el orden del cursor.
+    """
+    categoria = NumerosFilter()
+    prioridad = NumerosFilter()
+    servicio = NumerosFilter()
+    estado = NumerosFilter()
+    user = NumerosFilter()
+    creado = RangoFechaTicketFilter(tipo_fecha='Creacion')
+    cerrado = RangoFechaTicketFilter(tipo_fecha='Cierre')
+    costo = filters.RangeFilter(field_name='servicio__costo')
+    ordering = OrdenFilter(campos={
+        'id': 'id',
+        'titulo': 'titulo',
+        'fecha_creacion': 'fecha_creacion',
+        'fecha_cierre': 'fecha_cierre',
+        'estado': 'estado',
+        'prioridad': 'prioridad',
+        'costo': 'servicio__costo',
+    })
+
+    class Meta:
+        model = Ticket
+        fields = []
+
+
+class OpcionFilter(filters.Filter):
+    """Igual a ChoiceFilter, pero con forms.ChoiceField de Django (ver OrdenFilter)"""
+    field_class = forms.ChoiceField
+
+
+class UsuarioFilter(filters.FilterSet):
+    role = OpcionFilter(choices=Usuario.ROLE_CHOICES)
+    cargo = NumerosFilter()
+    departamento = NumerosFilter(field_name='cargo__departamento')
+    is_active = filters.BooleanFilter()
+    ordering = OrdenFilter(campos={
+        'rut_usuario': 'rut_usuario',
+        'nom_usuario': 'nom_usuario',
+        'date_joined': 'date_joined',
+    })
+
+    class Meta:
+        model = Usuario
+        fields = []
@@ -0,0 +1,173 @@
+"""
+Importación masiva de tickets históricos (CSV o JSONL, mismas columnas que la exportación).
+
+Las referencias se resuelven con mapas precargados (una consulta por modelo) y cada lote se
+inserta en su propia transacción: bulk_create de Ticket y DetalleUsuarioTicket, y un INSERT
+directo de FechaTicket para conservar las fechas originales, que auto_now_add reemplazaría.
+El avance se guarda en la tabla Contador dentro de la misma transacción del lote, por lo que
+una importación interrumpida se retoma desde el último lote confirmado.
+
+FechaTicket no admite dos fechas iguales en un ticket (unique_together fecha, ticket): si
+una fila cierra en el mismo instante en que se creó (p. ej. ambas solo con la fecha), el
+cierre se guarda un microsegundo después, en vez de que el INSERT falle y aborte el lote.
+"""
+import csv
+import json
+from collections import Counter
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.autenticacion.models import Usuario
+from .contadores import contadores_activos, incrementar
+from .exportacion import parse_fecha
+from .models import Categoria, Contador, DetalleUsuarioTicket, Estado, FechaTicket, Prioridad, Servicio, Ticket
+from .operaciones import claves_contador, departamentos_de
+
+CATALOGOS = {
+    'categoria': (Categoria, 'nom_categoria'),
+    'prioridad': (Prioridad, 'num_prioridad'),
+    'servicio': (Servicio, 'titulo_servicio'),
+    'estado': (Estado, 'nom_estado'),
+}
+RELACIONES = ('asignado', 'resuelto')
+
+
+class FilaInvalida(ValueError):
+    pass
+
+
+def leer_filas(archivo, formato):
+    """Itera diccionarios desde un archivo CSV (con encabezado) o JSONL"""
+    if formato == 'csv':
+        yield from csv.DictReader(archivo)
+        return
+    for linea in archivo:
+        if linea.strip():
+            try:
+                yield json.loads(linea)
+            except ValueError:
+                yield None  # se informa como fila inválida sin detener la importación
+
+
+def mapa_catalogo(modelo, campo_nombre):
+    # Acepta el id o el nombre; si un nombre coincide con un id, gana el nombre (como en la exportación)
+    filas = list(modelo.objects.values_list('pk', campo_nombre))
+    mapa = {str(pk): pk for pk, _ in filas}
+    mapa.update({nombre: pk for pk, nombre in filas})
+    return mapa
+
+
+def mapa_usuarios():
+    # Por rut, correo o nom_usuario (que no es único: se usa el primero)
+    mapa = {}
+    for rut, correo, nombre in Usuario.objects.values_list('pk', 'correo', 'nom_usuario').order_by('pk'):
+        mapa.setdefault(nombre, rut)
+        mapa[correo] = rut
+        mapa[str(rut)] = rut
+    return mapa
+
+
+class Importador:
+    """Convierte filas en objetos y los inserta por lotes, guardando el avance bajo `clave`"""
+
+    def __init__(self, clave, tamano_lote=2000):
+        self.clave = f"importacion:{clave}"
+        self.tamano_lote = tamano_lote
+        self.mapas = {campo: mapa_catalogo(*config) for campo, config in CATALOGOS.items()}
+        self.usuarios = mapa_usuarios()
+
+    def avance(self):
+        return Contador.objects.filter(clave=self.clave).values_list('valor', flat=True).first() or 0
+
+    def reiniciar(self):
+        Contador.objects.filter(clave=self.clave).delete()
+
+    def _referencia(self, mapa, fila, campo, requerido=True):
+        valor = fila.get(campo)
+        valor = '' if valor is None else str(valor).strip()
+        if not valor:
+            if requerido:
+                raise FilaInvalida(f"Falta {campo}")
+            return None
+        try:
+            return mapa[valor]
+        except KeyError:
+            raise FilaInvalida(f"{campo} inexistente: {valor}")
+
+    def convertir(self, fila):
+        """(ticket, fechas [(tipo, fecha)], relaciones [(relacion, rut)]) o FilaInvalida"""
+        if not isinstance(fila, dict):
+            raise FilaInvalida("La fila no es un objeto JSON válido")
+        titulo = str(fila.get('titulo') or '').strip()
+        if not titulo:
+            raise FilaInvalida("Falta titulo")
+        ids = {f"{campo}_id": self._referencia(mapa, fila, campo) for campo, mapa in self.mapas.items()}
+        user_id = self._referencia(self.usuarios, fila, 'usuario', requerido=False)
+        try:
+            creacion = parse_fecha(fila.get('fecha_creacion')) or timezone.now()
+            cierre = parse_fecha(fila.get('fecha_cierre'))
+        except ValueError as error:
+            raise FilaInvalida(str(error))
+        if cierre == creacion:
+            cierre += timedelta(microseconds=1)
+
+        ticket = Ticket(titulo=titulo, comentario=fila.get('comentario') or None,
+                        user_id=user_id, **ids)
+        fechas = [('Creacion', creacion)] + ([('Cierre', cierre)] if cierre else [])
+        relaciones = [('creador', user_id)] if user_id else []
+        for relacion in RELACIONES:
+            rut = self._referencia(self.usuarios, fila, relacion, requerido=False)
+            if rut:
+                relaciones.append((relacion, rut))
+        return ticket, fechas, relaciones
+
+    def insertar_lote(self, lote, leidas):
+        """Inserta el lote y avanza el checkpoint en `leidas` filas, todo en una transacción"""
+        tabla = connection.ops.quote_name(FechaTicket._meta.db_table)
+        with transaction.atomic():
+            tickets = Ticket.objects.bulk_create([ticket for ticket, _, _ in lote])
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {tabla} (ticket_id, tipo_fecha, fecha) VALUES (%s, %s, %s)",
+                    [(ticket.pk, tipo, connection.ops.adapt_datetimefield_value(fecha))
+                     for ticket, fechas, _ in lote for tipo, fecha in fechas],
+                )
+            DetalleUsuarioTicket.objects.bulk_create(
+                [DetalleUsuarioTicket(ticket=ticket, usuario_id=rut, relacion_ticket=relacion)
+                 for ticket, _, relaciones in lote for relacion, rut in relaciones],
+                ignore_conflicts=True,
+            )
+            deltas = Counter({self.clave: leidas})
+            if contadores_activos():
+                departamentos = departamentos_de(t.user_id for t in tickets)
+                for ticket in tickets:
+                    deltas.update(claves_contador(ticket, departamentos))
+            incrementar(deltas)
+
+    def importar(self, filas, al_avanzar=None):
+        """
+        Importa las filas a partir del checkpoint. Devuelve (importadas, [(numero, error)]).
+        `al_avanzar(importadas, numero)` se llama después de cada lote confirmado.
+        """
+        inicio = self.avance()
+        importadas, errores, lote, leidas = 0, [], [], 0
+        for numero, fila in enumerate(filas, start=1):
+            if numero <= inicio:
+                continue
+            leidas += 1
+            try:
+                lote.append(self.convertir(fila))
+            except FilaInvalida as error:
+                errores.append((numero, str(error)))
+            if len(lote) >= self.tamano_lote:
+                self.insertar_lote(lote, leidas)
+                importadas += len(lote)
+                lote, leidas = [], 0
+                if al_avanzar:
+                    al_avanzar(importadas, numero)
+        if leidas:
+            self.insertar_lote(lote, leidas)
+            importadas += len(lote)
+        return importadas, errores
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.sqlite import activar_wal
+
+
+class Command(BaseCommand):
+    help = (
+        "Pasa la base SQLite a journal_mode=WAL, que queda guardado en el archivo: se ejecuta "
+        "una vez por base al desplegar. Crea junto a la base los archivos -wal y -shm"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desactivar', action='store_true',
+                            help="Vuelve al journal de rollback (journal_mode=DELETE)")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("El modo WAL solo aplica a SQLite")
+        esperado = 'delete' if options['desactivar'] else 'wal'
+        with connection.cursor() as cursor:
+            modo = activar_wal(cursor, activar=not options['desactivar'])
+        if modo.lower() != esperado:
+            raise CommandError(f"SQLite dejó la base en journal_mode={modo}")
+        self.stdout.write(self.style.SUCCESS(f"journal_mode={modo}"))
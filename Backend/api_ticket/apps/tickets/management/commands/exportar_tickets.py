@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tickets import exportacion
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta tickets con sus fechas y nombres de catálogo en CSV o NDJSON. "
+        "Las filas se leen por bloques y se escriben a medida que llegan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--formato', choices=exportacion.FORMATOS, default='csv')
+        parser.add_argument('--desde', help="Fecha de creación mínima (YYYY-MM-DD o ISO)")
+        parser.add_argument('--hasta', help="Fecha de creación máxima, inclusive si es solo fecha")
+        parser.add_argument('--estado', help="Id o nombre del estado")
+        parser.add_argument('--salida', help="Archivo de destino; por defecto la salida estándar")
+        parser.add_argument('--bloque', type=int, default=exportacion.TAMANO_BLOQUE,
+                            help="Filas leídas por bloque de la consulta")
+
+    def handle(self, *args, **options):
+        try:
+            desde = exportacion.parse_fecha(options['desde'])
+            hasta = exportacion.parse_fecha(options['hasta'], fin=True)
+            estado = exportacion.resolver_estado(options['estado']) if options['estado'] else None
+        except ValueError as error:
+            raise CommandError(error)
+
+        filas = exportacion.filas_exportacion(
+            desde=desde, hasta=hasta, estado=estado, chunk_size=options['bloque'],
+        )
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8', newline='') as archivo:
+                total = self.escribir(archivo.write, options['formato'], filas)
+        else:
+            total = self.escribir(lambda linea: self.stdout.write(linea, ending=''), options['formato'], filas)
+        self.stderr.write(self.style.SUCCESS(f"Tickets exportados: {total}"))
+
+    def escribir(self, escribir, formato, filas):
+        total = 0
+        for linea in exportacion.lineas(formato, filas):
+            escribir(linea)
+            total += 1
+        # La primera línea del CSV es el encabezado
+        return total - 1 if formato == 'csv' else total
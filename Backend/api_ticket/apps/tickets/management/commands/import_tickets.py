@@ -0,0 +1,58 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tickets.importacion import Importador, leer_filas
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa tickets históricos desde CSV o JSONL (columnas de exportar_tickets) por lotes, "
+        "conservando las fechas de creación y cierre. Si se interrumpe, al volver a ejecutarlo "
+        "continúa desde el último lote confirmado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo')
+        parser.add_argument('--formato', choices=('csv', 'jsonl'),
+                            help="Por defecto se deduce de la extensión del archivo")
+        parser.add_argument('--lote', type=int, default=2000, help="Tickets insertados por transacción")
+        parser.add_argument('--clave', help="Nombre del checkpoint; por defecto el nombre del archivo")
+        parser.add_argument('--reiniciar', action='store_true', help="Descarta el avance guardado")
+        parser.add_argument('--max-errores', type=int, default=20, help="Errores de fila que se listan")
+
+    def handle(self, *args, **options):
+        archivo = options['archivo']
+        formato = options['formato'] or ('csv' if archivo.lower().endswith('.csv') else 'jsonl')
+        if options['lote'] <= 0:
+            raise CommandError("--lote debe ser mayor que cero")
+        importador = Importador(options['clave'] or os.path.basename(archivo), options['lote'])
+        if options['reiniciar']:
+            importador.reiniciar()
+        inicio = importador.avance()
+        if inicio:
+            self.stdout.write(f"Retomando después de la fila {inicio}")
+
+        comienzo = time.perf_counter()
+
+        def al_avanzar(importadas, numero):
+            velocidad = importadas / max(time.perf_counter() - comienzo, 1e-9)
+            self.stdout.write(f"  fila {numero}: {importadas} tickets ({velocidad:.0f} filas/s)")
+
+        try:
+            with open(archivo, encoding='utf-8', newline='') as entrada:
+                importadas, errores = importador.importar(leer_filas(entrada, formato), al_avanzar)
+        except OSError as error:
+            raise CommandError(error)
+        duracion = time.perf_counter() - comienzo
+
+        for numero, error in errores[:options['max_errores']]:
+            self.stderr.write(f"Fila {numero}: {error}")
+        if len(errores) > options['max_errores']:
+            self.stderr.write(f"... y {len(errores) - options['max_errores']} errores más")
+        velocidad = importadas / duracion if duracion else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Tickets importados: {importadas} en {duracion:.1f} s ({velocidad:.0f} filas/s), "
+            f"filas con errores: {len(errores)}"
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tickets.busqueda import busqueda_disponible, crear_indice, optimizar_indice
+
+
+class Command(BaseCommand):
+    help = (
+        "Vuelve a crear los triggers y reindexa el índice FTS5 de búsqueda de tickets "
+        "(por ejemplo, después de una migración que reconstruya la tabla tickets_ticket)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--optimizar', action='store_true', help="Fusiona los segmentos del índice al terminar")
+
+    def handle(self, *args, **options):
+        if not busqueda_disponible():
+            raise CommandError("La búsqueda de texto requiere SQLite con FTS5")
+        crear_indice()
+        if options['optimizar']:
+            optimizar_indice()
+        self.stdout.write(self.style.SUCCESS("Índice de búsqueda reconstruido"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.tickets.contadores import reconstruir
+
+
+class Command(BaseCommand):
+    help = "Recalcula desde cero los contadores del dashboard (tabla Contador)"
+
+    def handle(self, *args, **options):
+        conteos = reconstruir()
+        self.stdout.write(self.style.SUCCESS(
+            f"Contadores reconstruidos: {len(conteos)} claves, {conteos['tickets']} tickets"
+        ))
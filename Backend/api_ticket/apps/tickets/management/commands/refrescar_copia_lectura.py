@@ -0,0 +1,35 @@
+import os
+import sqlite3
+from contextlib import closing
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia la base principal al archivo del alias de lectura (BASE_LECTURA) con la API de "
+        "respaldo de SQLite. Pensado para ejecutarse periódicamente (cron): los reportes leen "
+        "esa copia y nunca esperan a los escritores"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--destino', default=os.environ.get('BASE_LECTURA'),
+                            help="Archivo de la copia (por defecto, la variable BASE_LECTURA)")
+
+    def handle(self, *args, **options):
+        destino = options['destino']
+        if not destino:
+            raise CommandError("Indique --destino o defina la variable BASE_LECTURA")
+        if connection.vendor != 'sqlite':
+            raise CommandError("La copia de lectura solo aplica a SQLite")
+
+        # Se escribe aparte y se reemplaza de una vez: quien lee ve la copia anterior o la nueva
+        temporal = f'{destino}.tmp'
+        connection.ensure_connection()
+        with closing(sqlite3.connect(temporal)) as copia:
+            connection.connection.backup(copia)
+            # La copia se abre con mode=ro: en modo WAL necesitaría escribir su archivo -shm
+            copia.execute('PRAGMA journal_mode=DELETE')
+        os.replace(temporal, destino)
+        self.stdout.write(self.style.SUCCESS(f"Copia de lectura actualizada en {destino}"))
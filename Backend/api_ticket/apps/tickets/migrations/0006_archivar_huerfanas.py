@@ -0,0 +1,97 @@
+from django.db import migrations, models
+from django.db.migrations.exceptions import IrreversibleError
+from django.db.models import Exists, OuterRef
+
+
+def archivar_huerfanas(apps, schema_editor):
+    """
+    Fechas y detalles de tickets ya borrados (SQLite no siempre aplicó las FK). Cada migración
+    en SQLite termina con un chequeo de claves foráneas que los rechaza, así que pasan a
+    FechaTicketDescartada y DetalleUsuarioTicketDescartado.
+    """
+    Ticket = apps.get_model('tickets', 'Ticket')
+    FechaTicket = apps.get_model('tickets', 'FechaTicket')
+    DetalleUsuarioTicket = apps.get_model('tickets', 'DetalleUsuarioTicket')
+    FechaTicketDescartada = apps.get_model('tickets', 'FechaTicketDescartada')
+    DetalleUsuarioTicketDescartado = apps.get_model('tickets', 'DetalleUsuarioTicketDescartado')
+    huerfanas = ~Exists(Ticket.objects.filter(pk=OuterRef('ticket_id')))
+
+    fechas = list(FechaTicket.objects.filter(huerfanas))
+    FechaTicketDescartada.objects.bulk_create(
+        FechaTicketDescartada(id_original=f.pk, ticket_id=f.ticket_id, tipo_fecha=f.tipo_fecha, fecha=f.fecha)
+        for f in fechas
+    )
+    FechaTicket.objects.filter(pk__in=[f.pk for f in fechas]).delete()
+
+    detalles = list(DetalleUsuarioTicket.objects.filter(huerfanas))
+    DetalleUsuarioTicketDescartado.objects.bulk_create(
+        DetalleUsuarioTicketDescartado(id_original=d.pk, ticket_id=d.ticket_id, usuario_id=d.usuario_id,
+                                       relacion_ticket=d.relacion_ticket)
+        for d in detalles
+    )
+    DetalleUsuarioTicket.objects.filter(pk__in=[d.pk for d in detalles]).delete()
+
+
+def restaurar_huerfanas(apps, schema_editor):
+    """Solo si sus tickets volvieron a existir: sin ellos la base quedaría con FK inválidas"""
+    Ticket = apps.get_model('tickets', 'Ticket')
+    FechaTicket = apps.get_model('tickets', 'FechaTicket')
+    DetalleUsuarioTicket = apps.get_model('tickets', 'DetalleUsuarioTicket')
+    FechaTicketDescartada = apps.get_model('tickets', 'FechaTicketDescartada')
+    DetalleUsuarioTicketDescartado = apps.get_model('tickets', 'DetalleUsuarioTicketDescartado')
+    fechas = FechaTicketDescartada.objects.filter(id_conservada__isnull=True)
+    detalles = DetalleUsuarioTicketDescartado.objects.all()
+
+    faltantes = sorted(
+        {*fechas.values_list('ticket_id', flat=True), *detalles.values_list('ticket_id', flat=True)}
+        - set(Ticket.objects.values_list('pk', flat=True))
+    )
+    if faltantes:
+        raise IrreversibleError(
+            f"No se pueden restaurar las filas archivadas de los tickets {faltantes}: ya no existen")
+
+    # fecha es auto_now_add: sin esto bulk_create la reemplazaría por la hora actual
+    FechaTicket._meta.get_field('fecha').auto_now_add = False
+    FechaTicket.objects.bulk_create(
+        FechaTicket(pk=f.id_original, ticket_id=f.ticket_id, tipo_fecha=f.tipo_fecha, fecha=f.fecha)
+        for f in fechas
+    )
+    DetalleUsuarioTicket.objects.bulk_create(
+        DetalleUsuarioTicket(pk=d.id_original, ticket_id=d.ticket_id, usuario_id=d.usuario_id,
+                             relacion_ticket=d.relacion_ticket)
+        for d in detalles
+    )
+    fechas.delete()
+    detalles.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0005_remove_ticket_user_ticket_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FechaTicketDescartada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('id_original', models.IntegerField()),
+                ('ticket_id', models.IntegerField()),
+                ('tipo_fecha', models.CharField(max_length=20)),
+                ('fecha', models.DateTimeField()),
+                ('id_conservada', models.IntegerField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DetalleUsuarioTicketDescartado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('id_original', models.IntegerField()),
+                ('ticket_id', models.IntegerField()),
+                ('usuario_id', models.IntegerField()),
+                ('relacion_ticket', models.CharField(max_length=20)),
+            ],
+        ),
+        migrations.RunPython(archivar_huerfanas, restaurar_huerfanas),
+    ]
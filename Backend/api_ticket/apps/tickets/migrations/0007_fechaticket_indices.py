@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0006_archivar_huerfanas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fechaticket',
+            index=models.Index(fields=['ticket', 'tipo_fecha', 'fecha'], name='fechaticket_ticket_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fechaticket',
+            index=models.Index(fields=['tipo_fecha', 'fecha', 'ticket'], name='fechaticket_tipo_fecha_idx'),
+        ),
+    ]
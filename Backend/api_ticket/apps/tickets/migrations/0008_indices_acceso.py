@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-18 12:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0007_fechaticket_indices'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='detalleusuarioticket',
+            index=models.Index(fields=['usuario', 'relacion_ticket'], name='detalle_usuario_relacion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='estado',
+            index=models.Index(fields=['nom_estado'], name='estado_nom_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['user', 'estado'], name='ticket_user_estado_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def archivar_duplicadas(apps, schema_editor):
+    """
+    Deja una fecha por ticket y tipo, la que ya mostraban los listados (con_fechas): la
+    primera registrada de creación y la más reciente de cierre. Las demás pasan a
+    FechaTicketDescartada.
+    """
+    FechaTicket = apps.get_model('tickets', 'FechaTicket')
+    FechaTicketDescartada = apps.get_model('tickets', 'FechaTicketDescartada')
+    duplicadas = (FechaTicket.objects.values('ticket', 'tipo_fecha')
+                  .annotate(total=Count('id')).filter(total__gt=1).order_by())
+    for grupo in duplicadas:
+        orden = ('pk',) if grupo['tipo_fecha'] == 'Creacion' else ('-fecha', '-pk')
+        fechas = list(FechaTicket.objects.filter(ticket=grupo['ticket'], tipo_fecha=grupo['tipo_fecha'])
+                      .order_by(*orden))
+        conservada, descartadas = fechas[0], fechas[1:]
+        FechaTicketDescartada.objects.bulk_create(
+            FechaTicketDescartada(id_original=f.pk, ticket_id=f.ticket_id, tipo_fecha=f.tipo_fecha,
+                                  fecha=f.fecha, id_conservada=conservada.pk)
+            for f in descartadas
+        )
+        FechaTicket.objects.filter(pk__in=[f.pk for f in descartadas]).delete()
+
+
+def restaurar_duplicadas(apps, schema_editor):
+    FechaTicket = apps.get_model('tickets', 'FechaTicket')
+    FechaTicketDescartada = apps.get_model('tickets', 'FechaTicketDescartada')
+    # Las que tienen id_conservada; las huérfanas son de 0006_archivar_huerfanas
+    descartadas = FechaTicketDescartada.objects.filter(id_conservada__isnull=False)
+    # fecha es auto_now_add: sin esto bulk_create la reemplazaría por la hora actual
+    FechaTicket._meta.get_field('fecha').auto_now_add = False
+    FechaTicket.objects.bulk_create(
+        FechaTicket(pk=f.id_original, ticket_id=f.ticket_id, tipo_fecha=f.tipo_fecha, fecha=f.fecha)
+        for f in descartadas
+    )
+    descartadas.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0010_ticket_version_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(archivar_duplicadas, restaurar_duplicadas),
+        migrations.AddConstraint(
+            model_name='fechaticket',
+            constraint=models.UniqueConstraint(fields=('ticket', 'tipo_fecha'), name='fechaticket_ticket_tipo_unico'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from apps.tickets.busqueda import crear_indice, eliminar_indice
+
+
+def crear(apps, schema_editor):
+    # Solo en SQLite; en otros motores la migración no hace nada
+    crear_indice(schema_editor.connection)
+
+
+def eliminar(apps, schema_editor):
+    eliminar_indice(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0011_fechaticket_ticket_tipo_unico'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear, eliminar),
+    ]
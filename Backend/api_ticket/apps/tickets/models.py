@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
 
 from apps.autenticacion.models import Usuario  # Importa el modelo de usuario personalizado
 
@@ -20,6 +22,12 @@ class Estado(models.Model):
     def __str__(self):
         return self.nom_estado
 
+    class Meta:
+        indexes = [
+            # Los listados y el dashboard filtran por estado__nom_estado
+            models.Index(fields=['nom_estado'], name='estado_nom_estado_idx'),
+        ]
+
 '''class Equipo(models.Model):
     nom_equipo = models.CharField(max_length=255)
     tipo_equipo = models.CharField(max_length=20)
@@ -36,6 +44,26 @@ class Servicio(models.Model):
     def __str__(self):
         return self.titulo_servicio
     
+class TicketQuerySet(models.QuerySet):
+    def con_fechas(self, creacion=True, cierre=True, usuario=True):
+        """Anota las fechas de creación y cierre y une el usuario, todo en una sola consulta"""
+        fechas = FechaTicket.objects.filter(ticket=OuterRef('pk'))
+        anotaciones = {}
+        if creacion:
+            anotaciones['fecha_creacion'] = Subquery(
+                fechas.filter(tipo_fecha='Creacion').order_by('pk').values('fecha')[:1])
+        if cierre:
+            anotaciones['fecha_cierre'] = Subquery(
+                fechas.filter(tipo_fecha='Cierre').order_by('-fecha').values('fecha')[:1])
+        # Las FK de catálogo se serializan desde las columnas *_id, solo el usuario necesita el join
+        queryset = self.select_related('user') if usuario else self
+        return queryset.annotate(**anotaciones)
+
+    def marcar_modificados(self, **cambios):
+        """Invalida el ETag de los tickets cuando se escribe sin pasar por Ticket.save()"""
+        return self.update(version=F('version') + 1, fecha_actualizacion=timezone.now(), **cambios)
+
+
 class Ticket(models.Model):
     titulo = models.CharField(max_length=255)
     comentario = models.TextField(null=True, blank=True)
@@ -44,10 +72,33 @@ class Ticket(models.Model):
     servicio = models.ForeignKey('Servicio', on_delete=models.CASCADE)
     estado = models.ForeignKey('Estado', on_delete=models.CASCADE)
     user = models.ForeignKey(Usuario, on_delete=models.SET_NULL, null=True, blank=True)
+    # Validadores para GET condicional (ETag / Last-Modified)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    objects = TicketQuerySet.as_manager()
 
     def __str__(self):
         return self.titulo
 
+    def save(self, *args, **kwargs):
+        incrementa = not self._state.adding
+        if incrementa:
+            # En la base, como marcar_modificados: dos saves concurrentes no repiten la versión
+            self.version = F('version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version', 'fecha_actualizacion'}
+        super().save(*args, **kwargs)
+        if incrementa:
+            del self.version  # queda diferido: se lee de la base solo si se usa
+
+    class Meta:
+        indexes = [
+            # Listado por usuario (no admin) y sus tickets en un estado
+            models.Index(fields=['user', 'estado'], name='ticket_user_estado_idx'),
+        ]
+
 '''class DetalleServicio(models.Model):
     ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE)
     servicio = models.ForeignKey(Servicio, on_delete=models.CASCADE)
@@ -67,6 +118,32 @@ class FechaTicket(models.Model):
         return f"Fecha {self.fecha} ({self.tipo_fecha}) para Ticket {self.ticket}"
     class Meta:
         unique_together = ('fecha', 'ticket')
+        constraints = [
+            # Una fecha de cada tipo por ticket: permite el upsert masivo de fechas de cierre
+            models.UniqueConstraint(fields=['ticket', 'tipo_fecha'], name='fechaticket_ticket_tipo_unico'),
+        ]
+        indexes = [
+            # Subconsultas de fecha por ticket (con_fechas)
+            models.Index(fields=['ticket', 'tipo_fecha', 'fecha'], name='fechaticket_ticket_tipo_idx'),
+            # Rangos de fecha de creación o cierre (filtros creado/cerrado del listado)
+            models.Index(fields=['tipo_fecha', 'fecha', 'ticket'], name='fechaticket_tipo_fecha_idx'),
+        ]
+
+class FechaTicketDescartada(models.Model):
+    """
+    Fechas que las migraciones quitaron de FechaTicket: las de tickets ya borrados (0006) y
+    las repetidas por ticket y tipo (0011). Se guardan tal cual para revisarlas; revertir la
+    migración las restaura.
+    """
+    id_original = models.IntegerField()
+    ticket_id = models.IntegerField()
+    tipo_fecha = models.CharField(max_length=20)
+    fecha = models.DateTimeField()
+    # La fecha que quedó en FechaTicket para ese ticket y tipo; None si el ticket no existía
+    id_conservada = models.IntegerField(null=True)
+
+    def __str__(self):
+        return f"Fecha {self.fecha} ({self.tipo_fecha}) descartada del Ticket {self.ticket_id}"
 
 class DetalleUsuarioTicket(models.Model):
     ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE)
@@ -82,3 +159,27 @@ class DetalleUsuarioTicket(models.Model):
 
     class Meta:
         unique_together = ('ticket', 'usuario', 'relacion_ticket')
+        indexes = [
+            # Tickets de un usuario según su relación (creador, asignado, resuelto)
+            models.Index(fields=['usuario', 'relacion_ticket'], name='detalle_usuario_relacion_idx'),
+        ]
+
+
+class DetalleUsuarioTicketDescartado(models.Model):
+    """DetalleUsuarioTicket de tickets ya borrados que la migración 0006 quitó (ver FechaTicketDescartada)"""
+    id_original = models.IntegerField()
+    ticket_id = models.IntegerField()
+    usuario_id = models.IntegerField()
+    relacion_ticket = models.CharField(max_length=20)
+
+    def __str__(self):
+        return f"Usuario {self.usuario_id} - {self.relacion_ticket} descartado del Ticket {self.ticket_id}"
+
+
+class Contador(models.Model):
+    """Contadores desnormalizados (dashboard), mantenidos por señales y reconstruibles"""
+    clave = models.CharField(max_length=100, unique=True)
+    valor = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.clave} = {self.valor}"
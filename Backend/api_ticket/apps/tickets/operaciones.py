@@ -0,0 +1,109 @@
+"""
+Escrituras masivas de tickets. Trabajan por conjuntos (bulk_create / update) y por eso no
+pasan por Ticket.save() ni por las señales: mantienen ellas mismas los contadores del
+dashboard, la versión de los tickets y los eventos del feed. Deben llamarse dentro de una
+transacción.
+"""
+from collections import Counter
+
+from django.utils import timezone
+
+from api.metricas import contar_al_confirmar
+from apps.autenticacion.models import Usuario
+from .contadores import claves_ticket, contadores_activos, incrementar
+from .eventos import evento_cambio, publicar_al_confirmar, publicar_creados
+from .models import FechaTicket, Ticket
+
+
+def departamentos_de(user_ids):
+    user_ids = {pk for pk in user_ids if pk is not None}
+    if not user_ids:
+        return {}
+    return dict(Usuario.objects.filter(pk__in=user_ids).values_list('pk', 'cargo__departamento'))
+
+
+def claves_contador(ticket, departamentos):
+    return claves_ticket({
+        'estado': ticket.estado_id,
+        'categoria': ticket.categoria_id,
+        'prioridad': ticket.prioridad_id,
+        'departamento': departamentos.get(ticket.user_id),
+    })
+
+
+def crear_tickets(tickets):
+    """Inserta los tickets y sus fechas de creación con dos bulk_create"""
+    # SQLite >= 3.35 devuelve los ids generados, necesarios para las fechas
+    Ticket.objects.bulk_create(tickets)
+    FechaTicket.objects.bulk_create(FechaTicket(ticket=ticket, tipo_fecha='Creacion') for ticket in tickets)
+    if contadores_activos():
+        departamentos = departamentos_de(t.user_id for t in tickets)
+        deltas = Counter()
+        for ticket in tickets:
+            deltas.update(claves_contador(ticket, departamentos))
+        incrementar(deltas)
+    contar_al_confirmar('api_tickets_creados_total', len(tickets))
+    publicar_creados(tickets)
+    return tickets
+
+
+def transicionar_tickets(queryset, ids, estado=None, usuario=None):
+    """
+    Cambia el estado y/o el usuario de los tickets indicados con un solo UPDATE y, si el
+    estado es "Cerrado", escribe todas las fechas de cierre con un upsert.
+    Devuelve (ids actualizados, [{id, motivo}] omitidos).
+    """
+    ids = list(dict.fromkeys(ids))
+    actuales = {
+        fila['id']: fila for fila in queryset.filter(pk__in=ids).values(
+            'id', 'estado', 'categoria', 'prioridad', 'user', 'user__cargo__departamento',
+        ).order_by()
+    }
+    cambios = {}
+    if estado is not None:
+        cambios['estado'] = estado
+    if usuario is not None:
+        cambios['user'] = usuario
+
+    actualizar, omitidos = [], []
+    for pk in ids:
+        fila = actuales.get(pk)
+        if fila is None:
+            omitidos.append({'id': pk, 'motivo': 'No existe'})
+        elif all(fila[campo] == valor.pk for campo, valor in cambios.items()):
+            omitidos.append({'id': pk, 'motivo': 'Sin cambios'})
+        else:
+            actualizar.append(pk)
+    if not actualizar:
+        return actualizar, omitidos
+
+    Ticket.objects.filter(pk__in=actualizar).marcar_modificados(**cambios)
+    cierre = estado is not None and estado.nom_estado == 'Cerrado'
+    publicar_al_confirmar(
+        evento_cambio(pk, cambios, actuales[pk]['user'], usuario.pk if usuario is not None else actuales[pk]['user'],
+                      cierre and actuales[pk]['estado'] != estado.pk)
+        for pk in actualizar
+    )
+    if cierre:
+        ahora = timezone.now()
+        FechaTicket.objects.bulk_create(
+            [FechaTicket(ticket_id=pk, tipo_fecha='Cierre', fecha=ahora) for pk in actualizar],
+            update_conflicts=True, unique_fields=['ticket', 'tipo_fecha'], update_fields=['fecha'],
+        )
+        contar_al_confirmar('api_tickets_cerrados_total',
+                            sum(1 for pk in actualizar if actuales[pk]['estado'] != estado.pk))
+
+    if contadores_activos():
+        departamento_nuevo = departamentos_de([usuario.pk]).get(usuario.pk) if usuario is not None else None
+        deltas = Counter()
+        for pk in actualizar:
+            fila = actuales[pk]
+            anteriores = {'estado': fila['estado'], 'categoria': fila['categoria'],
+                          'prioridad': fila['prioridad'], 'departamento': fila['user__cargo__departamento']}
+            nuevas = dict(anteriores, estado=estado.pk if estado is not None else fila['estado'])
+            if usuario is not None:
+                nuevas['departamento'] = departamento_nuevo
+            deltas.update(claves_ticket(nuevas))
+            deltas.subtract(claves_ticket(anteriores))
+        incrementar(deltas)
+    return actualizar, omitidos
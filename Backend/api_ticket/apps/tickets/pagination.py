@@ -0,0 +1,210 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as Base64Error
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _valor_cursor(valor):
+    # isoformat completo: DjangoJSONEncoder trunca los microsegundos y rompería la igualdad
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    raise TypeError(f'Valor no serializable en el cursor: {valor!r}')
+
+
+def _entero_cursor(valor):
+    if not isinstance(valor, int) or isinstance(valor, bool):
+        raise TypeError(f'Entero inválido en el cursor: {valor!r}')
+    return valor
+
+
+def _numero_cursor(valor):
+    if not isinstance(valor, (int, float)) or isinstance(valor, bool):
+        raise TypeError(f'Número inválido en el cursor: {valor!r}')
+    return valor
+
+
+def configuracion_paginacion():
+    config = {'PAGE_SIZE': 50, 'MAX_PAGE_SIZE': 500, 'POR_DEFECTO': False}
+    config.update(getattr(settings, 'PAGINACION_CURSOR', {}))
+    return config
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sin COUNT(*).
+
+    Cada página filtra por la tupla de orden de la última fila entregada, por lo que
+    una página profunda cuesta lo mismo que la primera. Es opcional: solo se activa con
+    ?cursor= o ?page_size= (o ?paginar=1); ?paginar=0 devuelve siempre la lista completa.
+    """
+    ordering = ('id',)
+    # Un conversor por campo de `ordering`: valida el valor del cursor (ValueError/TypeError)
+    conversores = (_entero_cursor,)
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    flag_query_param = 'paginar'
+    invalid_cursor_message = 'Cursor inválido'
+
+    def preparar_queryset(self, queryset):
+        """Punto de extensión para anotar las columnas usadas en el orden"""
+        return queryset
+
+    def paginacion_activa(self, request):
+        flag = request.query_params.get(self.flag_query_param)
+        if flag is not None:
+            return flag.lower() in ('1', 'true', 'si')
+        params = request.query_params
+        if self.cursor_query_param in params or self.page_size_query_param in params:
+            return True
+        return configuracion_paginacion()['POR_DEFECTO']
+
+    def get_page_size(self, request):
+        config = configuracion_paginacion()
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return config['PAGE_SIZE']
+        if page_size <= 0:
+            return config['PAGE_SIZE']
+        return min(page_size, config['MAX_PAGE_SIZE'])
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.paginacion_activa(request):
+            return None
+        return self._guardar_pagina(list(self._queryset_pagina(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() con el ORM async (vistas_async.py)"""
+        if not self.paginacion_activa(request):
+            return None
+        return self._guardar_pagina([fila async for fila in self._queryset_pagina(queryset, request)])
+
+    def _queryset_pagina(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = self.preparar_queryset(queryset).order_by(*self.ordering)
+
+        posicion = self.decode_cursor(request)
+        if posicion is not None:
+            queryset = queryset.filter(self.filtro_posicion(posicion))
+
+        # Se pide una fila extra para saber si existe una página siguiente
+        return queryset[:self.page_size + 1]
+
+    def _guardar_pagina(self, resultados):
+        self.has_next = len(resultados) > self.page_size
+        self.page = resultados[:self.page_size]
+        return self.page
+
+    def filtro_posicion(self, posicion):
+        """
+        Construye a >= x AND ((a > x) OR (a = x AND b > y) ...) para la tupla de orden.
+        El primer término redundante permite a SQLite iniciar el recorrido del índice
+        en la posición del cursor en vez de filtrar desde el principio.
+        """
+        filtro = Q()
+        iguales = {}
+        for campo, valor in zip(self.ordering, posicion):
+            nombre = campo.lstrip('-')
+            lookup = 'lt' if campo.startswith('-') else 'gt'
+            filtro |= Q(**iguales, **{f'{nombre}__{lookup}': valor})
+            iguales[nombre] = valor
+        primero = self.ordering[0]
+        inicio = 'lte' if primero.startswith('-') else 'gte'
+        return Q(**{f'{primero.lstrip("-")}__{inicio}': posicion[0]}) & filtro
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            posicion = json.loads(b64decode(encoded.encode('ascii'), altchars=b'-_', validate=True))
+        except (TypeError, ValueError, UnicodeError, Base64Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(posicion, list) or len(posicion) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [convertir(valor) for convertir, valor in zip(self.conversores, posicion)]
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instancia):
+        # Instancias del modelo o filas values()
+        if isinstance(instancia, dict):
+            posicion = [instancia[campo.lstrip('-')] for campo in self.ordering]
+        else:
+            posicion = [getattr(instancia, campo.lstrip('-')) for campo in self.ordering]
+        data = json.dumps(posicion, default=_valor_cursor).encode('utf-8')
+        return b64encode(data, altchars=b'-_').decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_first_link(self):
+        url = self.request.build_absolute_uri()
+        return remove_query_param(url, self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'first': self.get_first_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'first': {'type': 'string', 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class TicketCursorPagination(KeysetPagination):
+    """
+    Ordena por id, que sigue el orden de creación de los tickets (la fecha de creación se
+    registra al insertar; los importados quedan en el orden de su carga). La fecha vive
+    en FechaTicket: ordenar por ella exigiría un join sin índice utilizable, con recorrido
+    de la tabla y ordenamiento en cada página. El id se resuelve con la clave primaria.
+    """
+    ordering = ('id',)
+
+
+class UsuarioCursorPagination(KeysetPagination):
+    ordering = ('rut_usuario',)
+
+
+class BusquedaCursorPagination(KeysetPagination):
+    """
+    Páginas de una BusquedaTickets por (rango bm25, id). Siempre activa: una búsqueda
+    amplia no debe devolver la tabla completa.
+    """
+    ordering = ('rango', 'id')
+    conversores = (_numero_cursor, _entero_cursor)
+
+    def paginacion_activa(self, request):
+        return True
+
+    def paginate_queryset(self, busqueda, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        filas = busqueda.pagina(self.decode_cursor(request), self.page_size + 1)
+        self.has_next = len(filas) > self.page_size
+        self.page = filas[:self.page_size]
+        return self.page
+
+    def encode_cursor(self, fila):
+        id_, rango = fila
+        return b64encode(json.dumps([rango, id_]).encode('utf-8'), altchars=b'-_').decode('ascii')
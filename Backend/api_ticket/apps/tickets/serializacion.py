@@ -0,0 +1,130 @@
+"""
+Serialización de solo lectura para los listados de tickets.
+
+Produce exactamente lo mismo que TicketSerializer, pero desde filas values() y con un
+conversor precompilado por campo, sin instanciar modelos ni campos de DRF por fila. Las
+fechas se pasan a hora local con un desfase memoizado por día UTC: solo los días con
+cambio de horario calculan la zona horaria fila por fila.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from api.middleware import medir_serializacion
+from .serializers import TicketSerializer
+
+COLUMNAS = {
+    'categoria': 'categoria',
+    'prioridad': 'prioridad',
+    'servicio': 'servicio',
+    'estado': 'estado',
+    'user': 'user__nom_usuario',
+}
+UN_DIA = timedelta(days=1)
+
+
+class HoraLocal:
+    """UTC -> hora local de `zona`, con el desfase memoizado por día UTC"""
+
+    def __init__(self, zona):
+        self.zona = zona
+        self.desfases = {}
+        self.sufijos = {}
+
+    def _desfase(self, dia):
+        """Desfase válido para todo el día UTC `dia`, o None si el día tiene un cambio de horario"""
+        try:
+            return self.desfases[dia]
+        except KeyError:
+            inicio = datetime.fromordinal(dia).replace(tzinfo=dt_timezone.utc)
+            desfase = inicio.astimezone(self.zona).utcoffset()
+            if (inicio + UN_DIA).astimezone(self.zona).utcoffset() != desfase:
+                desfase = None
+            self.desfases[dia] = desfase
+            return desfase
+
+    def convertir(self, valor):
+        """(datetime local sin tzinfo, desfase)"""
+        utc = valor.replace(tzinfo=None) if valor.utcoffset() == timedelta(0) else \
+            valor.astimezone(dt_timezone.utc).replace(tzinfo=None)
+        desfase = self._desfase(utc.toordinal())
+        if desfase is None:
+            desfase = valor.astimezone(self.zona).utcoffset()
+        return utc + desfase, desfase
+
+    def sufijo(self, desfase):
+        """'+HH:MM' como lo escribe datetime.isoformat(), 'Z' para UTC (como DRF)"""
+        try:
+            return self.sufijos[desfase]
+        except KeyError:
+            sufijo = datetime(2000, 1, 1, tzinfo=dt_timezone(desfase)).isoformat()[19:]
+            self.sufijos[desfase] = 'Z' if sufijo == '+00:00' else sufijo
+            return self.sufijos[desfase]
+
+    def texto(self, valor):
+        """localtime(valor).strftime('%Y-%m-%d %H:%M:%S') (TicketSerializer.get_fecha_creacion)"""
+        if valor is None:
+            return None
+        local, _ = self.convertir(valor)
+        if local.year < 1000:
+            return local.strftime('%Y-%m-%d %H:%M:%S')
+        return local.isoformat(' ', 'seconds')
+
+    def iso(self, valor):
+        """serializers.DateTimeField().to_representation(valor) con formato ISO 8601"""
+        if not valor:
+            return None
+        local, desfase = self.convertir(valor)
+        return local.isoformat() + self.sufijo(desfase)
+
+
+class SerializadorFilas:
+    """Campos de TicketSerializer (o los de ?fields=) desde filas values()"""
+
+    def __init__(self, campos=None, zona=None):
+        self.campos = campos or TicketSerializer.Meta.fields
+        hora = HoraLocal(zona or timezone.get_current_timezone())
+        conversores = {'fecha_creacion': hora.texto, 'fecha_cierre': hora.iso}
+        self.plan = [(campo, COLUMNAS.get(campo, campo), conversores.get(campo)) for campo in self.campos]
+
+    def preparar(self, queryset, *extra):
+        """values() con las columnas del plan (y `extra`); el queryset debe traer las anotaciones de fecha pedidas"""
+        return queryset.values(*({columna for _, columna, _ in self.plan} | set(extra)))
+
+    def serializar(self, filas):
+        plan = self.plan
+        with medir_serializacion():
+            return [
+                {campo: conversor(fila[columna]) if conversor else fila[columna] for campo, columna, conversor in plan}
+                for fila in filas
+            ]
+
+
+def serializacion_rapida_activa(request):
+    # ?expand= y los formatos de fecha distintos de ISO 8601 pasan por TicketSerializer
+    if not getattr(settings, 'SERIALIZACION_RAPIDA', True):
+        return False
+    if api_settings.DATETIME_FORMAT.lower() != 'iso-8601':
+        return False
+    _, expandir = TicketSerializer.campos_solicitados(request)
+    return not expandir
+
+
+class ListadoRapidoMixin:
+    """list() de los listados de tickets con SerializadorFilas en vez de TicketSerializer"""
+    # Columnas que las filas traen además de las de los campos (ConditionalListMixin)
+    columnas_extra = ()
+
+    def list(self, request, *args, **kwargs):
+        if not serializacion_rapida_activa(request):
+            return super().list(request, *args, **kwargs)
+        campos, _ = TicketSerializer.campos_solicitados(request)
+        serializador = SerializadorFilas(campos)
+        queryset = serializador.preparar(self.filter_queryset(self.get_queryset()), *self.columnas_extra)
+        pagina = self.paginate_queryset(queryset)
+        if pagina is not None:
+            return self.get_paginated_response(serializador.serializar(pagina))
+        return Response(serializador.serializar(queryset))
@@ -1,7 +1,10 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from .models import *
 from apps.autenticacion.models import Cargo, Departamento
 from django.utils.timezone import localtime
+from .catalogos import cache_catalogo
+from api.middleware import medir_serializacion
 
 
 class DepartamentoSerializer(serializers.ModelSerializer):
@@ -33,7 +36,76 @@ class ServicioSerializer(serializers.ModelSerializer):
         model = Servicio
         fields = ['id','titulo_servicio','costo', 'categoria_id']
 
-class TicketSerializer(serializers.ModelSerializer):
+class CatalogoRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField que resuelve el id desde la cache de catálogos del proceso"""
+
+    def to_internal_value(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            instancia = cache_catalogo(self.get_queryset().model).por_id(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if instancia is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instancia
+
+
+def lista_parametro(request, nombre):
+    valor = request.query_params.get(nombre, '') if request is not None else ''
+    return [v.strip() for v in valor.split(',') if v.strip()]
+
+
+class CamposDinamicosMixin:
+    """
+    En lecturas, ?fields=a,b limita los campos que se calculan y ?expand=x reemplaza el id de
+    una FK por el objeto anidado (Meta: `expandibles` = {campo: serializer}). Los nombres
+    desconocidos responden 400.
+    """
+    expandibles = {}
+
+    @classmethod
+    def campos_solicitados(cls, request):
+        """(campos o None si no se limitan, campos a expandir)"""
+        if request is None or request.method not in SAFE_METHODS:
+            return None, []
+        campos = lista_parametro(request, 'fields') or None
+        expandir = lista_parametro(request, 'expand')
+        errores = {}
+        if campos is not None:
+            desconocidos = [c for c in campos if c not in cls.Meta.fields]
+            if desconocidos:
+                errores['fields'] = f"Campos desconocidos: {', '.join(desconocidos)}"
+        no_expandibles = [c for c in expandir if c not in cls.expandibles]
+        if no_expandibles:
+            errores['expand'] = f"No se pueden expandir: {', '.join(no_expandibles)}"
+        if errores:
+            raise serializers.ValidationError(errores)
+        if campos is not None:
+            expandir = [c for c in expandir if c in campos]
+        return campos, expandir
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        campos, expandir = self.campos_solicitados(self.context.get('request'))
+        if campos is not None:
+            for nombre in set(self.fields) - set(campos):
+                self.fields.pop(nombre)
+        for nombre in expandir:
+            self.fields[nombre] = self.expandibles[nombre](read_only=True)
+
+
+class TicketListSerializer(serializers.ListSerializer):
+    """Listados de TicketSerializer (many=True), medidos como serialización en Server-Timing"""
+
+    def to_representation(self, data):
+        with medir_serializacion():
+            return super().to_representation(data)
+
+
+class TicketSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     fecha_creacion = serializers.SerializerMethodField()
     fecha_cierre = serializers.DateTimeField(allow_null=True, required=False)
     user = serializers.SlugRelatedField(
@@ -41,7 +113,10 @@ class TicketSerializer(serializers.ModelSerializer):
         queryset=Usuario.objects.all(),
         required=False
     )
-    estado = serializers.PrimaryKeyRelatedField(queryset=Estado.objects.all())  # Ajuste aquí
+    categoria = CatalogoRelatedField(queryset=Categoria.objects.all())
+    prioridad = CatalogoRelatedField(queryset=Prioridad.objects.all())
+    servicio = CatalogoRelatedField(queryset=Servicio.objects.all())
+    estado = CatalogoRelatedField(queryset=Estado.objects.all())
     class Meta:
         model = Ticket
         fields = [
@@ -49,24 +124,67 @@ class TicketSerializer(serializers.ModelSerializer):
             'prioridad', 'servicio', 'estado', 'user',
             'fecha_creacion', 'fecha_cierre'
         ]
+        list_serializer_class = TicketListSerializer
+
+    # Campos que update() copia al ticket
+    campos_editables = ('titulo', 'comentario', 'categoria', 'prioridad', 'servicio', 'estado')
+
+    expandibles = {
+        'categoria': CategoriaSerializer,
+        'prioridad': PrioridadSerializer,
+        'servicio': ServicioSerializer,
+        'estado': EstadoSerializer,
+    }
+
+    @classmethod
+    def preparar_queryset(cls, queryset, request):
+        """
+        con_fechas() reducido a lo que pide la solicitud: solo las columnas (.only()) y
+        anotaciones de los campos pedidos, y un select_related por cada FK expandida.
+        """
+        campos, expandir = cls.campos_solicitados(request)
+        if expandir:
+            # select_related() sin argumentos uniría todas las FK
+            queryset = queryset.select_related(*expandir)
+        if campos is None:
+            return queryset.con_fechas()
+        orden = lista_parametro(request, 'ordering')
+        usados = set(campos) | {nombre.lstrip('-') for nombre in orden}
+        queryset = queryset.con_fechas(
+            creacion='fecha_creacion' in usados, cierre='fecha_cierre' in usados, usuario='user' in campos,
+        )
+        # version y fecha_actualizacion: validadores de los listados (conditional.py)
+        columnas = {'id', 'version', 'fecha_actualizacion'} | {
+            c for c in campos if c not in ('user', 'fecha_creacion', 'fecha_cierre')}
+        if 'user' in campos:
+            columnas |= {'user', 'user__nom_usuario'}
+        return queryset.only(*columnas)
+
+    def to_representation(self, instance):
+        if self.parent is not None:  # dentro de un listado ya medido
+            return super().to_representation(instance)
+        with medir_serializacion():
+            return super().to_representation(instance)
 
     def get_fecha_creacion(self, obj):
-        fecha_creacion = FechaTicket.objects.filter(ticket=obj, tipo_fecha='Creacion').first()
-        if fecha_creacion:
-            return localtime(fecha_creacion.fecha).strftime('%Y-%m-%d %H:%M:%S')  # Formato ajustado
+        # Los listados anotan la fecha con Ticket.objects.con_fechas(), sin consulta por fila
+        if hasattr(obj, 'fecha_creacion'):
+            fecha = obj.fecha_creacion
+        else:
+            fecha_creacion = FechaTicket.objects.filter(ticket=obj, tipo_fecha='Creacion').first()
+            fecha = fecha_creacion.fecha if fecha_creacion else None
+        if fecha:
+            return localtime(fecha).strftime('%Y-%m-%d %H:%M:%S')  # Formato ajustado
         return None
 
     def get_user(self, obj):
         return obj.user.nom_usuario if obj.user else None  # Ajusta 'nom_usuario' al campo correcto en tu modelo de usuario
 
     def update(self, instance, validated_data):
-        # Actualizar el ticket con datos validados
-        instance.titulo = validated_data.get('titulo', instance.titulo)
-        instance.comentario = validated_data.get('comentario', instance.comentario)
-        instance.categoria = validated_data.get('categoria', instance.categoria)
-        instance.prioridad = validated_data.get('prioridad', instance.prioridad)
-        instance.servicio = validated_data.get('servicio', instance.servicio)
-        instance.estado = validated_data.get('estado', instance.estado)
+        # Actualizar el ticket con datos validados (sin leer las FK que no cambian: serían consultas)
+        for campo in self.campos_editables:
+            if campo in validated_data:
+                setattr(instance, campo, validated_data[campo])
         instance.save()
 
         # Manejar la fecha de cierre
@@ -80,6 +198,28 @@ class TicketSerializer(serializers.ModelSerializer):
 
         return instance
     
+class TicketMasivoSerializer(serializers.ModelSerializer):
+    """Un elemento de la creación masiva; el usuario es siempre el autenticado"""
+    categoria = CatalogoRelatedField(queryset=Categoria.objects.all())
+    prioridad = CatalogoRelatedField(queryset=Prioridad.objects.all())
+    servicio = CatalogoRelatedField(queryset=Servicio.objects.all())
+    estado = CatalogoRelatedField(queryset=Estado.objects.all())
+
+    class Meta:
+        model = Ticket
+        fields = ['titulo', 'comentario', 'categoria', 'prioridad', 'servicio', 'estado']
+
+class TransicionMasivaSerializer(serializers.Serializer):
+    """Nuevo estado y/o usuario (por nom_usuario) para una lista de tickets"""
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    estado = CatalogoRelatedField(queryset=Estado.objects.all(), required=False)
+    user = serializers.SlugRelatedField(slug_field='nom_usuario', queryset=Usuario.objects.all(), required=False)
+
+    def validate(self, data):
+        if 'estado' not in data and 'user' not in data:
+            raise serializers.ValidationError('Debe indicar un estado o un usuario.')
+        return data
+
 class DetalleUsuarioTicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = DetalleUsuarioTicket
@@ -0,0 +1,94 @@
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.autenticacion.models import Departamento, Usuario
+from .busqueda import busqueda_disponible, crear_indice, indice_existe
+from .catalogos import MODELOS_CATALOGO, cache_catalogo, incrementar_version_catalogos
+from .contadores import claves_ticket, contadores_activos, dimensiones_ticket, incrementar
+from .models import Ticket
+
+
+@receiver(pre_save, sender=Ticket)
+def recordar_valores_anteriores(sender, instance, raw=False, **kwargs):
+    if raw or not contadores_activos() or instance.pk is None:
+        return
+    instance._contadores_anterior = Ticket.objects.filter(pk=instance.pk).values(
+        'estado', 'categoria', 'prioridad', 'user'
+    ).first()
+
+
+@receiver(post_save, sender=Ticket)
+def actualizar_contadores_ticket(sender, instance, created, raw=False, **kwargs):
+    if raw or not contadores_activos():
+        return
+    anterior = getattr(instance, '_contadores_anterior', None)
+    instance._contadores_anterior = None
+    if created or anterior is None:
+        incrementar(Counter(claves_ticket(dimensiones_ticket(instance))))
+        return
+
+    mismo_usuario = anterior['user'] == instance.user_id
+    if mismo_usuario:
+        # El departamento no cambia y se anula en la diferencia: no hace falta consultarlo
+        nuevas = {'estado': instance.estado_id, 'categoria': instance.categoria_id,
+                  'prioridad': instance.prioridad_id, 'departamento': None}
+        anteriores = dict(anterior, departamento=None)
+    else:
+        nuevas = dimensiones_ticket(instance)
+        anteriores = dimensiones_ticket(Ticket(
+            estado_id=anterior['estado'], categoria_id=anterior['categoria'],
+            prioridad_id=anterior['prioridad'], user_id=anterior['user'],
+        ))
+    deltas = Counter(claves_ticket(nuevas))
+    deltas.subtract(claves_ticket(anteriores))
+    incrementar(deltas)
+
+
+@receiver(post_delete, sender=Ticket)
+def descontar_ticket(sender, instance, **kwargs):
+    if not contadores_activos():
+        return
+    incrementar({c: -1 for c in claves_ticket(dimensiones_ticket(instance))})
+
+
+@receiver(post_save, sender=Usuario)
+def contar_usuario(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and contadores_activos():
+        incrementar({'usuarios': 1})
+
+
+@receiver(post_delete, sender=Usuario)
+def descontar_usuario(sender, instance, **kwargs):
+    if contadores_activos():
+        incrementar({'usuarios': -1})
+
+
+def cambio_en_catalogo(sender, raw=False, **kwargs):
+    cache_catalogo(sender).invalidar()
+    if not raw:
+        incrementar_version_catalogos()
+
+
+for modelo in MODELOS_CATALOGO:
+    post_save.connect(cambio_en_catalogo, sender=modelo, dispatch_uid=f'version_catalogos_save_{modelo.__name__}')
+    post_delete.connect(cambio_en_catalogo, sender=modelo, dispatch_uid=f'version_catalogos_delete_{modelo.__name__}')
+
+
+@receiver(post_save, sender=Departamento)
+@receiver(post_delete, sender=Departamento)
+def cambio_en_departamento(sender, **kwargs):
+    # Fuera de /catalogos/: solo la cache de nombres del dashboard
+    cache_catalogo(Departamento).invalidar()
+
+
+@receiver(post_migrate)
+def asegurar_triggers_busqueda(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # SQLite borra los triggers cuando una migración reconstruye tickets_ticket
+    if sender.label != 'tickets':
+        return
+    conexion = connections[using]
+    if busqueda_disponible(conexion) and indice_existe(conexion):
+        crear_indice(conexion, reconstruir=False)
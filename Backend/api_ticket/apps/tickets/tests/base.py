@@ -0,0 +1,36 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.autenticacion.models import Usuario
+from ..catalogos import invalidar_caches
+from ..models import Categoria, Estado, FechaTicket, Prioridad, Servicio, Ticket
+
+
+class TicketsTestBase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Usuario.objects.create_user(
+            rut_usuario=11111111, dv_rut_usuario='1', correo='admin@test.cl',
+            nom_usuario='admin', password='clave-segura', role='admin',
+        )
+        cls.categoria = Categoria.objects.create(nom_categoria='Hardware')
+        cls.prioridad = Prioridad.objects.create(num_prioridad='1')
+        cls.servicio = Servicio.objects.create(titulo_servicio='Soporte', costo='1000.00', categoria=cls.categoria)
+        cls.abierto = Estado.objects.create(nom_estado='Abierto')
+        cls.cerrado = Estado.objects.create(nom_estado='Cerrado')
+
+    def setUp(self):
+        invalidar_caches()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def crear_tickets(self, cantidad, estado):
+        for i in range(cantidad):
+            ticket = Ticket.objects.create(
+                titulo=f'Ticket {i}', categoria=self.categoria, prioridad=self.prioridad,
+                servicio=self.servicio, estado=estado, user=self.admin,
+            )
+            FechaTicket.objects.create(ticket=ticket, tipo_fecha='Creacion')
+            if estado == self.cerrado:
+                FechaTicket.objects.create(ticket=ticket, tipo_fecha='Cierre')
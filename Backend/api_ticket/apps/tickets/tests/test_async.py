@@ -0,0 +1,114 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from knox.models import AuthToken
+from rest_framework.test import APIClient
+
+from apps.autenticacion.models import Usuario
+from apps.autenticacion.serializers import CustomTokenObtainPairSerializer
+from api import middleware
+from api.metricas import registro
+from .. import vistas_async
+from ..models import Ticket
+from .base import TicketsTestBase
+
+# Las rutas async delante de las del proyecto, como con VISTAS_ASYNC
+urlpatterns = vistas_async.rutas + [path('', include('api.urls'))]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class VistasAsyncTest(TicketsTestBase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # En un servidor el middleware se carga antes de abrir conexiones; aquí la del hilo ya existe
+        middleware.activar_medicion()
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.usuario = Usuario.objects.create_user(
+            rut_usuario=12345678, dv_rut_usuario='5', correo='usuario@test.cl',
+            nom_usuario='usuario', password='clave-segura',
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.crear_tickets(3, self.abierto)
+        self.crear_tickets(2, self.cerrado)
+        Ticket.objects.filter(pk=Ticket.objects.order_by('pk').first().pk).update(user=self.usuario)
+        self.ticket = Ticket.objects.order_by('pk').last()
+
+    def autorizacion(self, usuario):
+        return f'Bearer {CustomTokenObtainPairSerializer.get_token(usuario).access_token}'
+
+    def get_async(self, url, usuario=None, **cabeceras):
+        if usuario is not None:
+            cabeceras.setdefault('Authorization', self.autorizacion(usuario))
+        response = async_to_sync(AsyncClient().get)(url, headers=cabeceras)
+        self.assertTrue(iscoroutinefunction(response.resolver_match.func), url)
+        return response
+
+    def get_sync(self, url, usuario):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=self.autorizacion(usuario))
+        return client.get(url)
+
+    @override_settings(INSTRUMENTACION={'ACTIVA': True, 'CABECERA': True})
+    def test_mismo_json_que_sync(self):
+        urls = [
+            '/tickets/', '/tickets/?page_size=2', f'/tickets/?fields=id,fecha_creacion,user&estado={self.abierto.id}',
+            f'/tickets/{self.ticket.id}/', f'/tickets/{self.ticket.id}/?fields=titulo,user,fecha_creacion',
+            '/tickets/999999/', '/tickets-cerrados/', '/api/dashboard/stats/', '/catalogos/',
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                esperado = self.get_sync(url, self.admin)
+                response = self.get_async(url, self.admin)
+                self.assertEqual(response.status_code, esperado.status_code)
+                self.assertEqual(response.json(), esperado.json())
+                self.assertEqual(response.get('ETag'), esperado.get('ETag'))
+                # Las consultas del ORM async corren en otro hilo y se cuentan igual
+                self.assertNotIn('desc="0 consultas"', response['Server-Timing'])
+
+    def test_visibilidad_y_autenticacion(self):
+        ids = [t['id'] for t in self.get_async('/tickets/', self.usuario).json()]
+        self.assertEqual(ids, list(Ticket.objects.filter(user=self.usuario).values_list('id', flat=True)))
+        self.assertEqual(self.get_async('/tickets/').status_code, 401)
+        self.assertEqual(self.get_async('/tickets-cerrados/', Authorization='Bearer no-es-un-token').status_code, 401)
+        # Knox necesita la base: lo resuelven los autenticadores en sync_to_async
+        _, token = AuthToken.objects.create(self.usuario)
+        self.assertEqual(self.get_async('/tickets/', Authorization=f'Token {token}').json()[0]['id'], ids[0])
+
+    def test_token_con_claims_no_consulta_usuario(self):
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(self.get_async('/tickets/', self.usuario).status_code, 200)
+        self.assertFalse([q for q in consultas if 'FROM "autenticacion_usuario" WHERE' in q['sql']])
+
+    def test_no_modificado(self):
+        for url in ('/tickets/', f'/tickets/{self.ticket.id}/', '/catalogos/'):
+            etag = self.get_async(url, self.admin)['ETag']
+            self.assertEqual(self.get_async(url, self.admin, **{'If-None-Match': etag}).status_code, 304)
+
+    def test_delega_a_la_vista_sync(self):
+        expandido = self.get_async(f'/tickets/{self.ticket.id}/?expand=estado', self.admin).json()
+        self.assertEqual(expandido['estado'], {'id': self.cerrado.id, 'nom_estado': 'Cerrado'})
+        self.assertEqual(self.get_async('/tickets/?fields=no_existe', self.admin).status_code, 400)
+        response = async_to_sync(AsyncClient().post)(
+            '/tickets/', {'titulo': 'Nuevo', 'categoria': self.categoria.id, 'prioridad': self.prioridad.id,
+                          'servicio': self.servicio.id, 'estado': self.abierto.id},
+            content_type='application/json', headers={'Authorization': self.autorizacion(self.admin)},
+        )
+        self.assertEqual(response.status_code, 201)
+
+    @override_settings(METRICAS={'ACTIVA': True})
+    def test_metricas_con_el_nombre_de_la_vista(self):
+        registro.reiniciar()
+        self.get_async('/tickets/', self.admin)
+        clave = ('api_solicitudes_total', (('vista', 'TicketListCreateView'), ('metodo', 'GET'), ('codigo', '200')))
+        self.assertEqual(registro.contadores[clave], 1)
+        consultas = [h for (n, e), h in registro.histogramas.items() if n == 'api_consultas_sql']
+        self.assertGreater(consultas[0][1], 0)
@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+
+from apps.autenticacion.models import Usuario
+from ..busqueda import TABLA, BusquedaTickets, consulta_fts
+from ..models import Ticket
+from .base import TicketsTestBase
+
+
+class BusquedaTest(TicketsTestBase):
+
+    def crear(self, titulo, comentario='', user=None):
+        return Ticket.objects.create(
+            titulo=titulo, comentario=comentario, categoria=self.categoria, prioridad=self.prioridad,
+            servicio=self.servicio, estado=self.abierto, user=user or self.admin,
+        )
+
+    def buscar(self, q, **params):
+        return self.client.get('/tickets/buscar/', {'q': q, **params}).json()
+
+    def test_ranking_titulo_sobre_comentario(self):
+        en_comentario = self.crear('Falla general', 'la impresora no imprime')
+        en_titulo = self.crear('Impresora atascada')
+        self.crear('Sin relación')
+        data = self.buscar('impresora')
+        self.assertEqual([t['id'] for t in data['results']], [en_titulo.id, en_comentario.id])
+
+    def test_prefijos_acentos_y_sintaxis(self):
+        ticket = self.crear('Configuración de correo')
+        self.assertEqual([t['id'] for t in self.buscar('configuracion corr')['results']], [ticket.id])
+        self.assertEqual(self.buscar('"OR NEAR( titulo:')['results'], [])
+        self.assertEqual(consulta_fts('  ¿? '), None)
+        self.assertEqual(self.client.get('/tickets/buscar/?q=').status_code, 400)
+
+    def test_triggers_siguen_los_cambios(self):
+        ticket = self.crear('Teclado roto')
+        ticket.titulo = 'Mouse roto'
+        ticket.save()
+        self.assertEqual(self.buscar('teclado')['results'], [])
+        Ticket.objects.filter(pk=ticket.pk).update(comentario='pantalla')
+        self.assertEqual(len(self.buscar('pantalla')['results']), 1)
+        ticket.delete()
+        self.assertEqual(self.buscar('mouse')['results'], [])
+
+    def test_visibilidad_y_paginacion(self):
+        otro = Usuario.objects.create_user(
+            rut_usuario=22222222, dv_rut_usuario='2', correo='otro@test.cl',
+            nom_usuario='otro', password='clave-segura',
+        )
+        for i in range(5):
+            self.crear(f'Red caída {i}')
+        propio = self.crear('Red lenta', user=otro)
+
+        ids, url = [], '/tickets/buscar/?q=red&page_size=2'
+        while url:
+            data = self.client.get(url).json()
+            ids += [t['id'] for t in data['results']]
+            url = data['next']
+        self.assertEqual(len(ids), 6)
+        self.assertEqual(len(set(ids)), 6)
+
+        self.client.force_authenticate(otro)
+        self.assertEqual([t['id'] for t in self.buscar('red')['results']], [propio.id])
+
+    def test_limite_de_candidatos(self):
+        tickets = [self.crear(f'Red {i}') for i in range(4)]
+        filas = BusquedaTickets('red', max_candidatos=2).pagina(None, 10)
+        self.assertEqual({id_ for id_, _ in filas}, {tickets[2].id, tickets[3].id})
+
+    def test_comando_reconstruir(self):
+        self.crear('Disco lleno')
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABLA}({TABLA}) VALUES ('delete-all')")
+        self.assertEqual(self.buscar('disco')['results'], [])
+        call_command('reconstruir_busqueda', stdout=StringIO())
+        self.assertEqual(len(self.buscar('disco')['results']), 1)
@@ -0,0 +1,55 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Ticket
+from .base import TicketsTestBase
+
+
+class CamposDinamicosTest(TicketsTestBase):
+
+    def consultas(self, url):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), [q['sql'] for q in consultas]
+
+    def test_fields_limita_columnas_y_subconsultas(self):
+        self.crear_tickets(3, self.abierto)
+        data, sql = self.consultas('/tickets/?fields=id,titulo')
+        self.assertEqual(data[0].keys(), {'id', 'titulo'})
+        listado = [q for q in sql if 'tickets_ticket' in q and 'SUM(' not in q]
+        self.assertEqual(len(listado), 1)
+        self.assertNotIn('tickets_fechaticket', listado[0])
+        self.assertNotIn('comentario', listado[0])
+
+        data, _ = self.consultas('/tickets/?fields=id,fecha_cierre,user')
+        self.assertEqual(data[0], {'id': data[0]['id'], 'user': 'admin', 'fecha_cierre': None})
+
+    def test_expand_sin_consultas_por_fila(self):
+        self.crear_tickets(2, self.cerrado)
+        self.client.get('/tickets-cerrados/')  # calienta la cache de catálogos
+        data, sql = self.consultas('/tickets-cerrados/?expand=categoria,estado,servicio,prioridad')
+        self.assertEqual(data[0]['categoria'], {'id': self.categoria.id, 'nom_categoria': 'Hardware'})
+        self.assertEqual(data[0]['estado']['nom_estado'], 'Cerrado')
+        self.assertEqual(data[0]['servicio']['costo'], '1000.00')
+        # Listado con joins y la versión de los catálogos para el ETag
+        self.assertEqual(len(sql), 2)
+        self.assertTrue(any('JOIN' in consulta for consulta in sql))
+
+        data, _ = self.consultas('/tickets/?fields=id,estado&expand=estado,categoria&paginar=1')
+        self.assertEqual(data['results'][0].keys(), {'id', 'estado'})
+        self.assertEqual(data['results'][0]['estado']['nom_estado'], 'Cerrado')
+
+    def test_detalle_y_nombres_desconocidos(self):
+        self.crear_tickets(1, self.abierto)
+        ticket = Ticket.objects.get()
+        data, _ = self.consultas(f'/tickets/{ticket.id}/?fields=id,prioridad&expand=prioridad')
+        self.assertEqual(data, {'id': ticket.id, 'prioridad': {'id': self.prioridad.id, 'num_prioridad': '1'}})
+        self.assertEqual(self.client.get('/tickets/?fields=id,clave').status_code, 400)
+        self.assertEqual(self.client.get('/tickets/?expand=user').status_code, 400)
+
+    def test_escrituras_ignoran_los_parametros(self):
+        self.crear_tickets(1, self.abierto)
+        ticket = Ticket.objects.get()
+        response = self.client.patch(f'/tickets/{ticket.id}/?fields=id', {'titulo': 'Nuevo'}, format='json')
+        self.assertEqual(response.json()['titulo'], 'Nuevo')
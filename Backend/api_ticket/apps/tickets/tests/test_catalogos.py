@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..catalogos import incrementar_version_catalogos
+from ..models import Prioridad
+from .base import TicketsTestBase
+
+
+class CatalogosTest(TicketsTestBase):
+
+    def test_respuesta_completa_con_etag(self):
+        response = self.client.get('/catalogos/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([e['nom_estado'] for e in data['estados']], ['Abierto', 'Cerrado'])
+        self.assertEqual(data['categorias'], [{'id': self.categoria.id, 'nom_categoria': 'Hardware'}])
+        self.assertEqual(len(data['prioridades']), 1)
+        self.assertEqual(len(data['servicios']), 1)
+        self.assertTrue(response['ETag'])
+
+    def test_304_sin_cambios(self):
+        etag = self.client.get('/catalogos/')['ETag']
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/catalogos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(consultas), 1)
+
+    def test_cambio_en_catalogo_invalida_etag(self):
+        etag = self.client.get('/catalogos/')['ETag']
+        Prioridad.objects.create(num_prioridad='2')
+        response = self.client.get('/catalogos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()['prioridades']), 2)
+
+        etag = response['ETag']
+        self.abierto.delete()
+        self.assertEqual(self.client.get('/catalogos/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_respuesta_desde_la_cache(self):
+        self.client.get('/catalogos/')
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/catalogos/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(consultas), 1)  # solo la versión
+
+    def test_cambio_en_otro_proceso(self):
+        self.client.get('/catalogos/')
+        # Otro proceso: no pasa por las señales de este, solo cambia la versión compartida
+        Prioridad.objects.filter(pk=self.prioridad.pk).update(num_prioridad='Alta')
+        incrementar_version_catalogos()
+        data = self.client.get('/catalogos/').json()
+        self.assertEqual(data['prioridades'], [{'id': self.prioridad.id, 'num_prioridad': 'Alta'}])
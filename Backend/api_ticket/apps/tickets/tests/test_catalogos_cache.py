@@ -0,0 +1,58 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..catalogos import cache_catalogo
+from ..models import Estado, FechaTicket, Ticket
+from .base import TicketsTestBase
+
+TABLAS_CATALOGO = ('tickets_estado', 'tickets_categoria', 'tickets_prioridad', 'tickets_servicio')
+
+
+class CacheCatalogoTest(TicketsTestBase):
+
+    def test_por_id_y_por_nombre(self):
+        cache = cache_catalogo(Estado)
+        with self.assertNumQueries(1):
+            self.assertEqual(cache.por_id(self.cerrado.id).nom_estado, 'Cerrado')
+            self.assertEqual(cache.por_nombre('Cerrado'), self.cerrado)
+        with self.assertNumQueries(1):
+            self.assertIsNone(cache.por_nombre('No existe'))
+
+    def test_se_invalida_al_guardar(self):
+        cache = cache_catalogo(Estado)
+        cache.por_id(self.abierto.id)
+        self.abierto.nom_estado = 'En curso'
+        self.abierto.save()
+        self.assertEqual(cache.por_id(self.abierto.id).nom_estado, 'En curso')
+        self.assertIsNone(cache.por_nombre('Abierto'))
+
+    def test_patch_sin_consultas_de_catalogo(self):
+        self.crear_tickets(1, self.abierto)
+        ticket = Ticket.objects.get()
+        datos = {'estado': self.cerrado.id, 'categoria': self.categoria.id,
+                 'prioridad': self.prioridad.id, 'servicio': self.servicio.id}
+        self.client.patch(f'/tickets/{ticket.id}/', datos, format='json')  # calienta la cache
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.patch(f'/tickets/{ticket.id}/', datos, format='json')
+        self.assertEqual(response.status_code, 200)
+        sql = ' '.join(q['sql'] for q in consultas)
+        for tabla in TABLAS_CATALOGO:
+            self.assertNotIn(f'FROM "{tabla}"', sql)
+        self.assertTrue(FechaTicket.objects.filter(ticket=ticket, tipo_fecha='Cierre').exists())
+
+    def test_id_inexistente(self):
+        self.crear_tickets(1, self.abierto)
+        ticket = Ticket.objects.get()
+        response = self.client.patch(f'/tickets/{ticket.id}/', {'prioridad': 999}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_estado_invalido_o_inexistente(self):
+        self.crear_tickets(1, self.abierto)
+        url = f'/tickets/{Ticket.objects.get().id}/'
+        for valor in ('abc', [1], {'id': 1}):
+            with self.subTest(valor=valor):
+                response = self.client.patch(url, {'estado': valor}, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('estado', response.json())
+        self.assertEqual(self.client.patch(url, {'estado': 999}, format='json').status_code, 404)
+        self.assertEqual(self.client.patch(url, {'estado': str(self.cerrado.id)}, format='json').status_code, 200)
@@ -0,0 +1,83 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import FechaTicket, Ticket
+from .base import TicketsTestBase
+
+
+class ConditionalGetTest(TicketsTestBase):
+
+    def setUp(self):
+        super().setUp()
+        self.crear_tickets(3, self.abierto)
+        self.ticket = Ticket.objects.first()
+
+    def test_detalle_304_con_una_consulta(self):
+        url = f'/tickets/{self.ticket.id}/'
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(consultas), 1)
+
+    def test_detalle_cambia_etag_al_actualizar(self):
+        url = f'/tickets/{self.ticket.id}/'
+        response = self.client.get(url)
+        etag, modificado = response['ETag'], response['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=modificado).status_code, 304)
+        self.client.patch(url, {'estado': self.cerrado.id, 'titulo': 'Cerrado'}, format='json')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_lista_304_y_cambios(self):
+        etag = self.client.get('/tickets/')['ETag']
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/tickets/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # La misma consulta del listado, sin agregados sobre toda la tabla
+        self.assertEqual(len(consultas), 1)
+        self.assertNotIn('COUNT(', consultas[0]['sql'])
+
+        # Otra consulta (paginada) tiene su propio ETag
+        self.assertEqual(self.client.get('/tickets/?page_size=1', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.ticket.titulo = 'Editado'
+        self.ticket.save()
+        self.assertEqual(self.client.get('/tickets/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_lista_expandida_y_borrado(self):
+        url = '/tickets/?expand=estado&page_size=10'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Ticket.objects.filter(pk=self.ticket.pk).delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_expand_cambia_con_los_catalogos(self):
+        for url in ('/tickets/?expand=estado', f'/tickets/{self.ticket.id}/?expand=estado'):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+                self.abierto.nom_estado = f'Abierto {etag}'
+                self.abierto.save()
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_saves_concurrentes_no_repiten_version(self):
+        primera, segunda = Ticket.objects.get(pk=self.ticket.pk), Ticket.objects.get(pk=self.ticket.pk)
+        primera.save()
+        segunda.save()
+        self.assertEqual(Ticket.objects.get(pk=self.ticket.pk).version, self.ticket.version + 2)
+        self.assertEqual(segunda.version, self.ticket.version + 2)
+
+    def test_escritura_de_fecha_invalida_el_ticket(self):
+        url = f'/tickets/{self.ticket.id}/'
+        etag = self.client.get(url)['ETag']
+        fecha = FechaTicket.objects.filter(ticket=self.ticket).first()
+        self.client.delete(f'/fechas-tickets/{fecha.id}/')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detalle_en_una_consulta_con_las_fechas_del_listado(self):
+        url = f'/tickets/{self.ticket.id}/'
+        with CaptureQueriesContext(connection) as consultas:
+            detalle = self.client.get(url).json()
+        self.assertEqual(len(consultas), 1)
+        listado = {t['id']: t for t in self.client.get('/tickets/').json()}
+        self.assertEqual(detalle, listado[self.ticket.id])
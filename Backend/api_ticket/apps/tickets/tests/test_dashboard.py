@@ -0,0 +1,80 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.autenticacion.models import Cargo, Departamento
+from ..contadores import conteo_agregado, conteo_contadores
+from ..models import Categoria, Estado, Ticket
+from .base import TicketsTestBase
+
+
+class DashboardStatsTest(TicketsTestBase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.pendiente = Estado.objects.create(nom_estado='Pendiente')
+        departamento = Departamento.objects.create(nom_departamento='TI')
+        cls.admin.cargo = Cargo.objects.create(nom_cargo='Analista', departamento=departamento)
+        cls.admin.save()
+        cls.departamento = departamento
+
+    def test_estadisticas_agregadas(self):
+        self.crear_tickets(3, self.abierto)
+        self.crear_tickets(2, self.cerrado)
+        self.crear_tickets(1, self.pendiente)
+        self.client.get('/api/dashboard/stats/')  # calienta la cache de catálogos
+        with CaptureQueriesContext(connection) as consultas:
+            data = self.client.get('/api/dashboard/stats/').json()
+        # Un aggregate() sobre los tickets y el conteo de usuarios; los nombres salen de la cache
+        self.assertEqual(len(consultas), 2)
+        self.assertEqual(len([q for q in consultas if 'tickets_ticket' in q['sql']]), 1)
+        self.assertNotIn('GROUP BY', consultas[0]['sql'] + consultas[1]['sql'])
+
+        self.assertEqual(data['usuarios_totales'], 1)
+        self.assertEqual(data['tickets_totales'], 6)
+        self.assertEqual(data['tickets_abiertos'], 3)
+        self.assertEqual(data['tickets_cerrados'], 2)
+        self.assertEqual(data['tickets_pendientes'], 1)
+        self.assertEqual(data['por_categoria'], [{'id': self.categoria.id, 'nombre': 'Hardware', 'total': 6}])
+        self.assertEqual(data['por_departamento'], [{'id': self.departamento.id, 'nombre': 'TI', 'total': 6}])
+
+    def test_catalogo_creado_en_otro_proceso(self):
+        self.crear_tickets(2, self.abierto)
+        self.client.get('/api/dashboard/stats/')
+        # Sin señal en este proceso: la cache no conoce el estado nuevo
+        nuevo = Estado.objects.bulk_create([Estado(nom_estado='En espera')])[0]
+        Ticket.objects.filter(pk=Ticket.objects.first().pk).update(estado=nuevo)
+        data = self.client.get('/api/dashboard/stats/').json()
+        self.assertIn({'id': nuevo.id, 'nombre': 'En espera', 'total': 1}, data['por_estado'])
+        self.assertEqual(data['tickets_abiertos'], 1)
+
+    @override_settings(DASHBOARD_CONTADORES=True)
+    def test_contadores_siguen_los_cambios(self):
+        call_command('reconstruir_contadores', stdout=StringIO())
+        self.crear_tickets(4, self.abierto)
+        ticket = Ticket.objects.first()
+        ticket.estado = self.cerrado
+        ticket.categoria = Categoria.objects.create(nom_categoria='Software')
+        ticket.save()
+        Ticket.objects.last().delete()
+
+        esperado = +conteo_agregado()
+        self.assertEqual(+conteo_contadores(), esperado)
+        self.assertEqual(esperado['tickets'], 3)
+
+        with CaptureQueriesContext(connection) as consultas:
+            data = self.client.get('/api/dashboard/stats/').json()
+        self.assertFalse(any('tickets_ticket' in q['sql'] for q in consultas))
+        self.assertEqual(data['tickets_cerrados'], 1)
+        self.assertEqual(data['tickets_abiertos'], 2)
+
+    @override_settings(DASHBOARD_CONTADORES=True)
+    def test_reconstruir_corrige_desvios(self):
+        self.crear_tickets(2, self.abierto)
+        Ticket.objects.update(estado=self.pendiente)  # update() no dispara señales
+        call_command('reconstruir_contadores', stdout=StringIO())
+        self.assertEqual(+conteo_contadores(), +conteo_agregado())
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, SimpleTestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.autenticacion.models import Usuario
+from apps.autenticacion.serializers import CustomTokenObtainPairSerializer
+from ..eventos import Difusor, difusor
+from ..models import Ticket
+from .base import TicketsTestBase
+
+
+def leer_eventos(texto):
+    """[(tipo, id, datos)] de un cuerpo SSE, sin comentarios ni retry"""
+    eventos = []
+    for bloque in texto.split('\n\n'):
+        campos = dict(linea.split(': ', 1) for linea in bloque.splitlines() if not linea.startswith(':'))
+        if 'event' in campos:
+            eventos.append((campos['event'], campos['id'], json.loads(campos['data'])))
+    return eventos
+
+
+class DifusorTest(SimpleTestCase):
+
+    def test_registro_acotado_y_reanudacion(self):
+        d = Difusor(max_eventos=3)
+        d.publicar([('creado', i, {1}, {'id': i}) for i in range(1, 5)])
+        self.assertEqual([e.ticket for e in d.desde(2)], [3, 4])
+        self.assertEqual(d.desde(4), [])
+        self.assertIsNone(d.desde(0))  # el evento 1 ya salió del registro
+        self.assertEqual(d.posicion(d.id_evento(3)), 3)
+        self.assertEqual(d.posicion(None), 4)
+        self.assertEqual(d.posicion('otro-3'), -1)
+        self.assertEqual(d.posicion(d.id_evento(9)), -1)
+
+    def test_despierta_esperas_async(self):
+        d = Difusor(max_eventos=10)
+
+        async def esperar():
+            tarea = asyncio.ensure_future(d.aesperar(0, timeout=5))
+            await asyncio.sleep(0)
+            d.publicar([('cerrado', 7, {1}, {'id': 7})])
+            return await tarea
+
+        self.assertEqual([e.ticket for e in async_to_sync(esperar)()], [7])
+
+
+@override_settings(EVENTOS={'LATIDO': 0.01, 'DURACION_MAX': 0.05})
+class FeedEventosTest(TicketsTestBase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.usuario = Usuario.objects.create_user(
+            rut_usuario=12345678, dv_rut_usuario='5', correo='usuario@test.cl',
+            nom_usuario='usuario', password='clave-segura',
+        )
+
+    def item(self, **cambios):
+        return dict({'titulo': 'Nuevo', 'categoria': self.categoria.id, 'prioridad': self.prioridad.id,
+                     'servicio': self.servicio.id, 'estado': self.abierto.id}, **cambios)
+
+    def feed(self, usuario, desde):
+        client = APIClient()
+        client.force_authenticate(usuario)
+        response = client.get('/tickets/eventos/', HTTP_LAST_EVENT_ID=desde)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return leer_eventos(b''.join(response.streaming_content).decode())
+
+    def test_escrituras_publican_al_confirmar(self):
+        inicio = difusor.id_evento(difusor.ultimo)
+        with self.captureOnCommitCallbacks(execute=True):
+            creado = self.client.post('/tickets/', self.item(), format='json').json()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/tickets/{creado['id']}/", {'estado': self.cerrado.id, 'titulo': 'Otro'},
+                              format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            masivo = self.client.post('/tickets/masivo/', [self.item(titulo='Masivo')], format='json').json()
+            id_masivo = masivo['resultados'][0]['id']
+            self.client.post('/tickets/masivo/transicion/', {'ids': [id_masivo], 'user': 'usuario'}, format='json')
+
+        eventos = self.feed(self.admin, inicio)
+        self.assertEqual([(tipo, datos['id']) for tipo, _, datos in eventos], [
+            ('creado', creado['id']), ('cerrado', creado['id']), ('creado', id_masivo), ('actualizado', id_masivo),
+        ])
+        self.assertEqual(eventos[0][2]['user'], 'admin')
+        self.assertEqual(eventos[1][2], {'id': creado['id'], 'titulo': 'Otro', 'estado': self.cerrado.id})
+        self.assertEqual(eventos[3][2], {'id': id_masivo, 'user': 'usuario'})
+
+        # El usuario solo ve el ticket que pasó a ser suyo; retoma desde el último id recibido
+        self.assertEqual([d['id'] for _, _, d in self.feed(self.usuario, inicio)], [id_masivo])
+        self.assertEqual(self.feed(self.admin, eventos[2][1]), eventos[3:])
+
+    def test_sin_confirmar_no_publica(self):
+        ultimo = difusor.ultimo
+        self.client.post('/tickets/', self.item(), format='json')  # on_commit no se ejecuta en TestCase
+        self.assertEqual(difusor.ultimo, ultimo)
+
+    def test_reinicio_y_autenticacion(self):
+        self.assertEqual(self.feed(self.admin, 'de-otro-proceso')[0][0], 'reinicio')
+        self.assertEqual(APIClient().get('/tickets/eventos/', HTTP_ACCEPT='text/event-stream').status_code, 401)
+
+    def test_flujo_async(self):
+        inicio = difusor.id_evento(difusor.ultimo)
+        ticket = Ticket.objects.create(titulo='Async', categoria=self.categoria, prioridad=self.prioridad,
+                                       servicio=self.servicio, estado=self.abierto, user=self.usuario)
+        difusor.publicar([('creado', ticket.pk, {self.usuario.pk}, {'id': ticket.pk})])
+        token = CustomTokenObtainPairSerializer.get_token(self.usuario).access_token
+
+        async def leer():
+            response = await AsyncClient().get('/tickets/eventos/', headers={
+                'Authorization': f'Bearer {token}', 'Last-Event-ID': inicio})
+            return b''.join([parte async for parte in response.streaming_content]).decode()
+
+        self.assertEqual(leer_eventos(async_to_sync(leer)()), [('creado', difusor.id_evento(difusor.ultimo),
+                                                                 {'id': ticket.pk})])
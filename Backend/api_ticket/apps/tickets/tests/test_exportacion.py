@@ -0,0 +1,49 @@
+import csv
+import json
+from io import StringIO
+
+from django.core.management import call_command
+
+from ..models import Ticket
+from .base import TicketsTestBase
+
+
+class ExportacionTest(TicketsTestBase):
+
+    def contenido(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_con_fechas_y_catalogos(self):
+        self.crear_tickets(2, self.abierto)
+        self.crear_tickets(1, self.cerrado)
+        response = self.client.get('/tickets/exportar/')
+        self.assertEqual(response.status_code, 200)
+        filas = list(csv.DictReader(StringIO(self.contenido(response))))
+        self.assertEqual(len(filas), 3)
+        self.assertEqual(filas[0]['categoria'], 'Hardware')
+        self.assertEqual(filas[0]['usuario'], 'admin')
+        self.assertTrue(filas[0]['fecha_creacion'])
+        self.assertEqual(filas[0]['fecha_cierre'], '')
+        self.assertTrue(filas[2]['fecha_cierre'])
+
+    def test_ndjson_filtrado_por_estado(self):
+        self.crear_tickets(2, self.abierto)
+        self.crear_tickets(1, self.cerrado)
+        response = self.client.get('/tickets/exportar/?formato=ndjson&estado=Cerrado')
+        filas = [json.loads(linea) for linea in self.contenido(response).splitlines()]
+        self.assertEqual([f['estado'] for f in filas], ['Cerrado'])
+        self.assertEqual(filas[0]['costo'], '1000.00')
+
+    def test_rango_de_fechas(self):
+        self.crear_tickets(2, self.abierto)
+        response = self.client.get('/tickets/exportar/?formato=ndjson&hasta=2000-01-01')
+        self.assertEqual(self.contenido(response), '')
+        self.assertEqual(self.client.get('/tickets/exportar/?desde=ayer').status_code, 400)
+
+    def test_comando(self):
+        self.crear_tickets(3, self.abierto)
+        salida = StringIO()
+        call_command('exportar_tickets', formato='ndjson', stdout=salida, stderr=StringIO())
+        ids = [json.loads(linea)['id'] for linea in salida.getvalue().splitlines()]
+        self.assertEqual(ids, list(Ticket.objects.order_by('pk').values_list('pk', flat=True)))
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.autenticacion.models import Usuario
+from ..models import Categoria, FechaTicket, Servicio, Ticket
+from .base import TicketsTestBase
+
+
+class TicketFilterTest(TicketsTestBase):
+
+    def ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(t['id'] for t in response.json())
+
+    def test_ids_de_catalogo(self):
+        self.crear_tickets(2, self.abierto)
+        self.crear_tickets(1, self.cerrado)
+        otra = Categoria.objects.create(nom_categoria='Software')
+        Ticket.objects.filter(pk=Ticket.objects.first().pk).update(categoria=otra)
+        self.assertEqual(len(self.ids(f'/tickets/?estado={self.abierto.id}')), 2)
+        self.assertEqual(len(self.ids(f'/tickets/?estado={self.abierto.id},{self.cerrado.id}')), 3)
+        self.assertEqual(len(self.ids(f'/tickets/?categoria={otra.id}')), 1)
+        self.assertEqual(len(self.ids(f'/tickets-cerrados/?categoria={self.categoria.id}')), 1)
+        self.assertEqual(self.client.get('/tickets/?estado=abc').status_code, 400)
+
+    def test_rangos_de_fecha_y_costo(self):
+        self.crear_tickets(3, self.cerrado)
+        antiguo = Ticket.objects.first()
+        hace_un_mes = timezone.now() - timedelta(days=30)
+        FechaTicket.objects.filter(ticket=antiguo, tipo_fecha='Creacion').update(fecha=hace_un_mes)
+        FechaTicket.objects.filter(ticket=antiguo, tipo_fecha='Cierre').update(fecha=hace_un_mes + timedelta(days=1))
+        hoy = timezone.localdate().isoformat()
+        self.assertEqual(len(self.ids(f'/tickets/?creado_desde={hoy}')), 2)
+        self.assertEqual(self.ids(f'/tickets/?cerrado_hasta={(timezone.localdate() - timedelta(days=1)).isoformat()}'),
+                         [antiguo.id])
+        self.assertEqual(len(self.ids(f'/tickets/?creado_desde={hoy}&creado_hasta={hoy}')), 2)
+        self.assertEqual(self.client.get('/tickets/?creado_desde=ayer').status_code, 400)
+
+        caro = Servicio.objects.create(titulo_servicio='Redes', costo='5000.00', categoria=self.categoria)
+        Ticket.objects.filter(pk=antiguo.pk).update(servicio=caro)
+        self.assertEqual(self.ids('/tickets/?costo_min=2000'), [antiguo.id])
+        self.assertEqual(len(self.ids('/tickets/?costo_max=2000')), 2)
+
+    def test_orden_en_lista_blanca(self):
+        self.crear_tickets(3, self.abierto)
+        data = self.client.get('/tickets/?ordering=-id').json()
+        self.assertEqual([t['id'] for t in data], sorted((t['id'] for t in data), reverse=True))
+        self.assertEqual(self.client.get('/tickets/?ordering=comentario').status_code, 400)
+
+    def test_visibilidad_se_mantiene(self):
+        otro = Usuario.objects.create_user(
+            rut_usuario=22222222, dv_rut_usuario='2', correo='otro@test.cl',
+            nom_usuario='otro', password='clave-segura',
+        )
+        self.crear_tickets(2, self.abierto)
+        self.client.force_authenticate(otro)
+        self.assertEqual(self.ids(f'/tickets/?user={self.admin.pk}'), [])
+
+    def test_usuarios(self):
+        Usuario.objects.create_user(
+            rut_usuario=22222222, dv_rut_usuario='2', correo='otro@test.cl',
+            nom_usuario='otro', password='clave-segura',
+        )
+        data = self.client.get('/usuarios/?role=admin').json()
+        self.assertEqual([u['rut_usuario'] for u in data], [self.admin.pk])
+        self.assertEqual(self.client.get('/usuarios/?role=otro').status_code, 400)
@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from ..importacion import Importador, leer_filas
+from ..models import DetalleUsuarioTicket, FechaTicket, Ticket
+from .base import TicketsTestBase
+
+
+class ImportTicketsTest(TicketsTestBase):
+
+    def fila(self, **cambios):
+        datos = {'titulo': 'Histórico', 'categoria': 'Hardware', 'prioridad': '1', 'servicio': 'Soporte',
+                 'estado': 'Cerrado', 'usuario': 'admin', 'fecha_creacion': '2019-03-01T10:00:00-03:00',
+                 'fecha_cierre': '2019-03-02T09:30:00-03:00'}
+        datos.update(cambios)
+        return datos
+
+    def archivo(self, filas):
+        descriptor, ruta = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as salida:
+            for fila in filas:
+                salida.write(json.dumps(fila) + '\n')
+        self.addCleanup(os.remove, ruta)
+        return ruta
+
+    def test_conserva_fechas_originales(self):
+        ruta = self.archivo([self.fila(), self.fila(estado='Abierto', fecha_cierre=None, asignado='admin')])
+        salida = StringIO()
+        call_command('import_tickets', ruta, stdout=salida, stderr=StringIO())
+        self.assertIn('filas/s', salida.getvalue())
+
+        cerrado = Ticket.objects.con_fechas().get(estado=self.cerrado)
+        self.assertEqual(timezone.localtime(cerrado.fecha_creacion).isoformat(), '2019-03-01T10:00:00-03:00')
+        self.assertEqual(timezone.localtime(cerrado.fecha_cierre).isoformat(), '2019-03-02T09:30:00-03:00')
+        self.assertEqual(FechaTicket.objects.count(), 3)
+        self.assertEqual(DetalleUsuarioTicket.objects.filter(relacion_ticket='asignado').count(), 1)
+        self.assertEqual(DetalleUsuarioTicket.objects.filter(relacion_ticket='creador').count(), 2)
+
+    def test_cierre_en_el_mismo_instante_que_la_creacion(self):
+        ruta = self.archivo([self.fila(fecha_creacion='2020-01-01', fecha_cierre='2020-01-01'), self.fila()])
+        with open(ruta, encoding='utf-8') as entrada:
+            importadas, errores = Importador('mismo-instante').importar(leer_filas(entrada, 'jsonl'))
+        self.assertEqual((importadas, errores), (2, []))
+        ticket = Ticket.objects.con_fechas().order_by('pk').first()
+        self.assertEqual(ticket.fecha_cierre - ticket.fecha_creacion, timedelta(microseconds=1))
+
+    def test_retoma_desde_el_checkpoint(self):
+        ruta = self.archivo([self.fila(titulo=f'T{i}') for i in range(5)])
+        importador = Importador('prueba', tamano_lote=2)
+
+        class Interrupcion(Exception):
+            pass
+
+        def interrumpir(importadas, numero):
+            raise Interrupcion
+
+        with open(ruta, encoding='utf-8') as entrada, self.assertRaises(Interrupcion):
+            importador.importar(leer_filas(entrada, 'jsonl'), interrumpir)
+        self.assertEqual(importador.avance(), 2)
+        with open(ruta, encoding='utf-8') as entrada:
+            importadas, errores = importador.importar(leer_filas(entrada, 'jsonl'))
+        self.assertEqual((importadas, errores), (3, []))
+        self.assertEqual(list(Ticket.objects.order_by('pk').values_list('titulo', flat=True)),
+                         ['T0', 'T1', 'T2', 'T3', 'T4'])
+
+    def test_filas_invalidas_se_informan(self):
+        ruta = self.archivo([self.fila(), self.fila(categoria='No existe'), self.fila(titulo='')])
+        errores = StringIO()
+        call_command('import_tickets', ruta, stdout=StringIO(), stderr=errores)
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.assertIn('Fila 2: categoria inexistente', errores.getvalue())
+        self.assertIn('Fila 3: Falta titulo', errores.getvalue())
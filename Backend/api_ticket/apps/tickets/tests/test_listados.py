@@ -0,0 +1,100 @@
+import json
+from base64 import b64encode
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.autenticacion.models import Usuario
+from ..models import FechaTicket, Ticket
+from .base import TicketsTestBase
+
+
+class TicketListQueriesTest(TicketsTestBase):
+    """El número de consultas de los listados no debe crecer con la cantidad de tickets"""
+
+    def contar_consultas(self, url):
+        self.client.get(url)  # calienta la cache de catálogos
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(consultas), response.json()
+
+    def test_listado_tickets_consultas_constantes(self):
+        self.crear_tickets(2, self.abierto)
+        pocas, _ = self.contar_consultas('/tickets/')
+        self.crear_tickets(20, self.abierto)
+        muchas, data = self.contar_consultas('/tickets/')
+        self.assertEqual(pocas, muchas)
+        self.assertEqual(muchas, 1)
+        self.assertEqual(len(data), 22)
+        self.assertTrue(all(t['fecha_creacion'] for t in data))
+        self.assertEqual(data[0]['user'], 'admin')
+
+    def test_listado_cerrados_consultas_constantes(self):
+        self.crear_tickets(2, self.cerrado)
+        pocas, _ = self.contar_consultas('/tickets-cerrados/')
+        self.crear_tickets(20, self.cerrado)
+        muchas, data = self.contar_consultas('/tickets-cerrados/')
+        self.assertEqual(pocas, muchas)
+        self.assertEqual(len(data), 22)
+        self.assertTrue(all(t['fecha_cierre'] for t in data))
+
+
+class TicketCursorPaginationTest(TicketsTestBase):
+
+    def recorrer(self, url):
+        ids, consultas = [], []
+        while url:
+            with CaptureQueriesContext(connection) as capturadas:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            consultas.append([q['sql'] for q in capturadas])
+            ids.extend(t['id'] for t in response.json()['results'])
+            url = response.json()['next']
+        return ids, consultas
+
+    def test_recorre_todas_las_paginas_en_orden(self):
+        self.crear_tickets(7, self.abierto)
+        # Fechas repetidas: el id desempata el orden
+        FechaTicket.objects.update(fecha=timezone.now())
+        ids, consultas = self.recorrer('/tickets/?page_size=3')
+        self.assertEqual(ids, list(Ticket.objects.order_by('id').values_list('id', flat=True)))
+        self.assertEqual(len(consultas), 3)
+        self.assertEqual({len(c) for c in consultas}, {1})
+        self.assertFalse(any('COUNT(' in sql for c in consultas for sql in c))
+
+    def test_sin_parametros_mantiene_lista_completa(self):
+        self.crear_tickets(3, self.cerrado)
+        response = self.client.get('/tickets-cerrados/')
+        self.assertIsInstance(response.json(), list)
+        response = self.client.get('/tickets-cerrados/?paginar=1')
+        self.assertEqual(len(response.json()['results']), 3)
+
+    def test_tickets_sin_fecha_de_creacion(self):
+        self.crear_tickets(5, self.abierto)
+        sin_fecha = Ticket.objects.order_by('id')[2]
+        FechaTicket.objects.filter(ticket=sin_fecha).delete()
+        ids, _ = self.recorrer('/tickets/?page_size=2')
+        self.assertEqual(ids, sorted(t['id'] for t in self.client.get('/tickets/').json()))
+        self.assertIn(sin_fecha.id, ids)
+
+    def test_cursor_invalido(self):
+        response = self.client.get('/tickets/?cursor=no-es-un-cursor')
+        self.assertEqual(response.status_code, 404)
+        for posicion in (['x'], [[1]], [None], [True], ['2024-01-01T00:00:00+00:00', 1]):
+            cursor = b64encode(json.dumps(posicion).encode('utf-8'), altchars=b'-_').decode('ascii')
+            with self.subTest(posicion=posicion):
+                self.assertEqual(self.client.get(f'/tickets/?cursor={cursor}').status_code, 404)
+
+    def test_paginacion_usuarios(self):
+        for rut in (22222222, 33333333):
+            Usuario.objects.create_user(
+                rut_usuario=rut, dv_rut_usuario='2', correo=f'{rut}@test.cl',
+                nom_usuario=str(rut), password='clave-segura',
+            )
+        response = self.client.get('/usuarios/?page_size=2')
+        self.assertEqual(len(response.json()['results']), 2)
+        response = self.client.get(response.json()['next'])
+        self.assertEqual([u['rut_usuario'] for u in response.json()['results']], [33333333])
+        self.assertIsNone(response.json()['next'])
@@ -0,0 +1,143 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from ..contadores import conteo_agregado, conteo_contadores
+from ..models import FechaTicket, Ticket
+from api.metricas import registro
+from .base import TicketsTestBase
+
+
+class TicketMasivoTest(TicketsTestBase):
+
+    def item(self, **cambios):
+        datos = {'titulo': 'Masivo', 'comentario': '', 'categoria': self.categoria.id,
+                 'prioridad': self.prioridad.id, 'servicio': self.servicio.id, 'estado': self.abierto.id}
+        datos.update(cambios)
+        return datos
+
+    def test_crea_con_consultas_constantes(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post('/tickets/masivo/', [self.item() for _ in range(5)], format='json')
+        self.assertEqual(response.status_code, 201)
+        pocas = len(consultas)
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.post('/tickets/masivo/', [self.item() for _ in range(50)], format='json')
+        self.assertLessEqual(len(consultas), pocas)
+
+        data = response.json()
+        self.assertEqual((data['creados'], data['errores']), (5, 0))
+        ids = [r['id'] for r in data['resultados']]
+        self.assertEqual(Ticket.objects.filter(id__in=ids, user=self.admin).count(), 5)
+        self.assertEqual(FechaTicket.objects.filter(ticket_id__in=ids, tipo_fecha='Creacion').count(), 5)
+
+    def test_errores_por_indice(self):
+        items = [self.item(), self.item(estado=999), 'no es un ticket']
+        response = self.client.post('/tickets/masivo/', items, format='json')
+        self.assertEqual(response.status_code, 207)
+        resultados = response.json()['resultados']
+        self.assertIn('id', resultados[0])
+        self.assertIn('estado', resultados[1]['errores'])
+        self.assertEqual(resultados[2]['indice'], 2)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_atomico_no_crea_nada(self):
+        items = [self.item(), self.item(categoria=None)]
+        response = self.client.post('/tickets/masivo/?atomico=1', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['creados'], 0)
+        self.assertFalse(Ticket.objects.exists())
+
+    @override_settings(TICKETS_MASIVO_MAX=2)
+    def test_limite_y_formato(self):
+        self.assertEqual(self.client.post('/tickets/masivo/', [self.item()] * 3, format='json').status_code, 400)
+        self.assertEqual(self.client.post('/tickets/masivo/', self.item(), format='json').status_code, 400)
+
+    @override_settings(DASHBOARD_CONTADORES=True)
+    def test_mantiene_contadores(self):
+        call_command('reconstruir_contadores', stdout=StringIO())
+        self.client.post('/tickets/masivo/', [self.item(), self.item(estado=self.cerrado.id)], format='json')
+        self.assertEqual(+conteo_contadores(), +conteo_agregado())
+
+
+class TransicionMasivaTest(TicketsTestBase):
+
+    def test_cierra_con_consultas_constantes(self):
+        self.crear_tickets(3, self.abierto)
+        ids = list(Ticket.objects.values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post('/tickets/masivo/transicion/',
+                                        {'ids': ids + [999], 'estado': self.cerrado.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(sorted(data['actualizados']), sorted(ids))
+        self.assertEqual(data['omitidos'], [{'id': 999, 'motivo': 'No existe'}])
+        self.assertEqual(Ticket.objects.filter(estado=self.cerrado, version=2).count(), 3)
+        self.assertEqual(FechaTicket.objects.filter(tipo_fecha='Cierre').count(), 3)
+
+        self.crear_tickets(30, self.abierto)
+        todos = list(Ticket.objects.values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as muchas:
+            response = self.client.post('/tickets/masivo/transicion/',
+                                        {'ids': todos, 'estado': self.cerrado.id}, format='json')
+        self.assertLessEqual(len(muchas), len(consultas))
+        self.assertEqual({o['motivo'] for o in response.json()['omitidos']}, {'Sin cambios'})
+
+    def test_reabre_y_vuelve_a_cerrar(self):
+        self.crear_tickets(2, self.cerrado)
+        ids = list(Ticket.objects.values_list('id', flat=True))
+        self.client.post('/tickets/masivo/transicion/', {'ids': ids, 'estado': self.abierto.id}, format='json')
+        self.client.post('/tickets/masivo/transicion/', {'ids': ids, 'estado': self.cerrado.id}, format='json')
+        # El upsert actualiza la fecha existente en vez de duplicarla
+        self.assertEqual(FechaTicket.objects.filter(tipo_fecha='Cierre').count(), 2)
+
+    def test_requiere_estado_o_usuario(self):
+        self.crear_tickets(1, self.abierto)
+        response = self.client.post('/tickets/masivo/transicion/',
+                                    {'ids': [Ticket.objects.get().id]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(DASHBOARD_CONTADORES=True)
+    def test_mantiene_contadores(self):
+        self.crear_tickets(3, self.abierto)
+        call_command('reconstruir_contadores', stdout=StringIO())
+        ids = list(Ticket.objects.values_list('id', flat=True))[:2]
+        self.client.post('/tickets/masivo/transicion/',
+                         {'ids': ids, 'estado': self.cerrado.id, 'user': 'admin'}, format='json')
+        self.assertEqual(+conteo_contadores(), +conteo_agregado())
+
+
+class MetricasNegocioTest(TicketsTestBase):
+
+    def setUp(self):
+        super().setUp()
+        registro.reiniciar()
+
+    def contador(self, nombre):
+        return registro.contadores.get((nombre, ()), 0)
+
+    def test_creados_y_cerrados(self):
+        item = {'titulo': 'Nuevo', 'categoria': self.categoria.id, 'prioridad': self.prioridad.id,
+                'servicio': self.servicio.id, 'estado': self.abierto.id}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/tickets/masivo/', [item, item], format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/tickets/', item, format='json')
+        self.assertEqual(self.contador('api_tickets_creados_total'), 3)
+
+        primero, *resto = Ticket.objects.values_list('id', flat=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/tickets/{primero}/', {'estado': self.cerrado.id}, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            # El primero ya estaba cerrado: solo cuentan los que cambian de estado
+            self.client.post('/tickets/masivo/transicion/',
+                             {'ids': [primero, *resto], 'estado': self.cerrado.id, 'user': 'admin'}, format='json')
+        self.assertEqual(self.contador('api_tickets_cerrados_total'), 3)
+
+    def test_no_cuenta_si_se_revierte(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/tickets/masivo/?atomico=1', [{'titulo': 'x'}], format='json')
+        self.assertEqual(self.contador('api_tickets_creados_total'), 0)
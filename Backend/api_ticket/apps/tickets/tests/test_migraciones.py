@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+ANTES = ('tickets', '0010_ticket_version_fecha_actualizacion')
+UNICA = ('tickets', '0011_fechaticket_ticket_tipo_unico')
+
+
+class FechasDuplicadasMigracionTest(TransactionTestCase):
+    """0011 deja una fecha por ticket y tipo sin cambiar la que mostraban los listados"""
+
+    def migrar(self, destino):
+        executor = MigrationExecutor(connection)
+        executor.migrate([destino])
+        executor.loader.build_graph()
+        return executor.loader.project_state([destino]).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_conserva_la_creacion_de_los_listados(self):
+        apps = self.migrar(ANTES)
+
+        def modelo(nombre):
+            return apps.get_model('tickets', nombre)
+
+        categoria = modelo('Categoria').objects.create(nom_categoria='Hardware')
+        ticket = modelo('Ticket').objects.create(
+            titulo='Duplicado', categoria=categoria, prioridad=modelo('Prioridad').objects.create(num_prioridad='1'),
+            servicio=modelo('Servicio').objects.create(titulo_servicio='Soporte', costo='1', categoria=categoria),
+            estado=modelo('Estado').objects.create(nom_estado='Abierto'),
+        )
+        FechaTicket = modelo('FechaTicket')
+        base = datetime(2024, 10, 30, tzinfo=dt_timezone.utc)
+        fechas = {}
+        for tipo, minutos in (('Creacion', 0), ('Creacion', 1), ('Cierre', 5), ('Cierre', 10), ('Cierre', 7)):
+            fecha = FechaTicket.objects.create(ticket=ticket, tipo_fecha=tipo)
+            FechaTicket.objects.filter(pk=fecha.pk).update(fecha=base + timedelta(minutes=minutos))
+            fechas.setdefault(tipo, []).append(fecha.pk)
+
+        apps = self.migrar(UNICA)
+        conservadas = dict(apps.get_model('tickets', 'FechaTicket').objects.values_list('tipo_fecha', 'pk'))
+        # Creación: la primera registrada (con_fechas ordena por pk); cierre: la más reciente
+        self.assertEqual(conservadas, {'Creacion': fechas['Creacion'][0], 'Cierre': fechas['Cierre'][1]})
+        self.assertEqual(apps.get_model('tickets', 'FechaTicketDescartada').objects.count(), 3)
+
+        apps = self.migrar(ANTES)
+        restauradas = apps.get_model('tickets', 'FechaTicket').objects.order_by('pk').values_list('fecha', flat=True)
+        self.assertEqual([f - base for f in restauradas], [timedelta(minutes=m) for m in (0, 1, 5, 10, 7)])
+        self.assertFalse(apps.get_model('tickets', 'FechaTicketDescartada').objects.exists())
@@ -0,0 +1,66 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from apps.autenticacion.models import Usuario
+from ..filters import TicketFilter
+from ..models import DetalleUsuarioTicket, Estado, FechaTicket, Ticket
+from ..pagination import TicketCursorPagination
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN es propio de SQLite')
+class PlanesConsultaTest(TestCase):
+    """
+    Las consultas frecuentes deben resolverse con índices. Un paso SCAN en el plan
+    significa que SQLite recorre la tabla (o un índice) completa.
+    El listado completo del admin no se incluye: devuelve toda la tabla por definición.
+    """
+
+    def plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [fila[-1] for fila in cursor.fetchall()]
+
+    def assertSinScan(self, queryset):
+        plan = self.plan(queryset)
+        recorridos = [paso for paso in plan if paso.startswith('SCAN')]
+        self.assertFalse(recorridos, '\n'.join(plan))
+
+    def test_tickets_de_usuario(self):
+        self.assertSinScan(Ticket.objects.con_fechas().filter(user=12345678))
+
+    def test_tickets_de_usuario_por_estado(self):
+        self.assertSinScan(Ticket.objects.filter(user=12345678, estado__nom_estado='Abierto'))
+
+    def test_tickets_cerrados(self):
+        self.assertSinScan(Ticket.objects.con_fechas().filter(estado__nom_estado='Cerrado'))
+
+    def test_pagina_por_cursor(self):
+        paginacion = TicketCursorPagination()
+        queryset = paginacion.preparar_queryset(Ticket.objects.con_fechas()).order_by(*paginacion.ordering)
+        queryset = queryset.filter(paginacion.filtro_posicion([10]))
+        plan = self.plan(queryset[:51])
+        # Una página profunda cuesta lo mismo que la primera: sin recorrido ni ordenamiento aparte
+        self.assertSinScan(queryset[:51])
+        self.assertFalse([paso for paso in plan if 'TEMP B-TREE' in paso], '\n'.join(plan))
+
+    def test_filtros_de_listado(self):
+        for params in ({'estado': '1,2'}, {'categoria': '3'}, {'creado_desde': '2024-01-01', 'creado_hasta': '2024-02-01'},
+                       {'cerrado_desde': '2024-01-01', 'prioridad': '1'}):
+            filtro = TicketFilter(params, queryset=Ticket.objects.con_fechas())
+            self.assertTrue(filtro.is_valid(), filtro.errors)
+            self.assertSinScan(filtro.qs)
+
+    def test_fecha_de_ticket_por_tipo(self):
+        self.assertSinScan(FechaTicket.objects.filter(ticket=1, tipo_fecha='Creacion').order_by('-fecha')[:1])
+
+    def test_estado_por_nombre(self):
+        self.assertSinScan(Estado.objects.filter(nom_estado='Cerrado'))
+
+    def test_detalles_de_usuario_por_relacion(self):
+        self.assertSinScan(DetalleUsuarioTicket.objects.filter(usuario=12345678, relacion_ticket='asignado'))
+
+    def test_usuario_por_rut(self):
+        self.assertSinScan(Usuario.objects.filter(rut_usuario=12345678))
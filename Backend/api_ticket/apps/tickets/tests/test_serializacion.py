@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.test import override_settings
+
+from ..models import FechaTicket, Ticket
+from ..serializacion import HoraLocal, SerializadorFilas
+from ..serializers import TicketSerializer
+from .base import TicketsTestBase
+
+UTC = dt_timezone.utc
+
+
+class SerializacionRapidaTest(TicketsTestBase):
+
+    def test_igual_a_ticket_serializer(self):
+        # Fechas alrededor de los cambios de horario de Chile en 2024, con y sin microsegundos
+        fechas = [datetime(2024, 4, 7, 2, 59, 59, tzinfo=UTC), datetime(2024, 4, 7, 3, 0, 0, 500, tzinfo=UTC),
+                  datetime(2024, 9, 8, 3, 59, 59, 999999, tzinfo=UTC), datetime(2024, 9, 8, 4, 0, tzinfo=UTC),
+                  datetime(2024, 12, 31, 23, 30, tzinfo=UTC)]
+        for i, fecha in enumerate(fechas):
+            ticket = Ticket.objects.create(
+                titulo=f'Ticket {i}', comentario=None if i % 2 else 'texto', categoria=self.categoria,
+                prioridad=self.prioridad, servicio=self.servicio, estado=self.cerrado,
+                user=None if i == 0 else self.admin,
+            )
+            FechaTicket.objects.create(ticket=ticket, tipo_fecha='Creacion')
+            FechaTicket.objects.create(ticket=ticket, tipo_fecha='Cierre')
+            FechaTicket.objects.filter(ticket=ticket, tipo_fecha='Creacion').update(fecha=fecha)
+            FechaTicket.objects.filter(ticket=ticket, tipo_fecha='Cierre').update(fecha=fecha + timedelta(hours=1))
+
+        queryset = Ticket.objects.con_fechas().order_by('pk')
+        esperado = TicketSerializer(queryset, many=True).data
+        serializador = SerializadorFilas()
+        self.assertEqual(serializador.serializar(serializador.preparar(queryset)), esperado)
+
+        for url in ('/tickets/', '/tickets/?paginar=1', '/tickets/?fields=id,fecha_cierre,user&ordering=id'):
+            rapida = self.client.get(url).json()
+            with override_settings(SERIALIZACION_RAPIDA=False):
+                self.assertEqual(rapida, self.client.get(url).json())
+
+    def test_hora_local_en_otras_zonas(self):
+        for zona in ('America/Santiago', 'Australia/Lord_Howe', 'Asia/Kolkata', 'UTC'):
+            hora, tz = HoraLocal(ZoneInfo(zona)), ZoneInfo(zona)
+            valor = datetime(2024, 1, 1, tzinfo=UTC)
+            for _ in range(400):
+                valor += timedelta(hours=23, minutes=7)
+                drf = valor.astimezone(tz).isoformat().replace('+00:00', 'Z')
+                self.assertEqual(hora.iso(valor), drf)
+                self.assertEqual(hora.texto(valor), valor.astimezone(tz).strftime('%Y-%m-%d %H:%M:%S'))
@@ -1,4 +1,5 @@
 from rest_framework.routers import DefaultRouter
+from django.conf import settings
 from django.urls import path
 from .views import (
     DepartamentoListCreateView, DepartamentoDetailView,
@@ -7,10 +8,11 @@ from .views import (
     EstadoListCreateView, EstadoDetailView,
     PrioridadListCreateView, PrioridadDetailView,
     ServicioListCreateView, ServicioDetailView,
-    TicketListCreateView, TicketDetailView,
+    TicketListCreateView, TicketDetailView, TicketBulkCreateView,
+    TicketBulkTransitionView, TicketSearchView, TicketEventsView,
     DetalleUsuarioTicketListCreateView, DetalleUsuarioTicketDetailView,
     FechaTicketListCreateView, FechaTicketDetailView,ClosedTicketListView,
-    dashboard_stats,list_usuarios
+    dashboard_stats,list_usuarios,catalogos,exportar_tickets
 )
 
 from rest_framework_simplejwt.views import (
@@ -57,8 +59,15 @@ urlpatterns = [
     path('servicios/', ServicioListCreateView.as_view(), name='servicio-list-create'),
     path('servicios/<int:pk>/', ServicioDetailView.as_view(), name='servicio-detail'),
 
+    path('catalogos/', catalogos, name='catalogos'),
+
     path('tickets/', TicketListCreateView.as_view(), name='ticket-list-create'),
     path('tickets/<int:pk>/', TicketDetailView.as_view(), name='ticket-detail'),
+    path('tickets/masivo/', TicketBulkCreateView.as_view(), name='ticket-bulk-create'),
+    path('tickets/buscar/', TicketSearchView.as_view(), name='ticket-search'),
+    path('tickets/exportar/', exportar_tickets, name='ticket-export'),
+    path('tickets/eventos/', TicketEventsView.as_view(), name='ticket-events'),
+    path('tickets/masivo/transicion/', TicketBulkTransitionView.as_view(), name='ticket-bulk-transition'),
 
     path('detalle-usuarios-tickets/', DetalleUsuarioTicketListCreateView.as_view(), name='detalle-usuario-ticket-list-create'),
     path('detalle-usuarios-tickets/<int:pk>/', DetalleUsuarioTicketDetailView.as_view(), name='detalle-usuario-ticket-detail'),
@@ -82,4 +91,9 @@ urlpatterns = [
     path('usuarios/', list_usuarios, name='list_usuarios'),
 ]
 
-DEBUG = True
\ No newline at end of file
+DEBUG = True
+
+# Con ASGI, las lecturas frecuentes se atienden con las vistas async (vistas_async.py)
+if settings.VISTAS_ASYNC:
+    from .vistas_async import rutas
+    urlpatterns = rutas + urlpatterns
@@ -1,19 +1,40 @@
 from rest_framework import generics,status
 from .models import Categoria, Estado, Prioridad, Servicio, Ticket, DetalleUsuarioTicket, FechaTicket,Usuario
 from apps.autenticacion.models import Departamento, Cargo
+from apps.autenticacion.authentication import AutenticacionPorVistaMixin
+from api.metricas import contar_al_confirmar
+from api.routers import SoloLecturaMixin, solo_lectura
 from apps.autenticacion.serializers import UsuarioSerializer
 from .serializers import (
     DepartamentoSerializer, CargoSerializer, CategoriaSerializer, 
     EstadoSerializer, PrioridadSerializer, ServicioSerializer, 
     TicketSerializer, DetalleUsuarioTicketSerializer, FechaTicketSerializer,
+    TicketMasivoSerializer, TransicionMasivaSerializer,
 )
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 from django.utils import timezone
-from django.shortcuts import get_object_or_404
-from rest_framework.decorators import api_view
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
+from django.conf import settings
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.negotiation import DefaultContentNegotiation
+from django_filters.rest_framework import DjangoFilterBackend
 from .models import Usuario, Ticket
-from django.db.models import Count
+from .catalogos import cache_catalogo, etag_catalogos, sincronizar_version, version_catalogos
+from .conditional import (
+    ConditionalListMixin, agregar_validadores, respuesta_no_modificada, validadores_ticket, version_expandida,
+)
+from .contadores import estadisticas
+from . import eventos, exportacion
+from .operaciones import crear_tickets, transicionar_tickets
+from .filters import TicketFilter, UsuarioFilter
+from .busqueda import BusquedaTickets, busqueda_disponible
+from .serializacion import ListadoRapidoMixin
+from .pagination import BusquedaCursorPagination, TicketCursorPagination, UsuarioCursorPagination
 
 
 # Departamento Views
@@ -71,17 +92,23 @@ class ServicioDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ServicioSerializer
 
 # Ticket Views
-class TicketListCreateView(generics.ListCreateAPIView):
+class TicketListCreateView(AutenticacionPorVistaMixin, ConditionalListMixin, ListadoRapidoMixin,
+                           generics.ListCreateAPIView):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TicketCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TicketFilter
 
     def get_queryset(self):
         user = self.request.user
+        # Columnas, fechas y joins según ?fields= y ?expand=
+        queryset = TicketSerializer.preparar_queryset(Ticket.objects.all(), self.request)
         # Si el usuario es admin, retorna todos los tickets; si no, solo los tickets creados por él X Usuario
         if user.role == 'admin':
-            return Ticket.objects.all()
-        return Ticket.objects.filter(user=user)
+            return queryset
+        return queryset.filter(user=user)
 
     def perform_create(self, serializer):
         # Obtener el usuario autenticado
@@ -95,48 +122,203 @@ class TicketListCreateView(generics.ListCreateAPIView):
 
         # Crear la fecha de creación en FechaTicket
         FechaTicket.objects.create(ticket=serializer.instance, tipo_fecha='Creacion')
+        contar_al_confirmar('api_tickets_creados_total')
+        eventos.publicar_creados([serializer.instance])
+
+
+
+class TicketSearchView(AutenticacionPorVistaMixin, generics.GenericAPIView):
+    """Búsqueda de texto completo (FTS5) en título y comentario, ordenada por relevancia"""
+    serializer_class = TicketSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = BusquedaCursorPagination
+
+    def get(self, request, *args, **kwargs):
+        if not busqueda_disponible():
+            return Response({'detail': 'La búsqueda de texto requiere SQLite con FTS5.'},
+                            status=status.HTTP_501_NOT_IMPLEMENTED)
+        user = request.user
+        busqueda = BusquedaTickets(request.query_params.get('q'), None if user.role == 'admin' else user.pk)
+        if busqueda.consulta is None:
+            return Response({'detail': 'Debe indicar el texto a buscar en ?q=.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        filas = self.paginate_queryset(busqueda)
+        # Los tickets de la página se cargan en una consulta y se devuelven en el orden del ranking
+        queryset = TicketSerializer.preparar_queryset(Ticket.objects.all(), request)
+        tickets = queryset.in_bulk([id_ for id_, _ in filas])
+        pagina = [tickets[id_] for id_, _ in filas if id_ in tickets]
+        return self.get_paginated_response(self.get_serializer(pagina, many=True).data)
+
+
+class PrimerRendererNegotiation(DefaultContentNegotiation):
+    """EventSource pide text/event-stream: los errores (401) se responden con el primer renderer"""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class TicketEventsView(AutenticacionPorVistaMixin, APIView):
+    """
+    Cambios de tickets (creado, actualizado, cerrado) como Server-Sent Events, filtrados por
+    visibilidad; retoma desde Last-Event-ID (o ?ultimo=). Ver eventos.py.
+    """
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = PrimerRendererNegotiation
+
+    def get(self, request, *args, **kwargs):
+        last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('ultimo')
+        if isinstance(request._request, ASGIRequest):
+            contenido = eventos.aflujo(request.user, last_event_id)
+        else:
+            contenido = eventos.flujo(request.user, last_event_id)
+        response = StreamingHttpResponse(contenido, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx no debe acumular el flujo
+        return response
+
+
+class TicketBulkCreateView(AutenticacionPorVistaMixin, generics.GenericAPIView):
+    """
+    Crea una lista de tickets en una sola transacción (bulk_create de Ticket y FechaTicket).
+    Responde el resultado de cada elemento por su índice. Los elementos inválidos se informan
+    y los válidos se crean igual, salvo con ?atomico=1, donde un error cancela todo.
+    """
+    serializer_class = TicketMasivoSerializer
+    permission_classes = [IsAuthenticated]
+    campos_catalogo = {'categoria': Categoria, 'prioridad': Prioridad, 'servicio': Servicio, 'estado': Estado}
+
+    def post(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            return Response({'detail': 'Se espera una lista de tickets.'}, status=status.HTTP_400_BAD_REQUEST)
+        maximo = getattr(settings, 'TICKETS_MASIVO_MAX', 5000)
+        if len(items) > maximo:
+            return Response({'detail': f'Se aceptan hasta {maximo} tickets por solicitud.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Una consulta por catálogo para todos los ids del lote
+        for campo, modelo in self.campos_catalogo.items():
+            cache_catalogo(modelo).precargar(item.get(campo) for item in items if isinstance(item, dict))
+
+        resultados, validos = [], []
+        for indice, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                validos.append((indice, Ticket(user=request.user, **serializer.validated_data)))
+            else:
+                resultados.append({'indice': indice, 'errores': serializer.errors})
+
+        atomico = request.query_params.get('atomico', '').lower() in ('1', 'true', 'si')
+        if validos and not (atomico and resultados):
+            with transaction.atomic():
+                crear_tickets([ticket for _, ticket in validos])
+            resultados.extend({'indice': indice, 'id': ticket.id} for indice, ticket in validos)
+            creados = len(validos)
+        else:
+            creados = 0
+        resultados.sort(key=lambda r: r['indice'])
+
+        if creados == 0:
+            codigo = status.HTTP_400_BAD_REQUEST
+        elif len(resultados) > creados:
+            codigo = status.HTTP_207_MULTI_STATUS
+        else:
+            codigo = status.HTTP_201_CREATED
+        return Response({'creados': creados, 'errores': len(items) - creados, 'resultados': resultados},
+                        status=codigo)
+
+
+class TicketBulkTransitionView(AutenticacionPorVistaMixin, generics.GenericAPIView):
+    """
+    Cambia el estado y/o el usuario de muchos tickets en una transacción: un UPDATE para los
+    tickets y un upsert para las fechas de cierre. Informa los ids omitidos y el motivo.
+    """
+    serializer_class = TransicionMasivaSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == 'admin':
+            return Ticket.objects.all()
+        return Ticket.objects.filter(user=user)
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        datos = serializer.validated_data
+        maximo = getattr(settings, 'TICKETS_MASIVO_MAX', 5000)
+        if len(datos['ids']) > maximo:
+            return Response({'detail': f'Se aceptan hasta {maximo} tickets por solicitud.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            actualizados, omitidos = transicionar_tickets(
+                self.get_queryset(), datos['ids'], estado=datos.get('estado'), usuario=datos.get('user'),
+            )
+        return Response({'actualizados': actualizados, 'omitidos': omitidos}, status=status.HTTP_200_OK)
+
 
+def _estado_inexistente(estado_id):
+    """True si el id es un número sin Estado; lo que no es un id válido lo rechaza el serializer"""
+    try:
+        return cache_catalogo(Estado).por_id(estado_id) is None
+    except (TypeError, ValueError):
+        return False
 
 
 # Vista para manejar GET, PUT, PATCH y DELETE en un ticket específico
-class TicketDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TicketDetailView(AutenticacionPorVistaMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        # Fechas (las mismas que en los listados), columnas y FK de ?expand= en la consulta del ticket
+        return TicketSerializer.preparar_queryset(queryset, self.request)
+
     def retrieve(self, request, *args, **kwargs):
+        # Validación barata: solo la versión del ticket, sin cargarlo ni serializarlo
+        condicional = 'If-None-Match' in request.headers or 'If-Modified-Since' in request.headers
+        catalogos = version_expandida(request)
+        fila = None
+        if condicional:
+            fila = Ticket.objects.filter(pk=kwargs['pk']).values('id', 'version', 'fecha_actualizacion').first()
+        if fila is not None:
+            etag, ultima = validadores_ticket(fila, catalogos)
+            no_modificada = respuesta_no_modificada(request, etag, ultima)
+            if no_modificada is not None:
+                return agregar_validadores(no_modificada, etag, ultima)
+
         ticket = self.get_object()
-        ticket_data = self.get_serializer(ticket).data
-        # Obtener la fecha de creación más reciente de FechaTicket para este ticket
-        fecha_creacion = FechaTicket.objects.filter(ticket=ticket, tipo_fecha='Creacion').order_by('-fecha').first()
-        ticket_data['fecha_creacion'] = fecha_creacion.fecha if fecha_creacion else None
-        return Response(ticket_data, status=status.HTTP_200_OK)
+        response = Response(self.get_serializer(ticket).data, status=status.HTTP_200_OK)
+        etag, ultima = validadores_ticket({'id': ticket.id, 'version': ticket.version,
+                                           'fecha_actualizacion': ticket.fecha_actualizacion}, catalogos)
+        return agregar_validadores(response, etag, ultima)
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
 
-        # Manejar la actualización del estado
+        # Manejar la actualización del estado (resuelto desde la cache de catálogos). Un id
+        # inexistente responde 404; uno que no es un número, el 400 de la validación del serializer
         estado_id = request.data.get('estado')
-        if estado_id:
-            estado_obj = get_object_or_404(Estado, id=estado_id)
-            request.data['estado'] = estado_obj.id
-
-        # Manejar la actualización del usuario
-        user_id = request.data.get('user')
-        if user_id:
-            try:
-                user = Usuario.objects.get(nom_usuario=nom_usuario)
-                request.data['user'] = user.id  # Asegurarse de usar el ID interno para la actualización
-            except Usuario.DoesNotExist:
-                raise ValidationError({"user": "Usuario no encontrado"})
+        if estado_id and _estado_inexistente(estado_id):
+            raise Http404
+
+        # El usuario se resuelve por nom_usuario en el SlugRelatedField del serializer
 
         # Serializar y actualizar el ticket
+        estado_anterior = instance.estado_id
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
 
         # Si el estado cambia a "Cerrado", crea o actualiza la fecha de cierre
-        if estado_obj.nom_estado == "Cerrado":
+        cerrado = False
+        if estado_id and serializer.instance.estado.nom_estado == "Cerrado":
             fecha_cierre, created = FechaTicket.objects.get_or_create(
                 ticket=instance, tipo_fecha='Cierre',
                 defaults={'fecha': timezone.now()}
@@ -144,7 +326,14 @@ class TicketDetailView(generics.RetrieveUpdateDestroyAPIView):
             if not created:
                 fecha_cierre.fecha = timezone.now()
                 fecha_cierre.save()
-
+            if estado_anterior != serializer.instance.estado_id:
+                cerrado = True
+                contar_al_confirmar('api_tickets_cerrados_total')
+
+        cambios = {campo: valor for campo, valor in serializer.validated_data.items()
+                   if campo in serializer.campos_editables}
+        eventos.publicar_al_confirmar([eventos.evento_cambio(instance.pk, cambios, instance.user_id,
+                                                             instance.user_id, cerrado)])
         return Response(serializer.data, status=status.HTTP_200_OK)
     
 # DetalleUsuarioTicket Views
@@ -157,41 +346,109 @@ class DetalleUsuarioTicketDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = DetalleUsuarioTicketSerializer
 
 # FechaTicket Views
+# Las fechas forman parte de la representación del ticket: cada escritura invalida su ETag
 class FechaTicketListCreateView(generics.ListCreateAPIView):
     queryset = FechaTicket.objects.all()
     serializer_class = FechaTicketSerializer
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        Ticket.objects.filter(pk=serializer.instance.ticket_id).marcar_modificados()
+
 class FechaTicketDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = FechaTicket.objects.all()
     serializer_class = FechaTicketSerializer
 
-class ClosedTicketListView(generics.ListAPIView):
-    queryset = Ticket.objects.filter(estado__nom_estado='Cerrado')
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        Ticket.objects.filter(pk=serializer.instance.ticket_id).marcar_modificados()
+
+    def perform_destroy(self, instance):
+        ticket_id = instance.ticket_id
+        super().perform_destroy(instance)
+        Ticket.objects.filter(pk=ticket_id).marcar_modificados()
+
+class ClosedTicketListView(AutenticacionPorVistaMixin, SoloLecturaMixin, ConditionalListMixin, ListadoRapidoMixin,
+                          generics.ListAPIView):
+    queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TicketCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TicketFilter
+
+    def get_queryset(self):
+        # El id del estado sale de la cache: el filtro no necesita el join con Estado
+        cerrado = cache_catalogo(Estado).por_nombre('Cerrado')
+        queryset = Ticket.objects.filter(estado=cerrado.id) if cerrado is not None else Ticket.objects.none()
+        return TicketSerializer.preparar_queryset(queryset, self.request)
 
 
 @api_view(['GET'])
+@solo_lectura
 def dashboard_stats(request):
-    usuarios_totales = Usuario.objects.count()
-    tickets_totales = Ticket.objects.count()
-    tickets_abiertos = Ticket.objects.filter(estado__nom_estado="Abierto").count()
-    tickets_cerrados = Ticket.objects.filter(estado__nom_estado="Cerrado").count()
-    tickets_pendientes = Ticket.objects.filter(estado__nom_estado="Pendiente").count()
-    # Agrega más estadísticas según necesites
-
-    data = {
-        "usuarios_totales": usuarios_totales,
-        "tickets_totales": tickets_totales,
-        "tickets_abiertos": tickets_abiertos,
-        "tickets_cerrados": tickets_cerrados,
-        "tickets_pendientes": tickets_pendientes,
-        # Agrega otros datos aquí
+    # Un aggregate() con conteos condicionales, o la tabla de contadores si DASHBOARD_CONTADORES está activo
+    return Response(estadisticas())
+
+def catalogos_serializados(version):
+    """Cuerpo de /catalogos/ desde la cache de catálogos del proceso, vigente para `version`"""
+    sincronizar_version(version)
+    return {
+        'version': etag_catalogos(version).strip('"'),
+        'categorias': CategoriaSerializer(cache_catalogo(Categoria).todos(), many=True).data,
+        'prioridades': PrioridadSerializer(cache_catalogo(Prioridad).todos(), many=True).data,
+        'estados': EstadoSerializer(cache_catalogo(Estado).todos(), many=True).data,
+        'servicios': ServicioSerializer(cache_catalogo(Servicio).todos(), many=True).data,
     }
-    return Response(data)
 
 @api_view(['GET'])
+def catalogos(request):
+    # Todos los catálogos en una respuesta; solo se consulta la versión, los datos salen de la cache
+    version = version_catalogos()
+    etag = etag_catalogos(version)
+    # Comparación débil: la compresión convierte el ETag en W/"..."
+    if etag in [e.removeprefix('W/') for e in parse_etags(request.headers.get('If-None-Match', ''))]:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(catalogos_serializados(version))
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+@api_view(['GET'])
+@solo_lectura
 def list_usuarios(request):
-    usuarios = Usuario.objects.all()
+    filtro = UsuarioFilter(request.query_params, queryset=Usuario.objects.all(), request=request)
+    if not filtro.is_valid():
+        return Response(filtro.errors, status=status.HTTP_400_BAD_REQUEST)
+    usuarios = filtro.qs
+    paginator = UsuarioCursorPagination()
+    pagina = paginator.paginate_queryset(usuarios, request)
+    if pagina is not None:
+        return paginator.get_paginated_response(UsuarioSerializer(pagina, many=True).data)
     serializer = UsuarioSerializer(usuarios, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    return Response(serializer.data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exportar_tickets(request):
+    # Respuesta en streaming: filas leídas por bloques con iterator(), sin armar la lista completa
+    params = request.query_params
+    formato = params.get('formato', 'csv')
+    if formato not in exportacion.FORMATOS:
+        return Response({'detail': f"Formato no soportado: {formato}"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        desde = exportacion.parse_fecha(params.get('desde'))
+        hasta = exportacion.parse_fecha(params.get('hasta'), fin=True)
+        estado = exportacion.resolver_estado(params['estado']) if params.get('estado') else None
+    except ValueError as error:
+        return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    queryset = Ticket.objects.all()
+    if request.user.role != 'admin':
+        queryset = queryset.filter(user=request.user)
+    filas = exportacion.filas_exportacion(queryset, desde=desde, hasta=hasta, estado=estado)
+    tipo = 'text/csv; charset=utf-8' if formato == 'csv' else 'application/x-ndjson; charset=utf-8'
+    response = StreamingHttpResponse(exportacion.lineas(formato, filas), content_type=tipo)
+    response['Content-Disposition'] = f'attachment; filename="tickets.{formato}"'
+    return response
@@ -0,0 +1,194 @@
+"""
+Versiones async (ASGI) de las lecturas más frecuentes: listado, detalle y cerrados de
+tickets, estadísticas del dashboard y catálogos. Se activan con VISTAS_ASYNC (settings),
+que api/asgi.py enciende por defecto, y se montan delante de las rutas sync.
+
+Reutilizan las piezas de DRF de la vista sync (autenticadores, permisos, filtros,
+paginación, renderer y manejo de errores), pero las consultas van por el ORM async y el
+JWT con claims se valida en el event loop: una solicitud típica no ocupa el hilo de la
+base más que durante sus consultas. Devuelven un HttpResponse ya renderizado, que Django
+no vuelve a pasar por sync_to_async.
+
+Lo que no tiene versión async se delega a la vista sync (en sync_to_async) con el mismo
+resultado: métodos distintos de GET, ?expand=, el renderer navegable, autenticación que
+necesita la base (Knox, sesión, Basic) y cualquier parámetro que la vista sync rechace.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.urls import path
+from django.utils.http import parse_etags
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from api.routers import alectura_permitida, modo_lectura
+from apps.autenticacion.authentication import JWTClaimsAuthentication
+from .catalogos import aversion_catalogos, etag_catalogos
+from .conditional import (
+    COLUMNAS_VALIDADORES, agregar_validadores, respuesta_no_modificada, validadores_lista, validadores_ticket,
+)
+from .contadores import estadisticas
+from .models import Ticket
+from .serializacion import SerializadorFilas, serializacion_rapida_activa
+from .serializers import TicketSerializer
+from .views import (
+    ClosedTicketListView, TicketDetailView, TicketListCreateView, catalogos, catalogos_serializados, dashboard_stats,
+)
+
+
+async def autenticar(request):
+    """
+    request.user de DRF. Si el primer autenticador es JWTClaimsAuthentication y el token trae
+    los claims, sin salir del event loop; si no, los autenticadores corren en sync_to_async.
+    """
+    autenticadores = request.authenticators
+    if autenticadores and isinstance(autenticadores[0], JWTClaimsAuthentication):
+        try:
+            resultado = autenticadores[0].autenticar_sin_base(request)
+        except APIException:
+            request._not_authenticated()
+            raise
+        if resultado is not None:
+            request._authenticator = autenticadores[0]
+            request.user, request.auth = resultado
+            return
+    await sync_to_async(lambda: request.user)()
+
+
+def respuesta_renderizada(request, response):
+    """HttpResponse con el contenido y las cabeceras de la Response de DRF"""
+    if not isinstance(response, Response):
+        return response
+    inicio = time.perf_counter()
+    response.render()
+    medicion = getattr(request, '_medicion', None)  # InstrumentacionMiddleware
+    if medicion is not None:
+        medicion.tiempo_render += time.perf_counter() - inicio
+    respuesta = HttpResponse(response.content, status=response.status_code)
+    for nombre, valor in response.items():
+        respuesta[nombre] = valor
+    return respuesta
+
+
+def vista_async(clase, manejador, delegar=None):
+    """
+    Vista async para GET de `clase` (una APIView de DRF, o la .cls de una vista @api_view):
+    el ciclo de APIView.dispatch() con `manejador(vista, request, **kwargs)` como handler.
+    `delegar(request)` indica las solicitudes que debe atender la vista sync.
+    """
+    vista_sync = sync_to_async(clase.as_view())
+
+    async def vista(request, *args, **kwargs):
+        if request.method != 'GET':
+            return await vista_sync(request, *args, **kwargs)
+        drf = clase()
+        drf.setup(request, *args, **kwargs)
+        request = drf.initialize_request(request, *args, **kwargs)
+        drf.request = request
+        drf.headers = drf.default_response_headers
+        try:
+            drf.format_kwarg = drf.get_format_suffix(**kwargs)
+            renderer, _ = drf.perform_content_negotiation(request)
+            if renderer.format != 'json' or (delegar is not None and delegar(request)):
+                return await vista_sync(request._request, *args, **kwargs)
+        except APIException:
+            # 406, o parámetros inválidos: la vista sync responde el error en su orden
+            return await vista_sync(request._request, *args, **kwargs)
+
+        try:
+            await autenticar(request)
+            drf.initial(request, *args, **kwargs)
+            response = await manejador(drf, request, *args, **kwargs)
+        except Exception as exc:
+            response = drf.handle_exception(exc)
+        response = drf.finalize_response(request, response, *args, **kwargs)
+        return respuesta_renderizada(request._request, response)
+
+    # Mismo nombre en las métricas que la vista sync (api.middleware.nombre_vista)
+    vista.view_class = clase
+    return csrf_exempt(vista)
+
+
+def con_expand(request):
+    return not serializacion_rapida_activa(request)
+
+
+async def _listar(vista, request, queryset):
+    # ConditionalListMixin + ListadoRapidoMixin con el ORM async
+    campos, _ = TicketSerializer.campos_solicitados(request)
+    serializador = SerializadorFilas(campos)
+    queryset = serializador.preparar(vista.filter_queryset(queryset), *COLUMNAS_VALIDADORES)
+    pagina = await vista.paginator.apaginate_queryset(queryset, request, vista)
+    filas = pagina if pagina is not None else [fila async for fila in queryset]
+    etag, ultima = validadores_lista(request, filas)
+    no_modificada = respuesta_no_modificada(request, etag, ultima)
+    if no_modificada is not None:
+        return agregar_validadores(no_modificada, etag, ultima)
+
+    if pagina is not None:
+        response = vista.get_paginated_response(serializador.serializar(pagina))
+    else:
+        response = Response(serializador.serializar(filas))
+    return agregar_validadores(response, etag, ultima)
+
+
+async def listar_tickets(vista, request, *args, **kwargs):
+    return await _listar(vista, request, vista.get_queryset())
+
+
+async def listar_cerrados(vista, request, *args, **kwargs):
+    # get_queryset() resuelve el estado en la cache de catálogos, que puede consultar la base
+    return await _listar(vista, request, await sync_to_async(vista.get_queryset)())
+
+
+async def detalle_ticket(vista, request, *args, **kwargs):
+    """
+    TicketDetailView.retrieve() en una consulta: las columnas de los campos pedidos, las
+    fechas (con_fechas, como en los listados) y los validadores.
+    """
+    campos, _ = TicketSerializer.campos_solicitados(request)
+    serializador = SerializadorFilas(campos)
+    queryset = serializador.preparar(vista.get_queryset().filter(pk=kwargs['pk']), *COLUMNAS_VALIDADORES)
+    fila = await queryset.afirst()
+    if fila is None:
+        raise Http404(f'No {Ticket._meta.object_name} matches the given query.')
+
+    etag, ultima = validadores_ticket(fila)
+    no_modificada = respuesta_no_modificada(request, etag, ultima)
+    if no_modificada is not None:
+        return agregar_validadores(no_modificada, etag, ultima)
+    datos = serializador.serializar([fila])[0]
+    return agregar_validadores(Response(datos, status=status.HTTP_200_OK), etag, ultima)
+
+
+async def estadisticas_dashboard(vista, request, *args, **kwargs):
+    # @solo_lectura: el ContextVar del modo lectura pasa al hilo de sync_to_async
+    with modo_lectura(await alectura_permitida(request)):
+        return Response(await sync_to_async(estadisticas)())
+
+
+async def catalogos_completos(vista, request, *args, **kwargs):
+    version = await aversion_catalogos()
+    etag = etag_catalogos(version)
+    if etag in [e.removeprefix('W/') for e in parse_etags(request.headers.get('If-None-Match', ''))]:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        # La cache de catálogos es sync: con la cache caliente no consulta la base
+        response = Response(await sync_to_async(catalogos_serializados)(version))
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+# Se anteponen a apps/tickets/urls.py con VISTAS_ASYNC: mismas rutas y nombres
+rutas = [
+    path('catalogos/', vista_async(catalogos.cls, catalogos_completos), name='catalogos'),
+    path('tickets/', vista_async(TicketListCreateView, listar_tickets, con_expand), name='ticket-list-create'),
+    path('tickets/<int:pk>/', vista_async(TicketDetailView, detalle_ticket, con_expand), name='ticket-detail'),
+    path('tickets-cerrados/', vista_async(ClosedTicketListView, listar_cerrados, con_expand),
+         name='tickets-cerrados'),
+    path('api/dashboard/stats/', vista_async(dashboard_stats.cls, estadisticas_dashboard), name='dashboard-stats'),
+]
@@ -0,0 +1,8 @@
+"""
+Benchmarks de la API. Se ejecutan desde Backend/api_ticket, por ejemplo:
+
+    python -m benchmarks.auth
+
+Cada benchmark crea una base de datos temporal (la de pruebas de Django), así que
+nunca toca db.sqlite3.
+"""
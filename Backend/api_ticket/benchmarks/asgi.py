@@ -0,0 +1,207 @@
+"""
+Capacidad con conexiones concurrentes: las vistas async bajo ASGIHandler contra las vistas
+sync bajo WSGIHandler con un pool fijo de hilos (como gunicorn --threads), en el mismo
+proceso y sobre la misma base SQLite en archivo. Sin servidor HTTP (ni uvicorn): cada
+cliente es una tarea asyncio que llama a la aplicación ASGI, o que envía la solicitud
+WSGI al pool y espera su respuesta.
+
+--espera-ms simula el tiempo de red de cada solicitud (un cliente lento enviando la
+solicitud). Con WSGI ese tiempo ocupa un hilo del pool; con ASGI es un await. Informa
+solicitudes por segundo, latencias (incluye la espera en la cola del pool) y errores por
+nivel de concurrencia, y las adaptaciones sync/async de la cadena de middleware (0 si
+toda la cadena corre en el event loop).
+
+    python -m benchmarks.asgi [--clientes 1,8,32,128] [--hilos 8] [--duracion 3] [--espera-ms 10]
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from .base import base_temporal, configurar_django, imprimir_tabla, percentil
+from .datos import sembrar
+
+
+def rutas(ids):
+    return [
+        '/tickets/?page_size=50',
+        f"/tickets/{ids['ticket']}/",
+        '/tickets-cerrados/?page_size=50',
+        '/api/dashboard/stats/',
+        '/catalogos/',
+    ]
+
+
+class Adaptaciones(logging.Handler):
+    """Cuenta los 'handler adapted' de BaseHandler.load_middleware"""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.total = 0
+
+    def emit(self, record):
+        if 'adapted' in record.getMessage():
+            self.total += 1
+
+
+def aplicacion_asgi(credencial, espera):
+    from django.core.handlers.asgi import ASGIHandler
+
+    handler = ASGIHandler()
+
+    async def solicitud(ruta):
+        ruta, _, query = ruta.partition('?')
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': ruta, 'raw_path': ruta.encode(), 'query_string': query.encode(),
+            'root_path': '', 'headers': [(b'host', b'testserver'), (b'authorization', credencial.encode())],
+            'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        enviada = False
+        codigo = None
+
+        async def receive():
+            nonlocal enviada
+            if not enviada:
+                enviada = True
+                if espera:
+                    await asyncio.sleep(espera)
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await asyncio.Event().wait()  # el cliente no se desconecta
+
+        async def send(mensaje):
+            nonlocal codigo
+            if mensaje['type'] == 'http.response.start':
+                codigo = mensaje['status']
+
+        await handler(scope, receive, send)
+        return codigo
+
+    return solicitud
+
+
+def aplicacion_wsgi(credencial, espera, hilos):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+    pool = ThreadPoolExecutor(max_workers=hilos)
+
+    def atender(ruta):
+        if espera:
+            time.sleep(espera)
+        ruta, _, query = ruta.partition('?')
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': ruta, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+            'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'testserver', 'HTTP_AUTHORIZATION': credencial, 'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.input': BytesIO(b''), 'wsgi.errors': BytesIO(), 'wsgi.url_scheme': 'http',
+            'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+        }
+        estado = []
+        response = handler(environ, lambda status, headers, exc_info=None: estado.append(status))
+        try:
+            for _ in response:
+                pass
+        finally:
+            response.close()
+        return int(estado[0].split()[0])
+
+    async def solicitud(ruta):
+        return await asyncio.get_running_loop().run_in_executor(pool, atender, ruta)
+
+    return solicitud
+
+
+async def cargar(solicitud, rutas_caso, clientes, duracion):
+    latencias, errores = [], 0
+    fin = time.monotonic() + duracion
+
+    async def cliente(indice):
+        nonlocal errores
+        i = indice
+        while time.monotonic() < fin:
+            inicio = time.perf_counter()
+            codigo = await solicitud(rutas_caso[i % len(rutas_caso)])
+            latencias.append(time.perf_counter() - inicio)
+            errores += codigo >= 400
+            i += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(i) for i in range(clientes)))
+    return latencias, errores, time.perf_counter() - inicio
+
+
+def trabajador(modo, credencial, rutas_caso, args, cola):
+    from django.conf import settings
+
+    logging.getLogger('api.middleware').setLevel(logging.ERROR)  # con carga todas son "lentas"
+    # Las rutas async se montan al importar las urls, que aún no se cargaron en este proceso
+    settings.VISTAS_ASYNC = modo == 'asgi'
+    adaptaciones = Adaptaciones()
+    logging.getLogger('django.request').addHandler(adaptaciones)
+    logging.getLogger('django.request').setLevel(logging.DEBUG)
+    espera = args.espera_ms / 1000
+    if modo == 'asgi':
+        solicitud = aplicacion_asgi(credencial, espera)
+    else:
+        solicitud = aplicacion_wsgi(credencial, espera, args.hilos)
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+    filas = []
+    asyncio.run(cargar(solicitud, rutas_caso, 1, 0.5))  # calentamiento
+    for clientes in args.clientes:
+        latencias, errores, total = asyncio.run(cargar(solicitud, rutas_caso, clientes, args.duracion))
+        filas.append({
+            'modo': 'ASGI (async)' if modo == 'asgi' else f'WSGI ({args.hilos} hilos)',
+            'clientes': clientes,
+            'solicitudes/s': round(len(latencias) / total, 1),
+            'p50 ms': round(percentil(latencias, 50) * 1000, 1),
+            'p95 ms': round(percentil(latencias, 95) * 1000, 1),
+            'errores': errores,
+            'adaptaciones': adaptaciones.total,
+        })
+    cola.put(filas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clientes', type=lambda v: [int(c) for c in v.split(',')], default=[1, 8, 32, 128])
+    parser.add_argument('--hilos', type=int, default=8, help='hilos del pool WSGI')
+    parser.add_argument('--duracion', type=float, default=3, help='segundos por nivel de concurrencia')
+    parser.add_argument('--espera-ms', type=float, default=10, help='tiempo de red simulado por solicitud')
+    parser.add_argument('--tickets', type=int, default=2000)
+    args = parser.parse_args()
+
+    configurar_django()
+    from django.db import connections
+
+    from apps.autenticacion.models import Usuario
+    from apps.autenticacion.serializers import CustomTokenObtainPairSerializer
+    from apps.tickets.catalogos import invalidar_caches
+
+    with tempfile.TemporaryDirectory() as directorio, base_temporal(os.path.join(directorio, 'bench.sqlite3')):
+        invalidar_caches()
+        ids = sembrar(usuarios=10, tickets=args.tickets)
+        credencial = f"Bearer {CustomTokenObtainPairSerializer.get_token(Usuario.objects.get(pk=ids['admin'])).access_token}"
+        connections.close_all()  # cada proceso abre su propia conexión
+
+        contexto = multiprocessing.get_context('fork')
+        filas = []
+        for modo in ('wsgi', 'asgi'):
+            cola = contexto.Queue()
+            proceso = contexto.Process(target=trabajador, args=(modo, credencial, rutas(ids), args, cola))
+            proceso.start()
+            filas.extend(cola.get())
+            proceso.join()
+
+    imprimir_tabla(sorted(filas, key=lambda f: (f['clientes'], f['modo'])),
+                   ['clientes', 'modo', 'solicitudes/s', 'p50 ms', 'p95 ms', 'errores', 'adaptaciones'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Costo de autenticación por request: orden anterior de autenticadores (Knox, Session,
+Basic y JWT que busca el Usuario en la base), JWT primero (el valor por defecto, que sigue
+cargando el usuario) y JWTClaimsAuthentication primero (las lecturas de
+settings.AUTENTICACION_VISTAS).
+
+    python -m benchmarks.auth [--repeticiones 2000]
+"""
+import argparse
+
+from .base import base_temporal, configurar_django, contar_consultas, imprimir_tabla, medir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=2000)
+    args = parser.parse_args()
+
+    configurar_django()
+    from django.contrib.auth.models import AnonymousUser
+    from knox.auth import TokenAuthentication
+    from rest_framework.authentication import BasicAuthentication, SessionAuthentication
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+
+    from apps.autenticacion.authentication import JWTClaimsAuthentication
+    from apps.autenticacion.models import Usuario
+    from apps.autenticacion.serializers import CustomTokenObtainPairSerializer
+
+    modos = {
+        'antes (knox, session, basic, jwt)': [TokenAuthentication, SessionAuthentication,
+                                              BasicAuthentication, JWTAuthentication],
+        'por defecto (jwt primero)': [JWTAuthentication, TokenAuthentication,
+                                      SessionAuthentication, BasicAuthentication],
+        'lecturas (jwt por claims primero)': [JWTClaimsAuthentication, TokenAuthentication,
+                                             SessionAuthentication, BasicAuthentication],
+    }
+
+    with base_temporal():
+        usuario = Usuario.objects.create_user(
+            rut_usuario=12345678, dv_rut_usuario='5', correo='bench@test.cl',
+            nom_usuario='bench', password='clave-segura',
+        )
+        token = str(CustomTokenObtainPairSerializer.get_token(usuario).access_token)
+        factory = APIRequestFactory()
+
+        filas = []
+        for nombre, clases in modos.items():
+            def autenticar():
+                django_request = factory.get('/tickets/', HTTP_AUTHORIZATION=f'Bearer {token}')
+                django_request.user = AnonymousUser()  # lo que deja AuthenticationMiddleware sin sesión
+                request = Request(django_request, authenticators=[clase() for clase in clases])
+                assert request.user.pk == usuario.pk
+
+            fila = {'modo': nombre, 'consultas': contar_consultas(autenticar)}
+            fila.update(medir(autenticar, args.repeticiones))
+            filas.append(fila)
+
+    imprimir_tabla(filas, ['modo', 'consultas', 'media_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+
+
+if __name__ == '__main__':
+    main()
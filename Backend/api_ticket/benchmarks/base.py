@@ -0,0 +1,123 @@
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def configurar_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def base_temporal(nombre=None):
+    """
+    Crea la base de pruebas de Django, la deja activa y la elimina al terminar. Con SQLite
+    es en memoria salvo que se indique el nombre de un archivo (necesario entre procesos).
+    """
+    from django.db import DEFAULT_DB_ALIAS, connection, connections
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    nombre_original = connection.settings_dict['NAME']
+    if nombre is not None:
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = nombre
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    # Los espejos de default (el alias de lectura) apuntan a la base temporal, como en los tests
+    espejos = {alias: connections[alias].settings_dict for alias in connections
+               if connections[alias].settings_dict.get('TEST', {}).get('MIRROR') == DEFAULT_DB_ALIAS}
+    for alias in espejos:
+        connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+    try:
+        yield
+    finally:
+        for alias, ajustes in espejos.items():
+            connections[alias].close()
+            connections[alias].settings_dict = ajustes
+        connection.creation.destroy_test_db(nombre_original, verbosity=0)
+        teardown_test_environment()
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def resumir(duraciones):
+    """Estadísticas en milisegundos de una lista de duraciones en segundos"""
+    ms = [d * 1000 for d in duraciones]
+    return {
+        'n': len(ms),
+        'media_ms': round(statistics.fmean(ms), 4),
+        'p50_ms': round(percentil(ms, 50), 4),
+        'p95_ms': round(percentil(ms, 95), 4),
+        'p99_ms': round(percentil(ms, 99), 4),
+    }
+
+
+def medir(funcion, repeticiones, calentamiento=10):
+    for _ in range(calentamiento):
+        funcion()
+    duraciones = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duraciones.append(time.perf_counter() - inicio)
+    return resumir(duraciones)
+
+
+def contar_consultas(funcion):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as consultas:
+        funcion()
+    return len(consultas)
+
+
+def imprimir_tabla(filas, columnas):
+    anchos = [max(len(str(c)), *(len(str(f.get(c, ''))) for f in filas)) for c in columnas]
+    print('  '.join(str(c).ljust(a) for c, a in zip(columnas, anchos)))
+    for fila in filas:
+        print('  '.join(str(fila.get(c, '')).ljust(a) for c, a in zip(columnas, anchos)))
+
+
+def medir_memoria(funcion):
+    """Pico de memoria asignada (KiB) durante una llamada, según tracemalloc"""
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        funcion()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def comparar_resultados(anteriores, actuales, umbral=0.2, minimo_ms=0.5):
+    """
+    Compara dos corridas por nombre de caso. Es regresión que la p50 o el pico de memoria
+    crezcan más que el umbral (y la p50 al menos minimo_ms, para no reportar ruido) o que
+    aumente el número de consultas.
+    """
+    previos = {r['nombre']: r for r in anteriores}
+    filas = []
+    for actual in actuales:
+        previo = previos.get(actual['nombre'])
+        if previo is None:
+            continue
+        fila = {'nombre': actual['nombre'], 'regresion': []}
+        for campo in ('p50_ms', 'memoria_kb', 'consultas'):
+            antes, despues = previo[campo], actual[campo]
+            fila[campo] = f'{antes} -> {despues}'
+            if campo == 'consultas':
+                peor = despues > antes
+            else:
+                peor = despues > antes * (1 + umbral) and (campo != 'p50_ms' or despues - antes >= minimo_ms)
+            if peor:
+                fila['regresion'].append(campo)
+        fila['regresion'] = ','.join(fila['regresion'])
+        filas.append(fila)
+    return filas
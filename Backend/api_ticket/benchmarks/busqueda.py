@@ -0,0 +1,83 @@
+"""
+Búsqueda de tickets: filtro icontains (recorre la tabla) contra el índice FTS5 de
+/tickets/buscar/, primera página de 50 resultados ordenados por relevancia.
+
+El texto usa un vocabulario con distribución de Zipf, como el lenguaje natural. El costo
+de FTS5 depende de cuántas coincidencias se puntúan (como máximo BUSQUEDA_MAX_CANDIDATOS),
+no del tamaño de la tabla; icontains sin coincidencias suficientes recorre la tabla entera.
+
+    python -m benchmarks.busqueda [--tickets 1000000] [--repeticiones 50]
+"""
+import argparse
+import random
+
+from .base import base_temporal, configurar_django, imprimir_tabla, medir
+
+PALABRAS = ('error', 'acceso', 'correo', 'red', 'servidor', 'clave', 'pantalla', 'impresora', 'lento',
+            'caído', 'instalar', 'actualizar', 'licencia', 'respaldo', 'teclado', 'vpn')
+VOCABULARIO = PALABRAS + tuple(f'termino{i}' for i in range(20000))
+PESOS = [1 / rango for rango in range(1, len(VOCABULARIO) + 1)]
+CONSULTAS = ('error', 'impresora', 'servidor caído', 'vpn licen', 'termino5000', 'inexistente')
+
+
+def poblar(cantidad, lote=20000):
+    from django.db import transaction
+
+    from apps.autenticacion.models import Usuario
+    from apps.tickets.models import Categoria, Estado, Prioridad, Servicio, Ticket
+
+    usuario = Usuario.objects.create_user(
+        rut_usuario=12345678, dv_rut_usuario='5', correo='bench@test.cl',
+        nom_usuario='bench', password='clave-segura', role='admin',
+    )
+    categoria = Categoria.objects.create(nom_categoria='General')
+    comunes = {
+        'categoria': categoria, 'prioridad': Prioridad.objects.create(num_prioridad='1'),
+        'servicio': Servicio.objects.create(titulo_servicio='Soporte', costo=0, categoria=categoria),
+        'estado': Estado.objects.create(nom_estado='Abierto'), 'user': usuario,
+    }
+    azar = random.Random(1)
+    for inicio in range(0, cantidad, lote):
+        with transaction.atomic():
+            Ticket.objects.bulk_create(
+                Ticket(titulo=' '.join(azar.choices(VOCABULARIO, PESOS, k=4)),
+                       comentario=' '.join(azar.choices(VOCABULARIO, PESOS, k=20)), **comunes)
+                for _ in range(min(lote, cantidad - inicio))
+            )
+    return usuario
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickets', type=int, default=100000)
+    parser.add_argument('--repeticiones', type=int, default=50)
+    args = parser.parse_args()
+
+    configurar_django()
+    from django.db.models import Q
+
+    from apps.tickets.busqueda import BusquedaTickets
+    from apps.tickets.models import Ticket
+
+    with base_temporal():
+        poblar(args.tickets)
+        filas = []
+        for texto in CONSULTAS:
+            busqueda = BusquedaTickets(texto)
+            palabra = texto.split()[-1]
+
+            def con_like():
+                list(Ticket.objects.filter(Q(titulo__icontains=palabra) | Q(comentario__icontains=palabra))
+                     .values_list('id', flat=True)[:50])
+
+            coincidencias = len(BusquedaTickets(texto, max_candidatos=args.tickets).pagina(None, args.tickets))
+            filas.append({'consulta': texto, 'coincidencias': coincidencias, 'modo': 'icontains',
+                          **medir(con_like, args.repeticiones, 2)})
+            filas.append({'consulta': texto, 'coincidencias': coincidencias, 'modo': 'fts5 bm25',
+                          **medir(lambda: busqueda.pagina(None, 50), args.repeticiones, 2)})
+
+    imprimir_tabla(filas, ['consulta', 'coincidencias', 'modo', 'media_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Escritores y lectores concurrentes contra /tickets/ en procesos separados, sobre una
+base SQLite en archivo: con las opciones por defecto de Django (journal de rollback,
+BEGIN diferido) y con las de api/sqlite.py (BEGIN IMMEDIATE, busy_timeout, mmap) más el
+modo WAL que fija `manage.py activar_wal`.
+
+Cada escritor alterna POST /tickets/ y POST /tickets/masivo/transicion/ (lee y escribe
+en una transacción); cada lector pide páginas de GET /tickets/. Informa solicitudes por
+segundo, latencias y errores "database is locked".
+
+    python -m benchmarks.concurrencia [--escritores 4] [--lectores 4] [--duracion 5] [--tickets 2000]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from .base import base_temporal, configurar_django, imprimir_tabla, percentil
+from .datos import sembrar
+
+
+def trabajador(rol, indice, credencial, ids, duracion, cola):
+    from django.db import OperationalError
+    from rest_framework.test import APIClient
+
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)  # los bloqueos se cuentan, no se imprimen
+    azar = random.Random(indice)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=credencial)
+    resultado = {'rol': rol, 'ok': 0, 'bloqueos': 0, 'errores': 0, 'latencias': []}
+    fin = time.monotonic() + duracion
+    while time.monotonic() < fin:
+        inicio = time.perf_counter()
+        try:
+            if rol == 'lector':
+                response = client.get('/tickets/?page_size=50')
+            elif azar.random() < 0.5:
+                response = client.post('/tickets/', {
+                    'titulo': 'Concurrente', 'categoria': ids['categoria'], 'prioridad': ids['prioridad'],
+                    'servicio': ids['servicio'], 'estado': ids['estado']}, format='json')
+            else:
+                response = client.post('/tickets/masivo/transicion/', {
+                    'ids': azar.sample(ids['tickets'], 5),
+                    'estado': azar.choice((ids['estado'], ids['cerrado']))}, format='json')
+        except OperationalError as error:
+            resultado['bloqueos' if 'locked' in str(error) else 'errores'] += 1
+            continue
+        resultado['latencias'].append(time.perf_counter() - inicio)
+        if response.status_code < 400:
+            resultado['ok'] += 1
+        else:
+            resultado['errores'] += 1
+    cola.put(resultado)
+
+
+def correr(modo, opciones, wal, args):
+    from django.db import connection, connections
+
+    from apps.autenticacion.models import Usuario
+    from apps.autenticacion.serializers import CustomTokenObtainPairSerializer
+    from apps.tickets.catalogos import invalidar_caches
+    from api.sqlite import activar_wal
+
+    connection.settings_dict['OPTIONS'] = opciones
+    with tempfile.TemporaryDirectory() as directorio, base_temporal(os.path.join(directorio, 'bench.sqlite3')):
+        invalidar_caches()
+        if wal:
+            with connection.cursor() as cursor:
+                activar_wal(cursor)
+        ids = sembrar(usuarios=10, tickets=args.tickets)
+        credencial = f"Bearer {CustomTokenObtainPairSerializer.get_token(Usuario.objects.get(pk=ids['admin'])).access_token}"
+        connections.close_all()  # cada proceso abre su propia conexión
+
+        contexto = multiprocessing.get_context('fork')
+        cola = contexto.Queue()
+        roles = ['escritor'] * args.escritores + ['lector'] * args.lectores
+        procesos = [contexto.Process(target=trabajador, args=(rol, i, credencial, ids, args.duracion, cola))
+                    for i, rol in enumerate(roles)]
+        for proceso in procesos:
+            proceso.start()
+        resultados = [cola.get() for _ in procesos]
+        for proceso in procesos:
+            proceso.join()
+
+    fila = {'modo': modo}
+    for rol, nombre in (('escritor', 'escrituras'), ('lector', 'lecturas')):
+        propios = [r for r in resultados if r['rol'] == rol]
+        latencias = [l for r in propios for l in r['latencias']]
+        fila[f'{nombre}/s'] = round(sum(r['ok'] for r in propios) / args.duracion, 1)
+        fila[f'p95 {nombre} ms'] = round(percentil(latencias, 95) * 1000, 1) if latencias else '-'
+    fila['bloqueos'] = sum(r['bloqueos'] for r in resultados)
+    fila['errores'] = sum(r['errores'] for r in resultados)
+    return fila
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--escritores', type=int, default=4)
+    parser.add_argument('--lectores', type=int, default=4)
+    parser.add_argument('--duracion', type=float, default=5, help='segundos por modo')
+    parser.add_argument('--tickets', type=int, default=2000)
+    args = parser.parse_args()
+
+    configurar_django()
+    from django.conf import settings
+
+    modos = {
+        'por defecto (journal, BEGIN)': ({}, False),
+        'ajustada (WAL, IMMEDIATE)': (settings.DATABASES['default']['OPTIONS'], True),
+    }
+    filas = [correr(modo, opciones, wal, args) for modo, (opciones, wal) in modos.items()]
+    imprimir_tabla(filas, ['modo', 'escrituras/s', 'p95 escrituras ms', 'lecturas/s', 'p95 lecturas ms',
+                           'bloqueos', 'errores'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Datos sintéticos para los benchmarks: catálogos, usuarios, tickets con sus fechas de
+creación y cierre, y detalles usuario-ticket, en volúmenes configurables y reproducibles
+(misma semilla, mismos datos). Inserta por lotes y sin pasar por las vistas.
+"""
+import random
+from datetime import timedelta
+
+CONTRASENA = 'clave-segura'
+RUT_ADMIN = 11111111
+RUT_USUARIO = 11111112
+PALABRAS = ('impresora', 'correo', 'red', 'servidor', 'clave', 'pantalla', 'teclado', 'licencia',
+            'respaldo', 'acceso', 'lento', 'caído', 'error', 'instalar', 'actualizar', 'vpn')
+
+
+def sembrar(usuarios=50, tickets=5000, detalles_por_ticket=1, proporcion_cerrados=0.4, semilla=1, lote=10000):
+    """Crea los datos y devuelve ids de referencia para armar las URL de los benchmarks"""
+    from django.contrib.auth.hashers import make_password
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    from apps.autenticacion.models import Cargo, Departamento, Usuario
+    from apps.tickets.contadores import reconstruir
+    from apps.tickets.models import (
+        Categoria, DetalleUsuarioTicket, Estado, FechaTicket, Prioridad, Servicio, Ticket,
+    )
+
+    azar = random.Random(semilla)
+    with transaction.atomic():
+        departamentos = Departamento.objects.bulk_create(
+            Departamento(nom_departamento=f'Departamento {i}') for i in range(5))
+        cargos = Cargo.objects.bulk_create(
+            Cargo(nom_cargo=f'Cargo {i}', departamento=departamentos[i % 5]) for i in range(10))
+        categorias = Categoria.objects.bulk_create(Categoria(nom_categoria=f'Categoría {i}') for i in range(6))
+        prioridades = Prioridad.objects.bulk_create(Prioridad(num_prioridad=str(i)) for i in range(1, 5))
+        servicios = Servicio.objects.bulk_create(
+            Servicio(titulo_servicio=f'Servicio {i}', costo=azar.randrange(1000, 100000), categoria=categorias[i % 6])
+            for i in range(10))
+        abierto, pendiente, cerrado = Estado.objects.bulk_create(
+            Estado(nom_estado=nombre) for nombre in ('Abierto', 'Pendiente', 'Cerrado'))
+
+        # Una sola derivación de la contraseña para todos los usuarios
+        clave = make_password(CONTRASENA)
+        ruts = [RUT_ADMIN, RUT_USUARIO] + [20000000 + i for i in range(max(usuarios - 2, 0))]
+        Usuario.objects.bulk_create(
+            Usuario(rut_usuario=rut, dv_rut_usuario='1', nom_usuario=f'usuario{rut}', correo=f'{rut}@bench.cl',
+                    password=clave, cargo=azar.choice(cargos), role='admin' if rut == RUT_ADMIN else 'usuario')
+            for rut in ruts)
+
+    ahora = timezone.now()
+    tabla_fechas = connection.ops.quote_name(FechaTicket._meta.db_table)
+    for inicio in range(0, tickets, lote):
+        with transaction.atomic():
+            nuevos = Ticket.objects.bulk_create(
+                Ticket(titulo=' '.join(azar.choices(PALABRAS, k=3)), comentario=' '.join(azar.choices(PALABRAS, k=10)),
+                       categoria=azar.choice(categorias), prioridad=azar.choice(prioridades),
+                       servicio=azar.choice(servicios), user_id=azar.choice(ruts),
+                       estado=cerrado if azar.random() < proporcion_cerrados else azar.choice((abierto, pendiente)))
+                for _ in range(min(lote, tickets - inicio)))
+            fechas, detalles = [], []
+            for ticket in nuevos:
+                creacion = ahora - timedelta(seconds=azar.randrange(3 * 365 * 86400))
+                fechas.append((ticket.pk, 'Creacion', connection.ops.adapt_datetimefield_value(creacion)))
+                if ticket.estado_id == cerrado.pk:
+                    cierre = creacion + timedelta(hours=azar.randrange(1, 500))
+                    fechas.append((ticket.pk, 'Cierre', connection.ops.adapt_datetimefield_value(cierre)))
+                detalles.append(DetalleUsuarioTicket(ticket=ticket, usuario_id=ticket.user_id, relacion_ticket='creador'))
+                for _ in range(detalles_por_ticket - 1):
+                    detalles.append(DetalleUsuarioTicket(ticket=ticket, usuario_id=azar.choice(ruts),
+                                                         relacion_ticket='asignado'))
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {tabla_fechas} (ticket_id, tipo_fecha, fecha) VALUES (%s, %s, %s)", fechas)
+            DetalleUsuarioTicket.objects.bulk_create(detalles, ignore_conflicts=True)
+    reconstruir()
+
+    return {
+        'admin': RUT_ADMIN,
+        'usuario': RUT_USUARIO,
+        'departamento': departamentos[0].pk,
+        'cargo': cargos[0].pk,
+        'categoria': categorias[0].pk,
+        'prioridad': prioridades[0].pk,
+        'servicio': servicios[0].pk,
+        'estado': abierto.pk,
+        'cerrado': cerrado.pk,
+        'ticket': Ticket.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'tickets': list(Ticket.objects.order_by('pk').values_list('pk', flat=True)[:100]),
+        'fecha': FechaTicket.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'detalle': DetalleUsuarioTicket.objects.order_by('pk').values_list('pk', flat=True).first(),
+    }
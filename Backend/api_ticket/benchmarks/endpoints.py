@@ -0,0 +1,232 @@
+"""
+Suite de rendimiento de la API: siembra un conjunto de datos sintético en una base
+temporal y mide, para cada endpoint de apps/tickets/urls.py y apps/autenticacion/urls.py,
+la latencia (media, p50, p95, p99), las consultas SQL y el pico de memoria (tracemalloc)
+de un request por el cliente de pruebas de Django, dentro del mismo proceso.
+
+Las escrituras se ejecutan dentro de una transacción que se revierte, así cada repetición
+ve los mismos datos. El resultado se guarda en JSON y se puede comparar con una corrida
+anterior; con --comparar el proceso termina con código 1 si hay regresiones.
+
+    python -m benchmarks.endpoints [--tickets 5000] [--usuarios 50] [--detalles 1]
+                                   [--repeticiones 30] [--solo tickets] [--salida actual.json]
+                                   [--comparar base.json] [--umbral 0.2]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from .base import (
+    base_temporal, comparar_resultados, configurar_django, contar_consultas,
+    imprimir_tabla, medir, medir_memoria,
+)
+from .datos import CONTRASENA, sembrar
+
+# ruta: patrón de urls.py que cubre el caso; url y datos se formatean con los ids sembrados.
+# auth: 'jwt', 'knox' o None; factor escala las repeticiones (login y token derivan la contraseña).
+Caso = namedtuple('Caso', 'nombre metodo ruta url datos esperado auth factor',
+                  defaults=(None, 200, 'jwt', 1.0))
+
+CASOS = [
+    Caso('departamentos', 'get', 'departamentos/', '/departamentos/'),
+    Caso('departamento', 'get', 'departamentos/<int:pk>/', '/departamentos/{departamento}/'),
+    Caso('cargos', 'get', 'cargos/', '/cargos/'),
+    Caso('cargo', 'get', 'cargos/<int:pk>/', '/cargos/{cargo}/'),
+    Caso('categorias', 'get', 'categorias/', '/categorias/'),
+    Caso('categoria', 'get', 'categorias/<int:pk>/', '/categorias/{categoria}/'),
+    Caso('estados', 'get', 'estados/', '/estados/'),
+    Caso('estado', 'get', 'estados/<int:pk>/', '/estados/{estado}/'),
+    Caso('prioridades', 'get', 'prioridades/', '/prioridades/'),
+    Caso('prioridad', 'get', 'prioridades/<int:pk>/', '/prioridades/{prioridad}/'),
+    Caso('servicios', 'get', 'servicios/', '/servicios/'),
+    Caso('servicio', 'get', 'servicios/<int:pk>/', '/servicios/{servicio}/'),
+    Caso('catalogos', 'get', 'catalogos/', '/catalogos/'),
+    Caso('tickets', 'get', 'tickets/', '/tickets/', factor=0.2),
+    Caso('tickets pagina', 'get', 'tickets/', '/tickets/?page_size=50'),
+    Caso('tickets filtrados', 'get', 'tickets/', '/tickets/?estado={estado}&ordering=-id&page_size=50'),
+    Caso('tickets campos', 'get', 'tickets/', '/tickets/?fields=id,titulo,estado&page_size=50'),
+    Caso('tickets usuario', 'get', 'tickets/', '/tickets/?page_size=50', auth='usuario'),
+    Caso('crear ticket', 'post', 'tickets/', '/tickets/',
+         {'titulo': 'Impresora', 'comentario': 'No imprime', 'categoria': '{categoria}',
+          'prioridad': '{prioridad}', 'servicio': '{servicio}', 'estado': '{estado}'}, esperado=201),
+    Caso('ticket', 'get', 'tickets/<int:pk>/', '/tickets/{ticket}/'),
+    Caso('ticket expandido', 'get', 'tickets/<int:pk>/', '/tickets/{ticket}/?expand=categoria,estado'),
+    Caso('editar ticket', 'patch', 'tickets/<int:pk>/', '/tickets/{ticket}/', {'estado': '{cerrado}'}),
+    Caso('eliminar ticket', 'delete', 'tickets/<int:pk>/', '/tickets/{ticket}/', esperado=204),
+    Caso('crear masivo', 'post', 'tickets/masivo/', '/tickets/masivo/', 'masivo', esperado=201, factor=0.2),
+    Caso('buscar', 'get', 'tickets/buscar/', '/tickets/buscar/?q=impresora'),
+    Caso('buscar selectivo', 'get', 'tickets/buscar/', '/tickets/buscar/?q=vpn%20respaldo%20lento'),
+    Caso('exportar csv', 'get', 'tickets/exportar/', '/tickets/exportar/', factor=0.2),
+    Caso('transicion masiva', 'post', 'tickets/masivo/transicion/', '/tickets/masivo/transicion/',
+         'transicion', factor=0.2),
+    Caso('detalles', 'get', 'detalle-usuarios-tickets/', '/detalle-usuarios-tickets/', factor=0.2),
+    Caso('detalle', 'get', 'detalle-usuarios-tickets/<int:pk>/', '/detalle-usuarios-tickets/{detalle}/'),
+    Caso('fechas', 'get', 'fechas-tickets/', '/fechas-tickets/', factor=0.2),
+    Caso('fecha', 'get', 'fechas-tickets/<int:pk>/', '/fechas-tickets/{fecha}/'),
+    Caso('cerrados', 'get', 'tickets-cerrados/', '/tickets-cerrados/', factor=0.2),
+    Caso('cerrados pagina', 'get', 'tickets-cerrados/', '/tickets-cerrados/?page_size=50'),
+    Caso('dashboard', 'get', 'api/dashboard/stats/', '/api/dashboard/stats/'),
+    Caso('usuarios', 'get', 'usuarios/', '/usuarios/'),
+    Caso('cargos publicos', 'get', 'api/cargos/', '/api/cargos/', auth=None),
+    Caso('registrar', 'post', 'registrar/', '/registrar/',
+         {'rut_usuario': 9999999, 'dv_rut_usuario': 'k', 'nom_usuario': 'nuevo', 'correo': 'nuevo@bench.cl',
+          'telefono': '123', 'cargo': '{cargo}', 'role': 'usuario', 'password': CONTRASENA,
+          'password_confirm': CONTRASENA}, esperado=201, auth=None, factor=0.1),
+    Caso('login', 'post', 'login/', '/login/', {'correo': '{admin}@bench.cl', 'password': CONTRASENA},
+         auth=None, factor=0.1),
+    Caso('logout', 'post', 'logout/', '/logout/', esperado=204, auth='knox'),
+    Caso('logout todos', 'post', 'logout-all/', '/logout-all/', esperado=204, auth='knox'),
+    Caso('token', 'post', 'api/token/', '/api/token/', {'correo': '{admin}@bench.cl', 'password': CONTRASENA},
+         auth=None, factor=0.1),
+    Caso('refrescar token', 'post', 'api/token/refresh/', '/api/token/refresh/', 'refresh', auth=None),
+]
+
+# Rutas sin caso, a propósito (el feed de eventos es una conexión abierta, no una solicitud)
+EXCLUIDAS = {'swagger/', 'redoc/', 'tickets/eventos/'}
+
+
+def formatear(valor, ids):
+    if isinstance(valor, str):
+        return valor.format(**ids)
+    if isinstance(valor, dict):
+        return {k: formatear(v, ids) for k, v in valor.items()}
+    return valor
+
+
+def rutas_sin_caso():
+    from apps.autenticacion.urls import urlpatterns as rutas_autenticacion
+    from apps.tickets.urls import urlpatterns as rutas_tickets
+
+    cubiertas = {caso.ruta for caso in CASOS} | EXCLUIDAS
+    return sorted({str(p.pattern) for p in rutas_tickets + rutas_autenticacion} - cubiertas)
+
+
+def commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def preparar(ids):
+    """Datos de los casos que no son plantillas fijas: cuerpos masivos y tokens"""
+    from knox.models import AuthToken
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from apps.autenticacion.models import Usuario
+    from apps.autenticacion.serializers import CustomTokenObtainPairSerializer
+
+    admin = Usuario.objects.get(pk=ids['admin'])
+    usuario = Usuario.objects.get(pk=ids['usuario'])
+    item = {'titulo': 'Masivo', 'categoria': ids['categoria'], 'prioridad': ids['prioridad'],
+            'servicio': ids['servicio'], 'estado': ids['estado']}
+    cuerpos = {
+        'masivo': [item] * 100,
+        'transicion': {'ids': ids['tickets'], 'estado': ids['cerrado']},
+        'refresh': {'refresh': str(RefreshToken.for_user(admin))},
+    }
+    credenciales = {
+        'jwt': f'Bearer {CustomTokenObtainPairSerializer.get_token(admin).access_token}',
+        'usuario': f'Bearer {CustomTokenObtainPairSerializer.get_token(usuario).access_token}',
+        'knox': f'Token {AuthToken.objects.create(admin)[1]}',
+    }
+    return cuerpos, credenciales
+
+
+def medir_caso(caso, ids, cuerpos, credenciales, repeticiones):
+    from django.db import transaction
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    if caso.auth:
+        client.credentials(HTTP_AUTHORIZATION=credenciales[caso.auth])
+    url = formatear(caso.url, ids)
+    datos = cuerpos.get(caso.datos) if isinstance(caso.datos, str) else formatear(caso.datos, ids)
+    enviar = getattr(client, caso.metodo)
+    respuesta = {}
+
+    def solicitar():
+        response = enviar(url, datos, format='json') if datos is not None else enviar(url)
+        contenido = b''.join(response.streaming_content) if response.streaming else response.content
+        respuesta.update(status=response.status_code, bytes=len(contenido))
+
+    def llamar():
+        if caso.metodo == 'get':
+            return solicitar()
+        with transaction.atomic():
+            solicitar()
+            transaction.set_rollback(True)  # las escrituras no se acumulan entre repeticiones
+
+    n = max(3, round(repeticiones * caso.factor))
+    fila = {'nombre': caso.nombre, 'metodo': caso.metodo.upper(), 'ruta': caso.ruta}
+    fila['consultas'] = contar_consultas(llamar)
+    fila['memoria_kb'] = medir_memoria(llamar)
+    fila.update(medir(llamar, n, calentamiento=min(10, n)))
+    fila.update(respuesta)
+    if respuesta['status'] != caso.esperado:
+        print(f'aviso: {caso.nombre} respondió {respuesta["status"]} (se esperaba {caso.esperado})',
+              file=sys.stderr)
+    return fila
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--usuarios', type=int, default=50)
+    parser.add_argument('--tickets', type=int, default=5000)
+    parser.add_argument('--detalles', type=int, default=1, help='detalles usuario-ticket por ticket')
+    parser.add_argument('--repeticiones', type=int, default=30)
+    parser.add_argument('--semilla', type=int, default=1)
+    parser.add_argument('--solo', help='ejecuta solo los casos cuyo nombre contiene este texto')
+    parser.add_argument('--salida', help='archivo JSON donde guardar los resultados')
+    parser.add_argument('--comparar', help='JSON de una corrida anterior')
+    parser.add_argument('--umbral', type=float, default=0.2, help='crecimiento relativo tolerado (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    configurar_django()
+    import django
+
+    for ruta in rutas_sin_caso():
+        print(f'aviso: la ruta {ruta} no tiene caso de benchmark', file=sys.stderr)
+
+    casos = [c for c in CASOS if not args.solo or args.solo in c.nombre]
+    with base_temporal():
+        ids = sembrar(usuarios=args.usuarios, tickets=args.tickets,
+                      detalles_por_ticket=args.detalles, semilla=args.semilla)
+        cuerpos, credenciales = preparar(ids)
+        resultados = [medir_caso(caso, ids, cuerpos, credenciales, args.repeticiones) for caso in casos]
+
+    imprimir_tabla(resultados, ['nombre', 'metodo', 'status', 'consultas', 'memoria_kb', 'bytes',
+                                'media_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+
+    if args.salida:
+        meta = {
+            'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': commit_actual(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'volumen': {'usuarios': args.usuarios, 'tickets': args.tickets, 'detalles': args.detalles,
+                        'semilla': args.semilla},
+            'repeticiones': args.repeticiones,
+        }
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'meta': meta, 'resultados': resultados}, archivo, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            anterior = json.load(archivo)
+        if anterior['meta'].get('volumen', {}).get('tickets') != args.tickets:
+            print('aviso: la corrida anterior usó otro volumen de datos', file=sys.stderr)
+        filas = comparar_resultados(anterior['resultados'], resultados, umbral=args.umbral)
+        print()
+        imprimir_tabla(filas, ['nombre', 'p50_ms', 'consultas', 'memoria_kb', 'regresion'])
+        if any(f['regresion'] for f in filas):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Salida de un listado de tickets: JSONRenderer de DRF contra ORJSONRenderer, y tamaño y
+costo de la compresión gzip/brotli de CompresionMiddleware sobre ese JSON.
+
+    python -m benchmarks.renderizado [--tickets 10000] [--repeticiones 10]
+"""
+import argparse
+import gzip
+
+from .base import base_temporal, configurar_django, imprimir_tabla, medir
+from .serializacion import poblar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickets', type=int, default=10000)
+    parser.add_argument('--repeticiones', type=int, default=10)
+    args = parser.parse_args()
+
+    configurar_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from api import middleware
+    from api.renderers import ORJSONRenderer, orjson
+    from apps.tickets.models import Ticket
+    from apps.tickets.serializacion import SerializadorFilas
+
+    with base_temporal():
+        poblar(args.tickets)
+        serializador = SerializadorFilas()
+        datos = serializador.serializar(serializador.preparar(Ticket.objects.con_fechas().order_by('pk')))
+
+    filas = []
+    contenido = JSONRenderer().render(datos)
+    renderers = [('JSONRenderer', JSONRenderer())]
+    if orjson is not None:
+        assert ORJSONRenderer().render(datos) == contenido
+        renderers.append(('ORJSONRenderer', ORJSONRenderer()))
+    for nombre, renderer in renderers:
+        resumen = medir(lambda: renderer.render(datos), args.repeticiones, 2)
+        filas.append({'paso': f'render {nombre}', 'bytes': len(contenido), 'media_ms': resumen['media_ms'],
+                      'p95_ms': resumen['p95_ms']})
+
+    config = middleware.configuracion_compresion()
+    compresores = [('gzip', lambda: gzip.compress(contenido, compresslevel=config['GZIP_NIVEL'], mtime=0))]
+    if middleware.brotli is not None:
+        compresores.append(('brotli', lambda: middleware.brotli.compress(contenido, quality=config['BROTLI_CALIDAD'])))
+    for nombre, comprimir in compresores:
+        resumen = medir(comprimir, args.repeticiones, 2)
+        filas.append({'paso': f'compresion {nombre}', 'bytes': len(comprimir()), 'media_ms': resumen['media_ms'],
+                      'p95_ms': resumen['p95_ms']})
+
+    imprimir_tabla(filas, ['paso', 'bytes', 'media_ms', 'p95_ms'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Listado completo de tickets: TicketSerializer contra SerializadorFilas (values() y
+conversores precompilados). Incluye la consulta; informa filas por segundo.
+
+    python -m benchmarks.serializacion [--tamanos 10000 100000] [--repeticiones 3]
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from .base import base_temporal, configurar_django, imprimir_tabla, medir
+
+
+def poblar(cantidad, lote=20000):
+    """Tickets con fecha de creación repartida en cinco años y la mitad cerrados"""
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    from apps.autenticacion.models import Usuario
+    from apps.tickets.models import Categoria, Estado, FechaTicket, Prioridad, Servicio, Ticket
+
+    usuario = Usuario.objects.create_user(
+        rut_usuario=12345678, dv_rut_usuario='5', correo='bench@test.cl',
+        nom_usuario='bench', password='clave-segura', role='admin',
+    )
+    categoria = Categoria.objects.create(nom_categoria='General')
+    comunes = {
+        'categoria': categoria, 'prioridad': Prioridad.objects.create(num_prioridad='1'),
+        'servicio': Servicio.objects.create(titulo_servicio='Soporte', costo=0, categoria=categoria),
+        'estado': Estado.objects.create(nom_estado='Abierto'), 'user': usuario,
+    }
+    azar = random.Random(1)
+    ahora = timezone.now()
+    tabla = connection.ops.quote_name(FechaTicket._meta.db_table)
+    for inicio in range(0, cantidad, lote):
+        with transaction.atomic():
+            tickets = Ticket.objects.bulk_create(
+                Ticket(titulo=f'Ticket {inicio + i}', comentario='Detalle del problema', **comunes)
+                for i in range(min(lote, cantidad - inicio))
+            )
+            fechas = []
+            for ticket in tickets:
+                creacion = ahora - timedelta(seconds=azar.randrange(5 * 365 * 86400), microseconds=azar.randrange(10**6))
+                fechas.append((ticket.pk, 'Creacion', connection.ops.adapt_datetimefield_value(creacion)))
+                if azar.random() < 0.5:
+                    cierre = creacion + timedelta(hours=azar.randrange(1, 500))
+                    fechas.append((ticket.pk, 'Cierre', connection.ops.adapt_datetimefield_value(cierre)))
+            with connection.cursor() as cursor:
+                cursor.executemany(f"INSERT INTO {tabla} (ticket_id, tipo_fecha, fecha) VALUES (%s, %s, %s)", fechas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    configurar_django()
+    from apps.tickets.models import Ticket
+    from apps.tickets.serializacion import SerializadorFilas
+    from apps.tickets.serializers import TicketSerializer
+
+    def con_serializer():
+        return TicketSerializer(Ticket.objects.con_fechas().order_by('pk'), many=True).data
+
+    def con_filas():
+        serializador = SerializadorFilas()
+        return serializador.serializar(serializador.preparar(Ticket.objects.con_fechas().order_by('pk')))
+
+    filas = []
+    for tamano in args.tamanos:
+        with base_temporal():
+            poblar(tamano)
+            assert con_serializer() == con_filas()
+            for modo, funcion in (('TicketSerializer', con_serializer), ('SerializadorFilas', con_filas)):
+                resumen = medir(funcion, args.repeticiones, calentamiento=1)
+                filas.append({'tickets': tamano, 'modo': modo, 'media_ms': round(resumen['media_ms'], 1),
+                              'filas_s': round(tamano / resumen['media_ms'] * 1000)})
+
+    imprimir_tabla(filas, ['tickets', 'modo', 'media_ms', 'filas_s'])
+
+
+if __name__ == '__main__':
+    main()